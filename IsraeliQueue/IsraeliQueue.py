@@ -1,8 +1,29 @@
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import Any, List, Optional, TypeVar
+from heapq import heapify, heappop, heappush
+from operator import index as as_index
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    SupportsIndex,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from .views import QueueView
 
 T = TypeVar("T")
 
+# Smallest number of items drain takes off the list at a time
+_DRAIN_CHUNK = 64
+
 
 @dataclass
 class Item:
@@ -12,13 +33,16 @@ class Item:
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Item):
             return self.item == other.item and self.group == other.group
-        return False
+        # Let other item types (such as CompactItem) compare themselves
+        return NotImplemented
 
     def same_group(self, other: object) -> bool:
         """Check if this item is in the same group as another item."""
         if isinstance(other, Item):
             return self.group == other.group
-        return False
+        # Let other item types (such as CompactItem) compare themselves
+        same_group = getattr(other, "same_group", None)
+        return same_group is not None and bool(same_group(self))
 
     def __repr__(self) -> str:
         return f"Item(item={self.item!r}, group={self.group})"
@@ -30,12 +54,402 @@ class Item:
         return hash((self.item, self.group))
 
 
+def _estimated_wait(position: int, service_rate: float) -> float:
+    """Return the time until ``position`` items have been served."""
+    if service_rate <= 0:
+        raise ValueError("service_rate must be positive")
+    return position / service_rate
+
+
+class _ItemCounter:
+    """
+    A multiset of queued items keyed on ``Item`` hash and equality.
+
+    Items whose payload cannot be hashed are kept in a side list and
+    scanned, so they still behave like they would in a plain list.
+    """
+
+    __slots__ = ("_counts", "_unhashable")
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        self._counts: "Counter[Any]" = Counter()
+        self._unhashable: List[Any] = []
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Any) -> None:
+        try:
+            self._counts[item] += 1
+        except TypeError:
+            self._unhashable.append(item)
+
+    def remove(self, item: Any) -> None:
+        try:
+            remaining = self._counts[item] - 1
+        except TypeError:
+            self._unhashable.remove(item)
+            return
+        if remaining > 0:
+            self._counts[item] = remaining
+        else:
+            self._counts.pop(item, None)
+
+    def count(self, item: Any) -> int:
+        try:
+            return self._counts[item]
+        except TypeError:
+            return self._unhashable.count(item)
+
+    def __contains__(self, item: Any) -> bool:
+        try:
+            return item in self._counts
+        except TypeError:
+            return item in self._unhashable
+
+
 class IsraeliQueue(List[Item]):
     """
     A queue where items can join their friends (same group) in line.
     Items are inserted after the furthest friend in the queue.
+
+    A multiset of the queued items and a per-group counter are kept up to
+    date by every mutating method, including the inherited ``list`` ones,
+    so membership checks (``in``, ``count`` and friend validation in
+    ``put``), ``group_size`` and ``get_groups`` never scan the list.
+    The members of every group are also kept in line order for
+    ``items_in_group``. Queue operations keep that index current; other
+    list mutations in the middle of the line drop it, and it is rebuilt
+    on the next read. Items must not be mutated while they are in the
+    queue.
+
+    Items enqueued with ``expires_at`` are also kept in a heap of
+    deadlines, so ``discard_expired`` finds the expired ones without
+    looking at the others. ``cancel``, ``remove_group`` and
+    ``discard_expired`` remove everything they find in one compaction
+    pass and update the indexes for the removed items only; the pass is
+    still O(n), while ``LinkedIsraeliQueue`` removes k items in
+    O(k log n).
+
+    ``drain`` takes items off the list in chunks and holds the ones it has
+    not yielded yet at the front of the line, outside the list. They stay
+    in every index, and the queue methods, ``len`` and iteration see them
+    in place; any operation that needs positions in the list first puts
+    them back.
     """
 
+    # Derived indexes, rebuilt rather than copied or pickled
+    _index_attrs = (
+        "_members",
+        "_group_counts",
+        "_group_items",
+        "_expiry",
+        "_held",
+    )
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "IsraeliQueue":
+        """Create a queue with an empty index."""
+        # Set up the index here so that copy and pickle, which bypass
+        # __init__ and append items one by one, keep it consistent
+        self = super().__new__(cls)
+        self._reset_index()
+        return self
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        super().__init__()
+        self._reset_index()
+        self.extend(items)
+
+    def _reset_index(self) -> None:
+        self._members = _ItemCounter()
+        self._group_counts: Dict[Any, int] = {}
+        # Members of every group in line order, or None until rebuilt
+        self._group_items: Optional[Dict[Any, Deque[Item]]] = {}
+        # Deadlines by item identity, and a heap of them that may also hold
+        # entries of items since removed or given a new deadline
+        self._expiry: Dict[int, Tuple[float, Item]] = {}
+        self._deadlines: List[Tuple[float, int, Item]] = []
+        # The front of the line while a drain holds it outside the list
+        self._held: Deque[Item] = deque()
+
+    def _hold(self, count: int) -> None:
+        """Move up to count items from the list to the held front."""
+        self._held.extend(list.__getitem__(self, slice(count)))
+        list.__delitem__(self, slice(count))
+
+    def _unhold(self) -> None:
+        """Put the held front of the line back into the list."""
+        if self._held:
+            list.__setitem__(self, slice(0, 0), self._held)
+            self._held.clear()
+
+    def _track_add(self, item: Item, last: bool = False) -> None:
+        """Count an added item; ``last`` if it is now the last of its group."""
+        self._members.add(item)
+        group = item.group
+        self._group_counts[group] = self._group_counts.get(group, 0) + 1
+        if self._group_items is not None:
+            if last:
+                members = self._group_items.get(group)
+                if members is None:
+                    members = self._group_items[group] = deque()
+                members.append(item)
+            else:
+                self._group_items = None
+
+    def _uncount(self, item: Item) -> None:
+        self._members.remove(item)
+        group = item.group
+        remaining = self._group_counts[group] - 1
+        if remaining:
+            self._group_counts[group] = remaining
+        else:
+            del self._group_counts[group]
+        if self._expiry:
+            self._expiry.pop(id(item), None)
+
+    def _track_remove(self, item: Item, first: bool = False) -> None:
+        """Count a removed item; ``first`` if it was the first of its group."""
+        self._uncount(item)
+        if self._group_items is not None:
+            if first:
+                members = self._group_items[item.group]
+                members.popleft()
+                if not members:
+                    del self._group_items[item.group]
+            else:
+                self._group_items = None
+
+    def _group_index(self) -> Dict[Any, Deque[Item]]:
+        """Return the members of every group, rebuilding them if dropped."""
+        groups = self._group_items
+        if groups is None:
+            groups = {}
+            for item in self:
+                members = groups.get(item.group)
+                if members is None:
+                    members = groups[item.group] = deque()
+                members.append(item)
+            self._group_items = groups
+        return groups
+
+    def _set_deadline(self, item: Item, expires_at: float) -> None:
+        key = id(item)
+        current = self._expiry.get(key)
+        self._expiry[key] = (expires_at, item)
+        if current is not None and current[0] == expires_at:
+            return
+        heappush(self._deadlines, (expires_at, key, item))
+        if len(self._deadlines) > 2 * len(self._expiry) + 64:
+            # Drop the entries of items that are gone or were given new ones
+            self._deadlines = [
+                (when, key, item) for key, (when, item) in self._expiry.items()
+            ]
+            heapify(self._deadlines)
+
+    def _drop(self, positions: List[int]) -> List[Item]:
+        """Remove the items at ascending ``positions`` in one pass."""
+        if not positions:
+            return []
+        removed = [self[position] for position in positions]
+        if len(positions) == 1:
+            super().pop(positions[0])
+        else:
+            kept: List[Item] = []
+            start = 0
+            for position in positions:
+                kept += self[start:position]
+                start = position + 1
+            kept += self[start:]
+            super().__setitem__(slice(None), kept)
+        for item in removed:
+            self._uncount(item)
+
+        groups = self._group_items
+        if groups is not None:
+            # Take the removed items out of their groups, by identity
+            pending: Dict[Any, Dict[int, int]] = {}
+            for item in removed:
+                ids = pending.setdefault(item.group, {})
+                ids[id(item)] = ids.get(id(item), 0) + 1
+            for group, ids in pending.items():
+                if group not in self._group_counts:
+                    del groups[group]
+                    continue
+                members: Deque[Item] = deque()
+                for member in groups[group]:
+                    if ids.get(id(member)):
+                        ids[id(member)] -= 1
+                    else:
+                        members.append(member)
+                groups[group] = members
+        return removed
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self._unhold()
+        state = self.__dict__.copy()
+        for attr in self._index_attrs:
+            state.pop(attr, None)
+        # Ids change on a copy, so keep the deadlines with their items
+        state["_deadlines"] = list(self._expiry.values())
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        deadlines = state.pop("_deadlines", ())
+        self.__dict__.update(state)
+        for expires_at, item in deadlines:
+            self._set_deadline(item, expires_at)
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line."""
+        super().append(item)
+        self._track_add(item, last=True)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add several items to the end of the line."""
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._track_add(item, last=True)
+
+    # list.__iadd__ takes any iterable but list.__add__ only lists; typeshed
+    # silences the same mismatch on list itself
+    def __iadd__(  # type: ignore[override, misc]
+        self, items: Iterable[Item]
+    ) -> "IsraeliQueue":
+        self.extend(items)
+        return self
+
+    def __imul__(self, times: SupportsIndex) -> "IsraeliQueue":
+        self._unhold()
+        items = list(self)
+        expiry = dict(self._expiry)
+        super().__imul__(times)
+        for item in items:
+            self._track_remove(item)
+        for item in self:
+            self._track_add(item)
+        if self:
+            # The same items are still queued, so they keep their deadlines
+            self._expiry = expiry
+        return self
+
+    def insert(self, index: SupportsIndex, item: Item) -> None:
+        """Insert an item before index."""
+        self._unhold()
+        at_end = as_index(index) >= len(self)
+        super().insert(index, item)
+        self._track_add(item, last=at_end)
+
+    def pop(self, index: SupportsIndex = -1) -> Item:
+        """Remove and return the item at index, the last by default."""
+        self._unhold()
+        at_front = as_index(index) in (0, -len(self))
+        item = super().pop(index)
+        self._track_remove(item, first=at_front)
+        return item
+
+    def remove(self, item: Item) -> None:
+        """Remove the first occurrence of item."""
+        # Pop by position so the queued object, not item, is forgotten
+        self.pop(self.index(item))
+
+    def clear(self) -> None:
+        """Remove every item."""
+        super().clear()
+        self._reset_index()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """Sort the line in place, as ``list.sort`` does."""
+        self._unhold()
+        super().sort(*args, **kwargs)
+        self._group_items = None
+
+    def reverse(self) -> None:
+        """Reverse the line in place."""
+        self._unhold()
+        super().reverse()
+        self._group_items = None
+
+    def index(self, item: Item, *args: SupportsIndex) -> int:
+        """Return the position of the first occurrence of item."""
+        self._unhold()
+        return super().index(item, *args)
+
+    def copy(self) -> List[Item]:
+        """Return a shallow copy of the line as a list."""
+        self._unhold()
+        return super().copy()
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self._held)
+
+    def __iter__(self) -> Iterator[Item]:
+        self._unhold()
+        return super().__iter__()
+
+    def __reversed__(self) -> Iterator[Item]:
+        self._unhold()
+        return super().__reversed__()
+
+    @overload
+    def __getitem__(self, index: SupportsIndex) -> Item:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Item]:
+        ...
+
+    def __getitem__(
+        self, index: Union[SupportsIndex, slice]
+    ) -> Union[Item, List[Item]]:
+        self._unhold()
+        return super().__getitem__(index)
+
+    def __eq__(self, other: object) -> bool:
+        self._unhold()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        self._unhold()
+        return super().__ne__(other)
+
+    def __repr__(self) -> str:
+        self._unhold()
+        return super().__repr__()
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Any) -> None:
+        self._unhold()
+        if isinstance(index, slice):
+            value = list(value)
+            old = self[index]
+        else:
+            old = [self[index]]
+        super().__setitem__(index, value)
+        for item in old:
+            self._track_remove(item)
+        for item in value if isinstance(index, slice) else [value]:
+            self._track_add(item)
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        self._unhold()
+        if isinstance(index, slice):
+            old = self[index]
+            # Items cut from the front leave their groups in line order
+            at_front = index.start in (None, 0) and index.step in (None, 1)
+        else:
+            old = [self[index]]
+            at_front = as_index(index) in (0, -len(self))
+        super().__delitem__(index)
+        for item in old:
+            self._track_remove(item, first=at_front)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._members
+
+    def count(self, item: Item) -> int:
+        """Return the number of queued items equal to item."""
+        return self._members.count(item)
+
     def put(self, item: Item, friend: Item) -> None:
         """
         Add an item to the queue next to its friends.
@@ -49,6 +463,7 @@ class IsraeliQueue(List[Item]):
         """
         if friend not in self:
             raise ValueError("Friend not found in queue")
+        self._unhold()
 
         # Find all friends (items with same group as the new item)
         all_friends = [(index, f) for index, f in enumerate(self) if f.same_group(item)]
@@ -59,10 +474,17 @@ class IsraeliQueue(List[Item]):
         else:
             # Find the furthest friend and insert after them
             most_far = max(all_friends, key=lambda f: f[0])
-            # Insert after the furthest friend (index + 1)
-            self.insert(most_far[0] + 1, item)
+            # Insert after the furthest friend (index + 1), which makes the
+            # item the last of its group
+            super().insert(most_far[0] + 1, item)
+            self._track_add(item, last=True)
 
-    def enqueue(self, item: Item, friend: Optional[Item] = None) -> None:
+    def enqueue(
+        self,
+        item: Item,
+        friend: Optional[Item] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
         """
         Add an item to the queue. If friend is provided, joins them in line.
         If no friend provided, adds to the end.
@@ -70,11 +492,15 @@ class IsraeliQueue(List[Item]):
         Args:
             item: The item to add
             friend: Optional existing item to join
+            expires_at: Optional deadline after which ``discard_expired``
+                removes the item, on whatever clock its caller uses
         """
         if friend is None:
             self.append(item)
         else:
             self.put(item, friend)
+        if expires_at is not None:
+            self._set_deadline(item, expires_at)
 
     def dequeue(self) -> Item:
         """
@@ -86,10 +512,151 @@ class IsraeliQueue(List[Item]):
         Raises:
             IndexError: If the queue is empty
         """
+        held = self._held
+        if held:
+            item = held.popleft()
+            self._track_remove(item, first=True)
+            return item
         if not self:
             raise IndexError("Cannot dequeue from empty queue")
         return self.pop(0)
 
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """
+        Add a batch of items, as if ``enqueue`` was called for each pair.
+
+        The batch is placed in one pass: the last position of every group
+        it joins is found once, and the queue is rebuilt at most once.
+
+        Args:
+            pairs: ``(item, friend)`` pairs; a friend of None appends the item
+
+        Raises:
+            ValueError: If a friend is not found in the queue. Items before
+                the offending pair are still added.
+        """
+        pairs = list(pairs)
+        joined = {item.group for item, friend in pairs if friend is not None}
+        last_index: Dict[Any, int] = {}
+        if any(group in self._group_counts for group in joined):
+            self._unhold()
+            for index, queued in enumerate(self):
+                if queued.group in joined:
+                    last_index[queued.group] = index
+
+        # Items to insert after an existing position, and new runs at the end
+        after: Dict[int, List[Item]] = {}
+        runs: List[List[Item]] = []
+        # Where the next member of each group goes
+        anchors: Dict[Any, List[Item]] = {}
+        added = _ItemCounter()
+        error: Optional[ValueError] = None
+
+        for item, friend in pairs:
+            target: Optional[List[Item]] = None
+            if friend is not None:
+                if friend not in self and friend not in added:
+                    error = ValueError("Friend not found in queue")
+                    break
+                target = anchors.get(item.group)
+                if target is None and item.group in last_index:
+                    target = after.setdefault(last_index[item.group], [])
+            if target is None:
+                # No friends in queue (or no friend given), append to end
+                target = []
+                runs.append(target)
+            anchors[item.group] = target
+            target.append(item)
+            added.add(item)
+
+        if after:
+            rebuilt: List[Item] = []
+            for index, queued in enumerate(self):
+                rebuilt.append(queued)
+                if index in after:
+                    rebuilt.extend(after[index])
+            super().__setitem__(slice(None), rebuilt)
+            # Each insertion holds one group and goes after its last member
+            for inserted in after.values():
+                for item in inserted:
+                    self._track_add(item, last=True)
+        for run in runs:
+            self.extend(run)
+
+        if error is not None:
+            raise error
+
+    def dequeue_many(self, n: int) -> List[Item]:
+        """
+        Remove and return up to ``n`` items from the front of the queue.
+
+        Args:
+            n: The maximum number of items to remove
+
+        Returns:
+            The removed items in queue order; fewer than ``n`` if the
+            queue runs out
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        items = self[:n]
+        del self[:n]
+        return items
+
+    def drain(self, max_items: Optional[int] = None) -> Iterator[Item]:
+        """
+        Remove and yield as many items from the front as were in line.
+
+        Items leave the list in chunks of at least 64 items and at most a
+        quarter of the line, so draining costs amortized O(1) per item
+        instead of the O(n) of every ``dequeue``. The items of a chunk not
+        yet yielded are held at the front of the line: ``in`` finds them,
+        friends can join them and ``dequeue`` serves them first. Every item
+        is still served through ``dequeue``, and if the generator is closed
+        early the held items go back into the list.
+
+        Args:
+            max_items: The maximum number of items to yield, or None for
+                all of them
+
+        Raises:
+            ValueError: If max_items is negative
+        """
+        if max_items is not None and max_items < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        limit = len(self) if max_items is None else min(max_items, len(self))
+        return self._consume(limit)
+
+    def iter_dequeue(self) -> Iterator[Item]:
+        """
+        Remove and yield items until the queue is empty.
+
+        Items added while iterating are yielded too. Items leave the list
+        in chunks, as in ``drain``.
+        """
+        return self._consume(None)
+
+    def _consume(self, limit: Optional[int]) -> Iterator[Item]:
+        try:
+            while limit is None or limit > 0:
+                if not self._held:
+                    size = max(_DRAIN_CHUNK, super().__len__() // 4)
+                    self._hold(size if limit is None else min(size, limit))
+                # Serve through dequeue, so that subclasses see every item
+                # leave (and can add arrivals first) as in a dequeue loop
+                try:
+                    item = self.dequeue()
+                except IndexError:
+                    return
+                if limit is not None:
+                    limit -= 1
+                yield item
+        finally:
+            self._unhold()
+
     def peek(self) -> Item:
         """
         Return the first item without removing it.
@@ -114,19 +681,245 @@ class IsraeliQueue(List[Item]):
 
     def get_groups(self) -> List[int]:
         """Get all unique group numbers in the queue."""
-        return list(set(item.group for item in self))
+        return list(self._group_counts)
+
+    def group_size(self, group: int) -> int:
+        """Return the number of queued items in a group."""
+        return self._group_counts.get(group, 0)
+
+    def items_in_group(self, group: int) -> QueueView:
+        """
+        Get a live, read-only view of the items of a group, in line order.
+
+        Reading k items of the view costs O(k), and ``len`` is O(1).
+        """
+        return QueueView(
+            lambda: self._group_index().get(group, ()),
+            lambda: self._group_counts.get(group, 0),
+        )
+
+    def position_of(self, item: Item) -> int:
+        """
+        Return the position of the first occurrence of item.
+
+        This scans the line, in O(n); ``LinkedIsraeliQueue`` answers in
+        O(log n).
+
+        Raises:
+            ValueError: If item is not in the queue
+        """
+        try:
+            return self.index(item)
+        except ValueError:
+            raise ValueError(f"{item!r} is not in queue") from None
+
+    def group_span(self, group: int) -> Tuple[int, int]:
+        """
+        Return the positions of the first and last items of a group.
+
+        This scans the line from both ends, in O(n);
+        ``LinkedIsraeliQueue`` answers in O(log n).
+
+        Raises:
+            ValueError: If the group is not in the queue
+        """
+        members = self._group_index().get(group)
+        if not members:
+            raise ValueError("Group not found in queue")
+        # Equal items share a group, so the first match is the first member
+        first = self.index(members[0])
+        last = len(self) - 1
+        while self[last].group != group:
+            last -= 1
+        return first, last
+
+    def estimated_wait(self, item: Item, service_rate: float) -> float:
+        """
+        Estimate how long item waits before reaching the front.
+
+        Args:
+            item: An item in the queue
+            service_rate: Items served per unit of time
+
+        Raises:
+            ValueError: If item is not in the queue or the rate is not positive
+        """
+        return _estimated_wait(self.position_of(item), service_rate)
+
+    def cancel(self, item: Item) -> Item:
+        """
+        Remove the first occurrence of item from the line and return it.
+
+        Finding the item and closing the gap both cost O(n); see
+        ``LinkedIsraeliQueue`` for O(log n) cancellation.
 
-    def items_in_group(self, group: int) -> List[Item]:
-        """Get all items belonging to a specific group."""
-        return [item for item in self if item.group == group]
+        Raises:
+            ValueError: If item is not in the queue
+        """
+        return self._drop([self.position_of(item)])[0]
+
+    def remove_group(self, group: int) -> List[Item]:
+        """
+        Remove every item of a group and return them in line order.
+
+        This scans and compacts the whole line, in O(n) however few items
+        the group has.
+        """
+        if group not in self._group_counts:
+            return []
+        self._unhold()
+        return self._drop(
+            [position for position, item in enumerate(self) if item.group == group]
+        )
+
+    def discard_expired(self, now: float) -> List[Item]:
+        """
+        Remove the items whose ``expires_at`` is at or before ``now``.
+
+        The expired items come off the deadline heap in O(k log n) for k
+        expired items, and leave the line together in one O(n) pass that
+        compacts the list.
+
+        Returns:
+            The removed items in line order
+        """
+        expired = set()
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            expires_at, key, item = heappop(deadlines)
+            current = self._expiry.get(key)
+            if current is not None and current[0] == expires_at:
+                expired.add(key)
+        if not expired:
+            return []
+        self._unhold()
+        return self._drop(
+            [position for position, item in enumerate(self) if id(item) in expired]
+        )
 
 
 class IsraeliQueueByType(List[List[Any]]):
     """
     A queue that groups items by their type.
     Items of the same type are grouped together in sublists.
+
+    A running total and a count per subqueue head type are kept up to date
+    by the queue methods and the inherited ``list`` mutators, so ``size``,
+    ``is_empty`` and ``type_size`` never rescan the subqueues, and
+    ``get_types`` only looks at the head of each one. Subqueues must only be
+    changed through the queue itself.
     """
 
+    # Derived counters, rebuilt rather than copied or pickled
+    _index_attrs = ("_size", "_type_counts")
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "IsraeliQueueByType":
+        """Create a queue with empty counters, as ``IsraeliQueue`` does."""
+        self = super().__new__(cls)
+        self._reset_index()
+        return self
+
+    def __init__(self, subqueues: Iterable[List[Any]] = ()) -> None:
+        super().__init__()
+        self._reset_index()
+        self.extend(subqueues)
+
+    def _reset_index(self) -> None:
+        self._size = 0
+        self._type_counts: Dict[type, int] = {}
+
+    def _count(self, item_type: type, delta: int) -> None:
+        remaining = self._type_counts.get(item_type, 0) + delta
+        if remaining:
+            self._type_counts[item_type] = remaining
+        else:
+            del self._type_counts[item_type]
+        self._size += delta
+
+    def _track_add(self, subqueue: List[Any]) -> None:
+        if subqueue:
+            self._count(type(subqueue[0]), len(subqueue))
+
+    def _track_remove(self, subqueue: List[Any]) -> None:
+        if subqueue:
+            self._count(type(subqueue[0]), -len(subqueue))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for attr in self._index_attrs:
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+    def append(self, subqueue: List[Any]) -> None:
+        """Add a subqueue to the end of the line."""
+        super().append(subqueue)
+        self._track_add(subqueue)
+
+    def extend(self, subqueues: Iterable[List[Any]]) -> None:
+        """Add several subqueues to the end of the line."""
+        subqueues = list(subqueues)
+        super().extend(subqueues)
+        for subqueue in subqueues:
+            self._track_add(subqueue)
+
+    # As on IsraeliQueue, list.__iadd__ takes any iterable of subqueues
+    def __iadd__(  # type: ignore[override, misc]
+        self, subqueues: Iterable[List[Any]]
+    ) -> "IsraeliQueueByType":
+        self.extend(subqueues)
+        return self
+
+    def __imul__(self, times: SupportsIndex) -> "IsraeliQueueByType":
+        subqueues = list(self)
+        super().__imul__(times)
+        for subqueue in subqueues:
+            self._track_remove(subqueue)
+        for subqueue in self:
+            self._track_add(subqueue)
+        return self
+
+    def insert(self, index: SupportsIndex, subqueue: List[Any]) -> None:
+        """Insert a subqueue before index."""
+        super().insert(index, subqueue)
+        self._track_add(subqueue)
+
+    def pop(self, index: SupportsIndex = -1) -> List[Any]:
+        """Remove and return the subqueue at index, the last by default."""
+        subqueue = super().pop(index)
+        self._track_remove(subqueue)
+        return subqueue
+
+    def remove(self, subqueue: List[Any]) -> None:
+        """Remove the first subqueue equal to subqueue."""
+        super().remove(subqueue)
+        self._track_remove(subqueue)
+
+    def clear(self) -> None:
+        """Remove every subqueue."""
+        super().clear()
+        self._reset_index()
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Any) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            old = self[index]
+        else:
+            old = [self[index]]
+        super().__setitem__(index, value)
+        for subqueue in old:
+            self._track_remove(subqueue)
+        for subqueue in value if isinstance(index, slice) else [value]:
+            self._track_add(subqueue)
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        old = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for subqueue in old:
+            self._track_remove(subqueue)
+
     def enqueue(self, item: Any) -> None:
         """
         Add an item to the queue, grouping by type.
@@ -138,6 +931,7 @@ class IsraeliQueueByType(List[List[Any]]):
         for subqueue in self:
             if subqueue and isinstance(subqueue[0], item_type):
                 subqueue.append(item)
+                self._count(type(subqueue[0]), 1)
                 return
         # No existing subqueue for this type, create new one
         self.append([item])
@@ -158,7 +952,11 @@ class IsraeliQueueByType(List[List[Any]]):
         # Find first non-empty subqueue
         for i, subqueue in enumerate(self):
             if subqueue:
+                # The subqueue is counted under its head's type, which
+                # may change once the head is served
+                self._track_remove(subqueue)
                 result = subqueue.pop(0)
+                self._track_add(subqueue)
                 # Remove empty sublists
                 if not subqueue:
                     self.pop(i)
@@ -166,6 +964,81 @@ class IsraeliQueueByType(List[List[Any]]):
 
         raise IndexError("Cannot dequeue from empty queue")
 
+    def enqueue_many(self, items: Iterable[Any]) -> None:
+        """
+        Add a batch of items, as if ``enqueue`` was called for each one.
+
+        The subqueue of every distinct type in the batch is looked up once,
+        and each subqueue is extended once.
+
+        Args:
+            items: The items to add to the queue
+        """
+        existing = len(self)
+        new_subqueues: List[List[Any]] = []
+        batches: Dict[int, List[Any]] = {}
+        lane_of: Dict[type, int] = {}
+
+        for item in items:
+            item_type = type(item)
+            index = lane_of.get(item_type)
+            if index is None:
+                for i, subqueue in enumerate(self):
+                    if subqueue and isinstance(subqueue[0], item_type):
+                        index = i
+                        break
+                else:
+                    for i, subqueue in enumerate(new_subqueues):
+                        if isinstance(subqueue[0], item_type):
+                            index = existing + i
+                            break
+                    else:
+                        # No existing subqueue for this type, create new one
+                        index = existing + len(new_subqueues)
+                        new_subqueues.append([])
+                lane_of[item_type] = index
+            if index < existing:
+                batches.setdefault(index, []).append(item)
+            else:
+                new_subqueues[index - existing].append(item)
+
+        for index, batch in batches.items():
+            subqueue = self[index]
+            subqueue.extend(batch)
+            self._count(type(subqueue[0]), len(batch))
+        self.extend(new_subqueues)
+
+    def dequeue_many(self, n: int) -> List[Any]:
+        """
+        Remove and return up to ``n`` items, in the order ``dequeue`` would.
+
+        Each subqueue is cut once rather than popped item by item.
+
+        Args:
+            n: The maximum number of items to remove
+
+        Returns:
+            The removed items; fewer than ``n`` if the queue runs out
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        result: List[Any] = []
+        while len(result) < n and self._size:
+            for i, subqueue in enumerate(self):
+                if subqueue:
+                    break
+            take = n - len(result)
+            self._track_remove(subqueue)
+            result.extend(subqueue[:take])
+            del subqueue[:take]
+            self._track_add(subqueue)
+            if not subqueue:
+                self.pop(i)
+        return result
+
     def peek(self) -> Any:
         """
         Return the first item without removing it.
@@ -187,23 +1060,26 @@ class IsraeliQueueByType(List[List[Any]]):
 
     def is_empty(self) -> bool:
         """Check if the queue is empty."""
-        return not self or all(not subqueue for subqueue in self)
+        return self._size == 0
 
     def size(self) -> int:
         """Return the total number of items across all subqueues."""
-        return sum(len(subqueue) for subqueue in self)
+        return self._size
 
     def get_types(self) -> List[type]:
-        """Get all types present in the queue."""
-        types = []
-        for subqueue in self:
-            if subqueue:
-                types.append(type(subqueue[0]))
-        return types
+        """Get the type at the head of every subqueue, in line order."""
+        return [type(subqueue[0]) for subqueue in self if subqueue]
 
-    def items_of_type(self, item_type: type) -> List[Any]:
-        """Get all items of a specific type."""
+    def type_size(self, item_type: type) -> int:
+        """Return the number of items in subqueues headed by ``item_type``."""
+        return self._type_counts.get(item_type, 0)
+
+    def _subqueue_of(self, item_type: type) -> List[Any]:
         for subqueue in self:
             if subqueue and isinstance(subqueue[0], item_type):
-                return subqueue.copy()
+                return subqueue
         return []
+
+    def items_of_type(self, item_type: type) -> QueueView:
+        """Get a live, read-only view of the items of a specific type."""
+        return QueueView(lambda: self._subqueue_of(item_type))
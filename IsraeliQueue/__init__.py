@@ -6,6 +6,20 @@ in line, creating more realistic simulations of human queuing behavior.
 """
 
 from .IsraeliQueue import Item, IsraeliQueue, IsraeliQueueByType
+from .bounded import BoundedIsraeliQueue
+from .columnar import ColumnarIsraeliQueue
+from .compact import CompactItem, FrozenCompactItem, GroupTable
+from .fair import FairIsraeliQueue
+from .journal import JournaledIsraeliQueue
+from .linked import LinkedIsraeliQueue
+from .mapped import MappedIsraeliQueue
+from .priority import PriorityIsraeliQueue
+from .scheduled import ScheduledIsraeliQueue
+from .typed import DequeIsraeliQueueByType
+from .threaded import ConcurrentIsraeliQueue
+from .shared import SharedIsraeliQueue
+from .sharded import ShardedIsraeliQueue
+from .aio import AsyncIsraeliQueue
 
 try:
     from ._version import version as __version__
@@ -15,7 +29,23 @@ except ImportError:
 
 __all__ = [
     "Item",
+    "CompactItem",
+    "FrozenCompactItem",
+    "GroupTable",
     "IsraeliQueue",
     "IsraeliQueueByType",
+    "BoundedIsraeliQueue",
+    "FairIsraeliQueue",
+    "PriorityIsraeliQueue",
+    "ScheduledIsraeliQueue",
+    "LinkedIsraeliQueue",
+    "ColumnarIsraeliQueue",
+    "MappedIsraeliQueue",
+    "JournaledIsraeliQueue",
+    "DequeIsraeliQueueByType",
+    "ConcurrentIsraeliQueue",
+    "SharedIsraeliQueue",
+    "ShardedIsraeliQueue",
+    "AsyncIsraeliQueue",
     "__version__",
 ]
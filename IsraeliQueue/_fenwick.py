@@ -0,0 +1,66 @@
+"""
+A Fenwick (binary indexed) tree of non-negative counts.
+
+Used as an order-statistics index over the blocks of a queue: slot ``i``
+holds the number of items block ``i`` has taken in, so prefix sums give
+positions and ``search`` finds the block holding a position, both in
+O(log n).
+"""
+
+from typing import Sequence, Tuple
+
+
+class _Fenwick:
+    """Prefix sums over ``size`` counts, starting with ``counts`` then zeros."""
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, counts: Sequence[int], size: int) -> None:
+        # Build in O(size) by pushing every node into its parent
+        tree = [0] * (size + 1)
+        tree[1 : len(counts) + 1] = counts
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def add(self, index: int, delta: int) -> None:
+        """Add ``delta`` to the count at ``index``."""
+        tree = self._tree
+        index += 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index: int) -> int:
+        """Return the sum of the counts before ``index``."""
+        tree = self._tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def search(self, target: int) -> Tuple[int, int]:
+        """
+        Find the slot that covers ``target``.
+
+        Returns the first index whose prefix sum, including its own count,
+        exceeds ``target``, and the prefix sum before it. Returns
+        ``len(self)`` if the counts add up to ``target`` or less.
+        """
+        tree = self._tree
+        index = 0
+        total = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            upper = index + step
+            if upper < len(tree) and total + tree[upper] <= target:
+                index = upper
+                total += tree[upper]
+            step >>= 1
+        return index, total
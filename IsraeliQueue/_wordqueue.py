@@ -0,0 +1,497 @@
+"""
+An Israeli queue laid out in a flat buffer of 64-bit words.
+
+The buffer holds a header, an open-addressing table with the head, tail
+and size of every group in line, and fixed-size slots of
+``(item, group, next, group next)``. Nothing refers to Python objects, so
+the same bytes can live in a memory-mapped file or in shared memory.
+Subclasses provide the buffer, and may route every write through
+``_set`` (to log it, for example), grow the slot area in ``_grow`` and
+make room for a larger group table in ``_grow_table``.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .IsraeliQueue import Item
+from .views import QueueView
+
+# Marks the end of a chain of slots
+_NIL = -1
+_MAGIC = 0x49515545554500  # "IQUEUE"
+_VERSION = 1
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# Header words
+_H_MAGIC = 0
+_H_VERSION = 1
+_H_CAPACITY = 2
+_H_TABLE_SIZE = 3
+_H_HEAD = 4
+_H_TAIL = 5
+_H_FREE = 6
+_H_USED = 7
+_H_SIZE = 8
+_H_GROUPS = 9
+_HEADER_WORDS = 16
+
+# Group table entry words
+_E_USED = 0
+_E_GROUP = 1
+_E_HEAD = 2
+_E_TAIL = 3
+_E_COUNT = 4
+_ENTRY_WORDS = 5
+
+# Slot words
+_S_ITEM = 0
+_S_GROUP = 1
+_S_NEXT = 2
+_S_GROUP_NEXT = 3
+_SLOT_WORDS = 4
+
+
+def _table_size(max_groups: int) -> int:
+    """Return the power-of-two table size that keeps max_groups at half load."""
+    size = 2
+    while size < 2 * max_groups:
+        size *= 2
+    return size
+
+
+def layout_words(capacity: int, max_groups: int) -> int:
+    """Return the number of words needed for a queue of the given limits."""
+    return (
+        _HEADER_WORDS + _table_size(max_groups) * _ENTRY_WORDS + capacity * _SLOT_WORDS
+    )
+
+
+def _check_word(value: Any, what: str) -> int:
+    if not isinstance(value, int) or not _INT64_MIN <= value <= _INT64_MAX:
+        raise TypeError(f"{what} must be a 64-bit integer, got {value!r}")
+    return value
+
+
+class _WordQueue:
+    """The queue logic shared by the buffer-backed queues."""
+
+    item_factory: Callable[[int, int], Any]
+    # The buffer, as a memoryview of signed 64-bit words
+    _words: memoryview
+
+    def __init__(self, item_factory: Callable[[int, int], Any] = Item) -> None:
+        self.item_factory = item_factory
+        self._depth = 0
+
+    # Buffer access; subclasses may override these
+
+    def _get(self, index: int) -> int:
+        return self._words[index]
+
+    def _set(self, index: int, value: int) -> None:
+        self._words[index] = value
+
+    def _grow(self) -> None:
+        """Make room for more slots, or raise if the buffer cannot grow."""
+        raise OverflowError("Queue is at capacity")
+
+    def _grow_table(self) -> None:
+        """Make room for more groups, or raise if the buffer cannot grow."""
+        raise OverflowError("Too many groups in queue")
+
+    def _commit(self) -> None:
+        """Finish the outermost operation once it has succeeded."""
+
+    def _abort(self) -> None:
+        """Undo the outermost operation after it has raised."""
+
+    @contextmanager
+    def _operation(self) -> Iterator[None]:
+        # Every public mutator runs as one operation, committed as a whole
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            self._depth -= 1
+            if not self._depth:
+                self._abort()
+            raise
+        self._depth -= 1
+        if not self._depth:
+            self._commit()
+
+    def _format(self, capacity: int, max_groups: int) -> None:
+        """Write the header of an empty queue into a zeroed buffer."""
+        words = self._words
+        words[_H_MAGIC] = _MAGIC
+        words[_H_VERSION] = _VERSION
+        words[_H_CAPACITY] = capacity
+        words[_H_TABLE_SIZE] = _table_size(max_groups)
+        words[_H_HEAD] = _NIL
+        words[_H_TAIL] = _NIL
+        words[_H_FREE] = _NIL
+        words[_H_USED] = 0
+        words[_H_SIZE] = 0
+        words[_H_GROUPS] = 0
+
+    def _validate(self) -> None:
+        if self._words[_H_MAGIC] != _MAGIC:
+            raise ValueError("Not an Israeli queue buffer")
+        if self._words[_H_VERSION] != _VERSION:
+            raise ValueError(f"Unsupported queue version {self._words[_H_VERSION]}")
+
+    # Layout
+
+    @property
+    def capacity(self) -> int:
+        """Number of slots currently available."""
+        return self._get(_H_CAPACITY)
+
+    @property
+    def max_groups(self) -> int:
+        """Number of distinct groups the queue can hold at once."""
+        return self._get(_H_TABLE_SIZE) // 2
+
+    def _slot(self, slot: int) -> int:
+        """Return the word index of a slot."""
+        return (
+            _HEADER_WORDS + self._get(_H_TABLE_SIZE) * _ENTRY_WORDS + slot * _SLOT_WORDS
+        )
+
+    # Group table
+
+    def _entry(self, group: int) -> Tuple[int, bool]:
+        """Return the word index of group's entry (or of its free spot)."""
+        size = self._get(_H_TABLE_SIZE)
+        mask = size - 1
+        position = hash(group) & mask
+        while True:
+            base = _HEADER_WORDS + position * _ENTRY_WORDS
+            if not self._get(base + _E_USED):
+                return base, False
+            if self._get(base + _E_GROUP) == group:
+                return base, True
+            position = (position + 1) & mask
+
+    def _delete_entry(self, base: int) -> None:
+        """Free a table entry, shifting later entries back to fill the hole."""
+        size = self._get(_H_TABLE_SIZE)
+        mask = size - 1
+        hole = (base - _HEADER_WORDS) // _ENTRY_WORDS
+        position = hole
+        while True:
+            position = (position + 1) & mask
+            current = _HEADER_WORDS + position * _ENTRY_WORDS
+            if not self._get(current + _E_USED):
+                break
+            home = hash(self._get(current + _E_GROUP)) & mask
+            # Leave entries whose home lies cyclically in (hole, position]
+            if hole < position:
+                stays = hole < home <= position
+            else:
+                stays = home > hole or home <= position
+            if stays:
+                continue
+            target = _HEADER_WORDS + hole * _ENTRY_WORDS
+            for offset in range(_ENTRY_WORDS):
+                self._set(target + offset, self._get(current + offset))
+            hole = position
+        self._set(_HEADER_WORDS + hole * _ENTRY_WORDS + _E_USED, 0)
+        self._set(_H_GROUPS, self._get(_H_GROUPS) - 1)
+
+    def _rehash(self, size: int) -> None:
+        """
+        Rebuild the group table with size entries.
+
+        The slots start right after the table, so they move up with it;
+        the buffer must already hold ``layout_words(capacity, size // 2)``
+        words. Every slot in use is rewritten, which doubling the table
+        amortizes to O(1) per group added.
+        """
+        start = self._slot(0)
+        used = self._get(_H_USED) * _SLOT_WORDS
+        moved = [self._get(start + i) for i in range(used)]
+        entries = []
+        for position in range(self._get(_H_TABLE_SIZE)):
+            base = _HEADER_WORDS + position * _ENTRY_WORDS
+            if self._get(base + _E_USED):
+                entries.append(
+                    [self._get(base + offset) for offset in range(_ENTRY_WORDS)]
+                )
+
+        self._set(_H_TABLE_SIZE, size)
+        start = self._slot(0)
+        for i, value in enumerate(moved):
+            self._set(start + i, value)
+        for position in range(size):
+            self._set(_HEADER_WORDS + position * _ENTRY_WORDS + _E_USED, 0)
+        for words in entries:
+            base, _ = self._entry(words[_E_GROUP])
+            for offset, value in enumerate(words):
+                self._set(base + offset, value)
+
+    # Slots
+
+    def _alloc(self, item_id: int, group: int) -> int:
+        """Store an entry in a free slot and return the slot."""
+        slot = self._get(_H_FREE)
+        if slot == _NIL:
+            slot = self._get(_H_USED)
+            if slot >= self._get(_H_CAPACITY):
+                self._grow()
+            self._set(_H_USED, slot + 1)
+        else:
+            self._set(_H_FREE, self._get(self._slot(slot) + _S_NEXT))
+        base = self._slot(slot)
+        self._set(base + _S_ITEM, item_id)
+        self._set(base + _S_GROUP, group)
+        self._set(base + _S_NEXT, _NIL)
+        self._set(base + _S_GROUP_NEXT, _NIL)
+        return slot
+
+    def _link(self, item_id: int, group: int, after_group: bool) -> None:
+        """Add an entry behind the last of its group, or at the end."""
+        entry, found = self._entry(group)
+        if not found and self._get(_H_GROUPS) >= self.max_groups:
+            self._grow_table()
+            entry, found = self._entry(group)
+        slot = self._alloc(item_id, group)
+        base = self._slot(slot)
+
+        after = self._get(entry + _E_TAIL) if found and after_group else _NIL
+        if after == _NIL:
+            tail = self._get(_H_TAIL)
+            if tail == _NIL:
+                self._set(_H_HEAD, slot)
+            else:
+                self._set(self._slot(tail) + _S_NEXT, slot)
+            self._set(_H_TAIL, slot)
+        else:
+            after_base = self._slot(after)
+            self._set(base + _S_NEXT, self._get(after_base + _S_NEXT))
+            self._set(after_base + _S_NEXT, slot)
+            if after == self._get(_H_TAIL):
+                self._set(_H_TAIL, slot)
+
+        if found:
+            last = self._get(entry + _E_TAIL)
+            self._set(self._slot(last) + _S_GROUP_NEXT, slot)
+            self._set(entry + _E_COUNT, self._get(entry + _E_COUNT) + 1)
+        else:
+            self._set(entry + _E_USED, 1)
+            self._set(entry + _E_GROUP, group)
+            self._set(entry + _E_HEAD, slot)
+            self._set(entry + _E_COUNT, 1)
+            self._set(_H_GROUPS, self._get(_H_GROUPS) + 1)
+        self._set(entry + _E_TAIL, slot)
+        self._set(_H_SIZE, self._get(_H_SIZE) + 1)
+
+    def _find(self, item_id: int, group: int) -> int:
+        """Return the first slot holding the entry, or _NIL."""
+        entry, found = self._entry(group)
+        slot = self._get(entry + _E_HEAD) if found else _NIL
+        while slot != _NIL:
+            base = self._slot(slot)
+            if self._get(base + _S_ITEM) == item_id:
+                return slot
+            slot = self._get(base + _S_GROUP_NEXT)
+        return _NIL
+
+    def _read(self, slot: int) -> Any:
+        base = self._slot(slot)
+        return self.item_factory(self._get(base + _S_ITEM), self._get(base + _S_GROUP))
+
+    def _pop(self) -> Any:
+        slot = self._get(_H_HEAD)
+        if slot == _NIL:
+            raise IndexError("Cannot dequeue from empty queue")
+        result = self._read(slot)
+        base = self._slot(slot)
+        group = self._get(base + _S_GROUP)
+
+        following = self._get(base + _S_NEXT)
+        self._set(_H_HEAD, following)
+        if following == _NIL:
+            self._set(_H_TAIL, _NIL)
+        entry, _ = self._entry(group)
+        group_next = self._get(base + _S_GROUP_NEXT)
+        if group_next == _NIL:
+            self._delete_entry(entry)
+        else:
+            self._set(entry + _E_HEAD, group_next)
+            self._set(entry + _E_COUNT, self._get(entry + _E_COUNT) - 1)
+
+        # Recycle the slot
+        self._set(base + _S_NEXT, self._get(_H_FREE))
+        self._set(_H_FREE, slot)
+        self._set(_H_SIZE, self._get(_H_SIZE) - 1)
+        return result
+
+    # Queue API
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line."""
+        item_id = _check_word(item.item, "item")
+        group = _check_word(item.group, "group")
+        with self._operation():
+            self._link(item_id, group, after_group=False)
+
+    def put(self, item: Item, friend: Item) -> None:
+        """
+        Add an item to the queue next to its friends.
+
+        Args:
+            item: The item to add to the queue
+            friend: An existing item in the queue (used for validation)
+
+        Raises:
+            ValueError: If friend is not found in the queue
+        """
+        item_id = _check_word(item.item, "item")
+        group = _check_word(item.group, "group")
+        if not isinstance(friend.item, int) or not isinstance(friend.group, int):
+            raise ValueError("Friend not found in queue")
+        if self._find(friend.item, friend.group) == _NIL:
+            raise ValueError("Friend not found in queue")
+        with self._operation():
+            self._link(item_id, group, after_group=True)
+
+    def enqueue(self, item: Item, friend: Optional[Item] = None) -> None:
+        """
+        Add an item to the queue, next to friend if one is given.
+
+        Without a friend the item goes to the end of the line.
+
+        Args:
+            item: The item to add
+            friend: Optional existing item to join
+        """
+        if friend is None:
+            self.append(item)
+        else:
+            self.put(item, friend)
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """
+        Add a batch of ``(item, friend)`` pairs, as ``enqueue`` would.
+
+        Raises:
+            ValueError: If a friend is not found in the queue. Items before
+                the offending pair are still added.
+        """
+        with self._operation():
+            for item, friend in pairs:
+                try:
+                    self.enqueue(item, friend)
+                except ValueError as error:
+                    # Keep the items placed so far, like IsraeliQueue does
+                    failure: Optional[ValueError] = error
+                    break
+            else:
+                failure = None
+        if failure is not None:
+            raise failure
+
+    def dequeue(self) -> Any:
+        """
+        Remove and return the first item from the queue.
+
+        Returns:
+            The first item in the queue
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        with self._operation():
+            return self._pop()
+
+    def dequeue_many(self, n: int) -> List[Any]:
+        """
+        Remove and return up to ``n`` items from the front of the queue.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        with self._operation():
+            return [self._pop() for _ in range(min(n, self.size()))]
+
+    def peek(self) -> Any:
+        """
+        Return the first item without removing it.
+
+        Returns:
+            The first item in the queue
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        slot = self._get(_H_HEAD)
+        if slot == _NIL:
+            raise IndexError("Cannot peek empty queue")
+        return self._read(slot)
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty."""
+        return self._get(_H_SIZE) == 0
+
+    def size(self) -> int:
+        """Return the number of items in the queue."""
+        return self._get(_H_SIZE)
+
+    def get_groups(self) -> List[int]:
+        """Get all unique group numbers in the queue."""
+        groups = []
+        for position in range(self._get(_H_TABLE_SIZE)):
+            base = _HEADER_WORDS + position * _ENTRY_WORDS
+            if self._get(base + _E_USED):
+                groups.append(self._get(base + _E_GROUP))
+        return groups
+
+    def group_size(self, group: Any) -> int:
+        """Return the number of queued items in a group."""
+        if not isinstance(group, int):
+            return 0
+        entry, found = self._entry(group)
+        return self._get(entry + _E_COUNT) if found else 0
+
+    def _iter_group(self, group: Any) -> Iterator[Any]:
+        if not isinstance(group, int):
+            return
+        entry, found = self._entry(group)
+        slot = self._get(entry + _E_HEAD) if found else _NIL
+        while slot != _NIL:
+            yield self._read(slot)
+            slot = self._get(self._slot(slot) + _S_GROUP_NEXT)
+
+    def items_in_group(self, group: int) -> QueueView:
+        """
+        Get a live, read-only view of the items of a group, in line order.
+
+        Reading the view follows the group's links and decodes only the
+        items read, and ``len`` is O(1).
+        """
+        return QueueView(
+            lambda: self._iter_group(group), lambda: self.group_size(group)
+        )
+
+    def __contains__(self, item: object) -> bool:
+        item_id = getattr(item, "item", None)
+        group = getattr(item, "group", None)
+        if not isinstance(item_id, int) or not isinstance(group, int):
+            return False
+        return self._find(item_id, group) != _NIL
+
+    def __len__(self) -> int:
+        return self._get(_H_SIZE)
+
+    def __iter__(self) -> Iterator[Any]:
+        slot = self._get(_H_HEAD)
+        while slot != _NIL:
+            yield self._read(slot)
+            slot = self._get(self._slot(slot) + _S_NEXT)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
@@ -0,0 +1,174 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+from .IsraeliQueue import Item
+from .linked import LinkedIsraeliQueue
+
+
+class AsyncIsraeliQueue:
+    """
+    An Israeli queue for asyncio code, modeled on ``asyncio.Queue``.
+
+    ``put`` has the same group-join semantics as ``IsraeliQueue.put`` when a
+    friend is given. Coroutines waiting in ``get`` (or in ``put`` while a
+    positive ``maxsize`` is reached) are parked on futures and woken one
+    at a time, so nothing polls. Like ``asyncio.Queue`` it is not
+    thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._maxsize = maxsize
+        self._queue = LinkedIsraeliQueue()
+        self._getters: Deque["asyncio.Future[None]"] = deque()
+        self._putters: Deque["asyncio.Future[None]"] = deque()
+        self._unfinished_tasks = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    @staticmethod
+    def _wakeup_next(waiters: Deque["asyncio.Future[None]"]) -> None:
+        # Wake up the first waiter that is still waiting
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    @property
+    def maxsize(self) -> int:
+        """Number of items allowed in the queue, or 0 for no limit."""
+        return self._maxsize
+
+    def qsize(self) -> int:
+        """Return the number of items in the queue."""
+        return len(self._queue)
+
+    def empty(self) -> bool:
+        """Return True if the queue is empty."""
+        return not len(self._queue)
+
+    def full(self) -> bool:
+        """Return True if there are maxsize items in the queue."""
+        return 0 < self._maxsize <= len(self._queue)
+
+    def group_size(self, group: Any) -> int:
+        """Return the number of queued items in a group."""
+        return self._queue.group_size(group)
+
+    def get_groups(self) -> List[Any]:
+        """Get all unique group numbers in the queue."""
+        return self._queue.get_groups()
+
+    def position_of(self, item: Item) -> int:
+        """Return the position of item in line, in O(log n)."""
+        return self._queue.position_of(item)
+
+    def group_span(self, group: Any) -> Tuple[int, int]:
+        """Return the positions of the first and last items of a group."""
+        return self._queue.group_span(group)
+
+    def estimated_wait(self, item: Item, service_rate: float) -> float:
+        """Estimate how long item waits, with service_rate items served per unit."""
+        return self._queue.estimated_wait(item, service_rate)
+
+    async def put(self, item: Item, friend: Optional[Item] = None) -> None:
+        """
+        Add an item to the queue, waiting for a free slot if it is full.
+
+        Args:
+            item: The item to add
+            friend: Optional existing item to join
+
+        Raises:
+            ValueError: If friend is not found in the queue
+        """
+        while self.full():
+            putter = asyncio.get_running_loop().create_future()
+            self._putters.append(putter)
+            try:
+                await putter
+            except BaseException:
+                putter.cancel()  # Just in case putter is not done yet
+                try:
+                    self._putters.remove(putter)
+                except ValueError:
+                    # The putter was already woken up, pass the wakeup on
+                    pass
+                if not self.full() and not putter.cancelled():
+                    self._wakeup_next(self._putters)
+                raise
+        try:
+            self.put_nowait(item, friend)
+        except ValueError:
+            # Pass on the free slot this put may have been woken for
+            self._wakeup_next(self._putters)
+            raise
+
+    def put_nowait(self, item: Item, friend: Optional[Item] = None) -> None:
+        """
+        Add an item to the queue without waiting.
+
+        Raises:
+            asyncio.QueueFull: If the queue is full
+            ValueError: If friend is not found in the queue
+        """
+        if self.full():
+            raise asyncio.QueueFull
+        self._queue.enqueue(item, friend)
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._wakeup_next(self._getters)
+
+    async def get(self) -> Item:
+        """Remove and return the first item, waiting until one is available."""
+        while self.empty():
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()  # Just in case getter is not done yet
+                try:
+                    self._getters.remove(getter)
+                except ValueError:
+                    # The getter was already woken up, pass the wakeup on
+                    pass
+                if not self.empty() and not getter.cancelled():
+                    self._wakeup_next(self._getters)
+                raise
+        return self.get_nowait()
+
+    def get_nowait(self) -> Item:
+        """
+        Remove and return the first item without waiting.
+
+        Raises:
+            asyncio.QueueEmpty: If the queue is empty
+        """
+        if self.empty():
+            raise asyncio.QueueEmpty
+        item = self._queue.dequeue()
+        self._wakeup_next(self._putters)
+        return item
+
+    def task_done(self) -> None:
+        """
+        Mark a previously fetched item as processed.
+
+        Raises:
+            ValueError: If called more times than there were items put
+        """
+        if self._unfinished_tasks <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished_tasks -= 1
+        if self._unfinished_tasks == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Wait until every item put has been fetched and marked done."""
+        if self._unfinished_tasks > 0:
+            await self._finished.wait()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} maxsize={self._maxsize} qsize={self.qsize()}>"
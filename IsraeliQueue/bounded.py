@@ -0,0 +1,168 @@
+from queue import Full
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from .IsraeliQueue import Item, IsraeliQueue
+
+REJECT = "reject"
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+NEW_BLOCK = "new-block"
+
+_OVERFLOW_POLICIES = (REJECT, DROP_OLDEST, DROP_NEWEST)
+_GROUP_POLICIES = (REJECT, DROP_OLDEST, DROP_NEWEST, NEW_BLOCK)
+
+
+class BoundedIsraeliQueue(IsraeliQueue):
+    """
+    An IsraeliQueue with a size limit and a per-group quota.
+
+    ``enqueue``, ``put`` and ``enqueue_many`` admit items within
+    ``maxsize`` items in total and ``max_group_size`` items per group. The
+    limits are checked against the queue's length and group counters, so
+    admission never scans the line. When a limit is reached the policy
+    decides what happens:
+
+    - ``"reject"``: raise ``queue.Full`` and leave the queue unchanged
+    - ``"drop-oldest"``: evict the first item of the line (or group)
+    - ``"drop-newest"``: drop the arriving item and leave the queue
+      unchanged
+    - ``"new-block"`` (groups only): admit the item at the back of the
+      line instead of behind its friends, so a large group cannot push
+      everyone else further back
+
+    Evicted and dropped items are passed to ``on_drop``. Evicting takes an
+    item out of the list like ``cancel`` does, in O(n), and finding the
+    first member of a group is O(n) as well; rejecting and dropping the
+    arrival are O(1). The inherited list methods (``append``, ``insert``
+    and so on) add items unchecked.
+
+    Args:
+        items: Initial items, enqueued one by one under the limits
+        maxsize: Maximum number of items, or 0 for no limit
+        max_group_size: Maximum number of items per group, or None
+        overflow: Policy when the queue holds ``maxsize`` items
+        group_overflow: Policy when a group holds ``max_group_size`` items
+        on_drop: Called with every evicted or dropped item
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Item] = (),
+        maxsize: int = 0,
+        max_group_size: Optional[int] = None,
+        overflow: str = REJECT,
+        group_overflow: str = REJECT,
+        on_drop: Optional[Callable[[Item], Any]] = None,
+    ) -> None:
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+        if group_overflow not in _GROUP_POLICIES:
+            raise ValueError(f"Unknown group overflow policy {group_overflow!r}")
+        if max_group_size is not None and max_group_size < 1:
+            raise ValueError("max_group_size must be positive")
+        super().__init__()
+        self.maxsize = maxsize
+        self.max_group_size = max_group_size
+        self.overflow = overflow
+        self.group_overflow = group_overflow
+        self.on_drop = on_drop
+        for item in items:
+            self.enqueue(item)
+
+    def full(self) -> bool:
+        """Return True if the queue holds maxsize items."""
+        return 0 < self.maxsize <= len(self)
+
+    def _evict(self, position: int) -> None:
+        item = self._drop([position])[0]
+        if self.on_drop is not None:
+            self.on_drop(item)
+
+    def _admit(self, item: Item) -> Optional[str]:
+        """
+        Make room for item and decide where it goes.
+
+        Returns:
+            ``NEW_BLOCK`` if it goes to the back of the line rather than
+            join its friends, ``DROP_NEWEST`` if it was dropped instead,
+            or None
+
+        Raises:
+            queue.Full: If a limit is reached and its policy is reject
+        """
+        group = item.group
+        cap = self.max_group_size
+        group_full = cap is not None and self._group_counts.get(group, 0) >= cap
+        line_full = 0 < self.maxsize <= len(self)
+        # Reject before evicting anything; a group eviction frees a slot too
+        if group_full and self.group_overflow == REJECT:
+            raise Full(f"Group {group!r} is full")
+        group_evicts = group_full and self.group_overflow == DROP_OLDEST
+        if line_full and not group_evicts and self.overflow == REJECT:
+            raise Full("Queue is full")
+
+        if (group_full and self.group_overflow == DROP_NEWEST) or (
+            line_full and not group_evicts and self.overflow == DROP_NEWEST
+        ):
+            if self.on_drop is not None:
+                self.on_drop(item)
+            return DROP_NEWEST
+        if group_evicts:
+            # Equal items share a group, so the first match is the first member
+            self._evict(self.index(self._group_index()[group][0]))
+        elif line_full:
+            self._evict(0)
+        return NEW_BLOCK if group_full and not group_evicts else None
+
+    def _place(self, item: Item, friend: Optional[Item]) -> bool:
+        """Admit item and add it to the line; return False if it was dropped."""
+        if friend is not None and friend not in self:
+            raise ValueError("Friend not found in queue")
+        admitted = self._admit(item)
+        if admitted == DROP_NEWEST:
+            return False
+        # An eviction may have taken friend, so join whoever is left
+        members = self._group_index().get(item.group)
+        if friend is None or admitted == NEW_BLOCK or not members:
+            self.append(item)
+        else:
+            super().put(item, members[0])
+        return True
+
+    def put(self, item: Item, friend: Item) -> None:
+        """
+        Add an item to the queue next to its friends, within the limits.
+
+        Raises:
+            ValueError: If friend is not found in the queue
+            queue.Full: If a limit is reached and its policy is reject
+        """
+        self._place(item, friend)
+
+    def enqueue(
+        self,
+        item: Item,
+        friend: Optional[Item] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """
+        Add an item to the queue, within the limits; see ``IsraeliQueue.enqueue``.
+
+        Raises:
+            ValueError: If friend is not found in the queue
+            queue.Full: If a limit is reached and its policy is reject
+        """
+        if self._place(item, friend) and expires_at is not None:
+            self._set_deadline(item, expires_at)
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """
+        Add ``(item, friend)`` pairs one by one, as ``enqueue`` would.
+
+        Raises:
+            ValueError: If a friend is not found in the queue
+            queue.Full: If a limit is reached and its policy is reject.
+                Either way, items before the offending pair are still added.
+        """
+        for item, friend in pairs:
+            self.enqueue(item, friend)
@@ -0,0 +1,271 @@
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ._wordqueue import _check_word
+from .IsraeliQueue import Item
+from .views import QueueView
+
+# Marks the end of a chain of slots
+_NIL = -1
+
+
+class ColumnarIsraeliQueue:
+    """
+    An Israeli queue of integer items and groups stored in flat arrays.
+
+    Each queued entry occupies one slot spread over four columns: the item
+    and its group as 64-bit integers, plus two 32-bit links, one to the next
+    slot in line and one to the next slot of the same group. Per-group head
+    and tail offsets make joining behind the last friend and serving the
+    front O(1), and slots freed by ``dequeue`` are recycled. That is about 24
+    bytes per waiting entry, against well over 100 for an ``Item`` in an
+    ``IsraeliQueue``.
+
+    The API mirrors ``IsraeliQueue``: items go in as ``Item`` (or anything
+    with integer ``item`` and ``group`` attributes) and are rebuilt lazily
+    with ``item_factory`` only when they are read back. Friend validation in
+    ``put`` walks the friend's group, so it costs O(size of that group).
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Item] = (),
+        item_factory: Callable[[int, int], Any] = Item,
+    ) -> None:
+        self.item_factory = item_factory
+        self._items = array("q")
+        self._groups = array("q")
+        self._next = array("i")
+        self._group_next = array("i")
+        self._head = _NIL
+        self._tail = _NIL
+        self._free = _NIL
+        self._group_head: Dict[int, int] = {}
+        self._group_tail: Dict[int, int] = {}
+        self._group_counts: Dict[int, int] = {}
+        self._size = 0
+        for item in items:
+            self.enqueue(item)
+
+    def _alloc(self, item_id: int, group: int) -> int:
+        """Store an entry in a free slot and return the slot."""
+        slot = self._free
+        if slot == _NIL:
+            slot = len(self._items)
+            self._items.append(item_id)
+            self._groups.append(group)
+            self._next.append(_NIL)
+            self._group_next.append(_NIL)
+        else:
+            self._free = self._next[slot]
+            self._items[slot] = item_id
+            self._groups[slot] = group
+            self._next[slot] = _NIL
+            self._group_next[slot] = _NIL
+        return slot
+
+    def _link(self, slot: int, after: int) -> None:
+        """Link a fresh slot into line after ``after`` (or at the end)."""
+        group = self._groups[slot]
+        if after == _NIL:
+            if self._tail == _NIL:
+                self._head = slot
+            else:
+                self._next[self._tail] = slot
+            self._tail = slot
+        else:
+            self._next[slot] = self._next[after]
+            self._next[after] = slot
+            if after == self._tail:
+                self._tail = slot
+
+        last = self._group_tail.get(group)
+        if last is None:
+            self._group_head[group] = slot
+            self._group_counts[group] = 1
+        else:
+            self._group_next[last] = slot
+            self._group_counts[group] += 1
+        self._group_tail[group] = slot
+        self._size += 1
+
+    def _find(self, item_id: int, group: int) -> int:
+        """Return the first slot holding the entry, or _NIL."""
+        slot = self._group_head.get(group, _NIL)
+        while slot != _NIL and self._items[slot] != item_id:
+            slot = self._group_next[slot]
+        return slot
+
+    def _read(self, slot: int) -> Any:
+        return self.item_factory(self._items[slot], self._groups[slot])
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line."""
+        item_id = _check_word(item.item, "item")
+        group = _check_word(item.group, "group")
+        self._link(self._alloc(item_id, group), _NIL)
+
+    def put(self, item: Item, friend: Item) -> None:
+        """
+        Add an item to the queue next to its friends.
+
+        Args:
+            item: The item to add to the queue
+            friend: An existing item in the queue (used for validation)
+
+        Raises:
+            ValueError: If friend is not found in the queue
+        """
+        item_id = _check_word(item.item, "item")
+        group = _check_word(item.group, "group")
+        if friend not in self:
+            raise ValueError("Friend not found in queue")
+
+        # Insert after the furthest friend, or at the end if there is none
+        after = self._group_tail.get(group, _NIL)
+        self._link(self._alloc(item_id, group), after)
+
+    def enqueue(self, item: Item, friend: Optional[Item] = None) -> None:
+        """
+        Add an item to the queue, next to friend if one is given.
+
+        Without a friend the item goes to the end of the line.
+
+        Args:
+            item: The item to add
+            friend: Optional existing item to join
+        """
+        if friend is None:
+            self.append(item)
+        else:
+            self.put(item, friend)
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """
+        Add a batch of ``(item, friend)`` pairs, as ``enqueue`` would.
+
+        Raises:
+            ValueError: If a friend is not found in the queue. Items before
+                the offending pair are still added.
+        """
+        for item, friend in pairs:
+            self.enqueue(item, friend)
+
+    def dequeue(self) -> Any:
+        """
+        Remove and return the first item from the queue.
+
+        Returns:
+            The first item in the queue
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        slot = self._head
+        if slot == _NIL:
+            raise IndexError("Cannot dequeue from empty queue")
+        result = self._read(slot)
+        group = self._groups[slot]
+
+        self._head = self._next[slot]
+        if self._head == _NIL:
+            self._tail = _NIL
+        following = self._group_next[slot]
+        if following == _NIL:
+            del self._group_head[group]
+            del self._group_tail[group]
+            del self._group_counts[group]
+        else:
+            self._group_head[group] = following
+            self._group_counts[group] -= 1
+
+        # Recycle the slot
+        self._next[slot] = self._free
+        self._free = slot
+        self._size -= 1
+        return result
+
+    def dequeue_many(self, n: int) -> List[Any]:
+        """
+        Remove and return up to ``n`` items from the front of the queue.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        return [self.dequeue() for _ in range(min(n, self._size))]
+
+    def peek(self) -> Any:
+        """
+        Return the first item without removing it.
+
+        Returns:
+            The first item in the queue
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if self._head == _NIL:
+            raise IndexError("Cannot peek empty queue")
+        return self._read(self._head)
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty."""
+        return self._size == 0
+
+    def size(self) -> int:
+        """Return the number of items in the queue."""
+        return self._size
+
+    def get_groups(self) -> List[int]:
+        """Get all unique group numbers in the queue."""
+        return list(self._group_counts)
+
+    def group_size(self, group: int) -> int:
+        """Return the number of queued items in a group."""
+        return self._group_counts.get(group, 0)
+
+    def _iter_group(self, group: int) -> Iterator[Any]:
+        slot = self._group_head.get(group, _NIL)
+        while slot != _NIL:
+            yield self._read(slot)
+            slot = self._group_next[slot]
+
+    def items_in_group(self, group: int) -> QueueView:
+        """
+        Get a live, read-only view of the items of a group, in line order.
+
+        Reading the view follows the group's links and rebuilds only the
+        items read, and ``len`` is O(1).
+        """
+        return QueueView(
+            lambda: self._iter_group(group),
+            lambda: self._group_counts.get(group, 0),
+        )
+
+    def nbytes(self) -> int:
+        """Return the number of bytes held by the column arrays."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._items, self._groups, self._next, self._group_next)
+        )
+
+    def __contains__(self, item: object) -> bool:
+        item_id = getattr(item, "item", None)
+        group = getattr(item, "group", None)
+        if not isinstance(item_id, int) or not isinstance(group, int):
+            return False
+        return self._find(item_id, group) != _NIL
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        slot = self._head
+        while slot != _NIL:
+            yield self._read(slot)
+            slot = self._next[slot]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
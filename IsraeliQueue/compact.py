@@ -0,0 +1,126 @@
+from dataclasses import FrozenInstanceError
+from typing import Any, Dict, List, Tuple
+
+from .IsraeliQueue import Item
+
+
+class GroupTable:
+    """
+    Interns group values, so equal groups share one object.
+
+    Each interned group is counted once per holder, and ``release`` forgets
+    it when the last holder lets go, so the table only ever holds the
+    groups in use.
+    """
+
+    def __init__(self) -> None:
+        # Group -> [interned group, number of holders]
+        self._entries: Dict[Any, List[Any]] = {}
+
+    def intern(self, group: Any) -> Any:
+        """Return the interned object equal to group, holding it once more."""
+        entry = self._entries.get(group)
+        if entry is None:
+            entry = self._entries[group] = [group, 0]
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, group: Any) -> None:
+        """Let go of an interned group, forgetting it after the last holder."""
+        entry = self._entries[group]
+        entry[1] -= 1
+        if not entry[1]:
+            del self._entries[group]
+
+    def __contains__(self, group: object) -> bool:
+        return group in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+#: The table shared by every compact item
+groups = GroupTable()
+
+
+class CompactItem:
+    """
+    A slotted drop-in for ``Item`` with an interned group.
+
+    Instances have no ``__dict__`` and store only the payload and the group,
+    interned in the shared ``groups`` table so items of one group share a
+    single group object. The table releases a group when its last item is
+    gone. Hashing reads the two slots directly, without a per-instance
+    cache: a cached hash is an int object of its own, which would make
+    every instance larger than an ``Item``. Instances hash and compare equal
+    to an ``Item`` with the same payload and group, and ``same_group`` works
+    across both kinds, so they can share a queue.
+    """
+
+    __slots__ = ("item", "group")
+
+    item: Any
+    group: Any
+
+    _table = groups
+
+    def __init__(self, item: Any, group: Any) -> None:
+        object.__setattr__(self, "item", item)
+        object.__setattr__(self, "group", self._table.intern(group))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "group":
+            old = self.group
+            object.__setattr__(self, name, self._table.intern(value))
+            self._table.release(old)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if name == "group":
+            self._table.release(self.group)
+        object.__delattr__(self, name)
+
+    def __del__(self) -> None:
+        try:
+            group = self.group
+        except AttributeError:
+            # Never interned, or already released by __delattr__
+            return
+        self._table.release(group)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (CompactItem, Item)):
+            return bool(self.item == other.item and self.group == other.group)
+        return NotImplemented
+
+    def same_group(self, other: object) -> bool:
+        """Check if this item is in the same group as another item."""
+        if isinstance(other, (CompactItem, Item)):
+            return bool(self.group == other.group)
+        return False
+
+    def __hash__(self) -> int:
+        return hash((self.item, self.group))
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, Any]]:
+        # Rebuild through __init__, so the group is interned on load
+        return (type(self), (self.item, self.group))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(item={self.item!r}, group={self.group})"
+
+    def __str__(self) -> str:
+        return f"{type(self).__name__}({self.item}, group={self.group})"
+
+
+class FrozenCompactItem(CompactItem):
+    """A ``CompactItem`` whose fields cannot be reassigned."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
@@ -0,0 +1,298 @@
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .IsraeliQueue import Item, _ItemCounter
+from .views import QueueView
+
+
+class _Lane:
+    """The waiting items of one group and its deficit round-robin state."""
+
+    __slots__ = ("group", "items", "weight", "deficit", "ready", "joined")
+
+    def __init__(self, group: Any, weight: float) -> None:
+        self.group = group
+        self.items: Deque[Item] = deque()
+        self.weight = weight
+        # Credit left for this turn, in items
+        self.deficit = weight
+        # Leading items that may be served this turn, and how many of them
+        # joined a friend since the turn began
+        self.ready = 0
+        self.joined = 0
+
+    def copy(self) -> "_Lane":
+        """Return a lane with the same items and turn state."""
+        lane = _Lane(self.group, self.weight)
+        lane.items = deque(self.items)
+        lane.deficit = self.deficit
+        lane.ready = self.ready
+        lane.joined = self.joined
+        return lane
+
+    def turn_over(self) -> None:
+        """End the lane's turn: credit carries over only if it ran out."""
+        self.deficit = (self.deficit if self.ready else 0) + self.weight
+        self.ready = len(self.items)
+        self.joined = 0
+
+    def rounds_short(self) -> int:
+        """Return the number of turns the lane needs before it can serve."""
+        if self.deficit >= 1:
+            return 0
+        rounds = math.ceil((1 - self.deficit) / self.weight)
+        # Make up for rounding in the division
+        while self.deficit + rounds * self.weight < 1:
+            rounds += 1
+        return rounds
+
+
+def _serving_lane(ring: Deque[_Lane]) -> _Lane:
+    """Pass the turn on until the first lane in a non-empty ring can serve."""
+    for _ in range(len(ring)):
+        lane = ring[0]
+        if lane.ready and lane.deficit >= 1:
+            return lane
+        ring.rotate(-1)
+        lane.turn_over()
+    # Every lane has had a turn and now has items ready, but some weights
+    # are below one and no lane has a whole credit: skip the rounds in which
+    # none could serve in one step, rather than one turn at a time
+    rounds = [lane.rounds_short() for lane in ring]
+    needed = min(rounds)
+    first = rounds.index(needed)
+    for position, lane in enumerate(ring):
+        turns = needed + 1 if position < first else needed
+        if turns:
+            lane.deficit += turns * lane.weight
+            lane.joined = 0
+    ring.rotate(-first)
+    return ring[0]
+
+
+class FairIsraeliQueue:
+    """
+    An Israeli queue that shares service between groups by deficit round robin.
+
+    Every group with waiting items has a lane, and lanes take turns in a
+    ring. A lane's turn adds its group's weight to its credit, and serving
+    an item costs one credit, so per round a group is served about
+    ``weight`` items and nobody waits behind a large group for longer than
+    a round. Weights default to ``default_weight``; ``math.inf`` serves a
+    lane for as long as it has items ready.
+
+    Within a lane, items are served in order. An item that joins a friend
+    may be served in the lane's current turn, but at most
+    ``max_join_ahead`` of them per turn; later joiners, and members that
+    arrive without a friend, wait for the lane's next turn, behind the
+    strangers already in line. Both ``enqueue`` and ``dequeue`` are
+    O(1), amortized over the turns of lanes with weights of at least one.
+    When weights below one leave every lane short of credit, ``dequeue``
+    skips the idle rounds at once, in O(number of lanes).
+
+    Args:
+        items: Initial items, enqueued in order
+        weights: Weight of some groups
+        default_weight: Weight of the other groups
+        max_join_ahead: Maximum friends per turn that join ahead of
+            strangers, or None for no limit
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Item] = (),
+        weights: Optional[Dict[Any, float]] = None,
+        default_weight: float = 1,
+        max_join_ahead: Optional[int] = None,
+    ) -> None:
+        if default_weight <= 0:
+            raise ValueError("weights must be positive")
+        if max_join_ahead is not None and max_join_ahead < 0:
+            raise ValueError("max_join_ahead must not be negative")
+        self.default_weight = default_weight
+        self.max_join_ahead = max_join_ahead
+        self._weights: Dict[Any, float] = {}
+        self._lanes: Dict[Any, _Lane] = {}
+        self._ring: Deque[_Lane] = deque()
+        self._members = _ItemCounter()
+        self._size = 0
+        for group, weight in (weights or {}).items():
+            self.set_weight(group, weight)
+        self.extend(items)
+
+    def set_weight(self, group: Any, weight: float) -> None:
+        """Set the weight of a group, from its next turn on."""
+        if weight <= 0:
+            raise ValueError("weights must be positive")
+        self._weights[group] = weight
+        lane = self._lanes.get(group)
+        if lane is not None:
+            lane.weight = weight
+
+    def weight(self, group: Any) -> float:
+        """Return the weight of a group."""
+        return self._weights.get(group, self.default_weight)
+
+    def _add(self, item: Item, joining: bool) -> None:
+        group = item.group
+        lane = self._lanes.get(group)
+        if lane is None:
+            # A new lane joins the back of the ring, ready for its turn
+            lane = self._lanes[group] = _Lane(group, self.weight(group))
+            self._ring.append(lane)
+            lane.ready = 1
+        elif (
+            joining
+            and lane.ready == len(lane.items)
+            and (self.max_join_ahead is None or lane.joined < self.max_join_ahead)
+        ):
+            lane.ready += 1
+            lane.joined += 1
+        lane.items.append(item)
+        self._members.add(item)
+        self._size += 1
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line."""
+        self._add(item, joining=False)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add several items to the end of the line."""
+        for item in items:
+            self._add(item, joining=False)
+
+    def put(self, item: Item, friend: Item) -> None:
+        """
+        Add an item to the queue next to its friends.
+
+        Args:
+            item: The item to add to the queue
+            friend: An existing item in the queue (used for validation)
+
+        Raises:
+            ValueError: If friend is not found in the queue
+        """
+        if friend not in self:
+            raise ValueError("Friend not found in queue")
+        self._add(item, joining=True)
+
+    def enqueue(self, item: Item, friend: Optional[Item] = None) -> None:
+        """
+        Add an item to the queue, next to friend if one is given.
+
+        Without a friend the item goes to the end of the line.
+
+        Args:
+            item: The item to add
+            friend: Optional existing item to join
+        """
+        if friend is None:
+            self._add(item, joining=False)
+        else:
+            self.put(item, friend)
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """
+        Add a batch of ``(item, friend)`` pairs, as ``enqueue`` would.
+
+        Raises:
+            ValueError: If a friend is not found in the queue. Items before
+                the offending pair are still added.
+        """
+        for item, friend in pairs:
+            self.enqueue(item, friend)
+
+    def _head(self) -> _Lane:
+        """Pass the turn on until the first lane in the ring can serve."""
+        return _serving_lane(self._ring)
+
+    def dequeue(self) -> Item:
+        """
+        Remove and return the next item to be served.
+
+        Returns:
+            The first item of the lane whose turn it is
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if not self._size:
+            raise IndexError("Cannot dequeue from empty queue")
+        lane = self._head()
+        item = lane.items.popleft()
+        lane.ready -= 1
+        lane.deficit -= 1
+        if not lane.items:
+            self._ring.popleft()
+            del self._lanes[lane.group]
+        self._members.remove(item)
+        self._size -= 1
+        return item
+
+    def dequeue_many(self, n: int) -> List[Item]:
+        """
+        Remove and return up to ``n`` items in the order they are served.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        return [self.dequeue() for _ in range(min(n, self._size))]
+
+    def peek(self) -> Item:
+        """
+        Return the next item to be served without removing it.
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if not self._size:
+            raise IndexError("Cannot peek empty queue")
+        return self._head().items[0]
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty."""
+        return self._size == 0
+
+    def size(self) -> int:
+        """Return the number of items in the queue."""
+        return self._size
+
+    def get_groups(self) -> List[Any]:
+        """Get the groups with waiting items, in turn order."""
+        return [lane.group for lane in self._ring]
+
+    def group_size(self, group: Any) -> int:
+        """Return the number of queued items in a group."""
+        lane = self._lanes.get(group)
+        return len(lane.items) if lane is not None else 0
+
+    def items_in_group(self, group: Any) -> QueueView:
+        """Get a live, read-only view of the items of a group, in order."""
+        return QueueView(
+            lambda: self._lanes[group].items if group in self._lanes else (),
+            lambda: self.group_size(group),
+        )
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._members
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Item]:
+        """Iterate in the order items would be served if none were added."""
+        # Replay the turns on copies of the lanes
+        ring = deque(lane.copy() for lane in self._ring)
+        while ring:
+            lane = _serving_lane(ring)
+            yield lane.items.popleft()
+            lane.ready -= 1
+            lane.deficit -= 1
+            if not lane.items:
+                ring.popleft()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
@@ -0,0 +1,506 @@
+"""
+Streaming snapshots and an append-only operation journal for IsraeliQueue.
+
+A snapshot is a header followed by CRC-checked frames of up to
+``chunk_size`` items. ``iter_snapshot`` yields it chunk by chunk, so a
+large queue can be written without building the whole file in memory.
+Runs of plain ``Item`` objects are stored as their payloads plus
+``(group, count)`` pairs, because friends stand next to each other.
+
+``JournaledIsraeliQueue`` keeps a directory with the latest snapshot and
+journal segments of every change to the line since. Each operation
+appends one small record, so saving costs time in
+proportion to the changes. ``checkpoint`` starts a new segment, writes a
+snapshot of the queue as of that moment and deletes the older segments.
+Opening the directory loads the snapshot and replays the journal.
+
+Frames are pickled, so only load snapshots and journals you trust.
+"""
+
+import os
+import pickle
+import re
+import struct
+import zlib
+from operator import index as as_index
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    SupportsIndex,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .IsraeliQueue import Item, IsraeliQueue
+
+_SNAPSHOT_MAGIC = b"IQSNAP"
+_VERSION = 1
+# Snapshot header: magic, version, first journal segment to replay
+_HEADER = struct.Struct("<6sBQ")
+# Frame header: payload length and its CRC32
+_FRAME = struct.Struct("<II")
+_SNAPSHOT_NAME = "snapshot"
+_SEGMENT_NAME = re.compile(r"journal-(\d+)\.log$")
+
+T = TypeVar("T")
+
+
+def _frame(obj: Any) -> bytes:
+    payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _read_frame(stream: BinaryIO) -> Tuple[Any, int]:
+    """Read one frame; return ``(obj, size)``, or ``(None, 0)`` if torn."""
+    header = stream.read(_FRAME.size)
+    if len(header) < _FRAME.size:
+        return None, 0
+    length, crc = _FRAME.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length or zlib.crc32(payload) != crc:
+        return None, 0
+    return pickle.loads(payload), _FRAME.size + length
+
+
+def _encode_chunk(items: List[Any]) -> Tuple[str, Any]:
+    if all(type(item) is Item for item in items):
+        runs: List[List[Any]] = []
+        for item in items:
+            if runs and runs[-1][0] == item.group:
+                runs[-1][1] += 1
+            else:
+                runs.append([item.group, 1])
+        return ("items", ([item.item for item in items], runs))
+    return ("objects", items)
+
+
+def _decode_chunk(kind: str, data: Any) -> List[Any]:
+    if kind == "objects":
+        objects: List[Any] = data
+        return objects
+    payloads, runs = data
+    groups = [group for group, count in runs for _ in range(count)]
+    return [Item(payload, group) for payload, group in zip(payloads, groups)]
+
+
+def iter_snapshot(
+    items: Iterable[Any], chunk_size: int = 1024, journal_segment: int = 0
+) -> Iterator[bytes]:
+    """
+    Serialize a queue as a stream of byte chunks.
+
+    Args:
+        items: The queue, or any iterable of its items in order
+        chunk_size: Number of items per frame
+        journal_segment: First journal segment to replay after loading
+
+    Yields:
+        The header, then one frame per chunk of items, then an end frame
+    """
+    yield _HEADER.pack(_SNAPSHOT_MAGIC, _VERSION, journal_segment)
+    chunk: List[Any] = []
+    count = 0
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield _frame(_encode_chunk(chunk))
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        yield _frame(_encode_chunk(chunk))
+        count += len(chunk)
+    yield _frame(("end", count))
+
+
+def write_snapshot(items: Iterable[Any], path: str, chunk_size: int = 1024) -> None:
+    """Write a snapshot file atomically; see ``iter_snapshot``."""
+    _write_atomic(path, iter_snapshot(items, chunk_size))
+
+
+def _write_atomic(path: str, chunks: Iterable[bytes]) -> None:
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def read_snapshot(stream: BinaryIO) -> Tuple[IsraeliQueue, int]:
+    """
+    Load a snapshot written by ``iter_snapshot``.
+
+    Returns:
+        The queue and the first journal segment to replay
+
+    Raises:
+        ValueError: If the stream is not a complete snapshot
+    """
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("Not an Israeli queue snapshot")
+    magic, version, segment = _HEADER.unpack(header)
+    if magic != _SNAPSHOT_MAGIC:
+        raise ValueError("Not an Israeli queue snapshot")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    queue = IsraeliQueue()
+    while True:
+        frame, _ = _read_frame(stream)
+        if frame is None:
+            raise ValueError("Snapshot is truncated or corrupt")
+        kind, data = frame
+        if kind == "end":
+            if data != len(queue):
+                raise ValueError("Snapshot is truncated or corrupt")
+            return queue, segment
+        queue.extend(_decode_chunk(kind, data))
+
+
+def load_snapshot(path: str) -> IsraeliQueue:
+    """Load the queue from a snapshot file."""
+    with open(path, "rb") as handle:
+        return read_snapshot(handle)[0]
+
+
+# Tags of journaled items: plain items, stored as their fields, which pickle
+# much smaller, and any other object, stored as itself
+_ITEM = 0
+_OBJECT = 1
+
+
+def _pack(item: Any) -> Tuple[Any, ...]:
+    if type(item) is Item:
+        return (_ITEM, item.item, item.group)
+    return (_OBJECT, item)
+
+
+def _unpack(packed: Tuple[Any, ...]) -> Any:
+    if packed[0] == _ITEM:
+        return Item(packed[1], packed[2])
+    return packed[1]
+
+
+class JournaledIsraeliQueue(IsraeliQueue):
+    """
+    An IsraeliQueue that journals its operations to a directory.
+
+    Every change to the line appends a record to the current journal
+    segment after it succeeds: the queue operations (``enqueue``, ``put``,
+    ``dequeue`` and their batch forms, ``drain``, ``cancel`` and so on)
+    and the inherited list mutations (``append``, ``insert``, ``remove``,
+    slice assignment, ``sort`` and so on) alike. An operation made of
+    other operations is journaled once, as a whole. Deadlines are not
+    journaled: a restored queue keeps the items but not their
+    ``expires_at``. Call ``checkpoint`` now and then to bound the replay
+    time.
+
+    Pickling or copying a journaled queue gives a plain ``IsraeliQueue``.
+
+    Args:
+        directory: Where the snapshot and journal live; created if missing
+            and restored if it already holds a queue
+        sync: Fsync the journal after every operation, so journaled
+            operations survive power loss and not only a crash
+        chunk_size: Number of items per snapshot frame
+    """
+
+    def __init__(
+        self, directory: str, sync: bool = False, chunk_size: int = 1024
+    ) -> None:
+        # Nothing is journaled until the journal has been replayed
+        self._journal_depth = 1
+        super().__init__()
+        self.directory = directory
+        self.sync = sync
+        self.chunk_size = chunk_size
+        self._journal: Optional[BinaryIO] = None
+        os.makedirs(directory, exist_ok=True)
+        self._segment = self._restore()
+        self._open_segment(self._segment + 1)
+        self._journal_depth = 0
+
+    def __reduce__(self) -> Any:
+        return (IsraeliQueue, (list(self),))
+
+    def __copy__(self) -> IsraeliQueue:
+        return IsraeliQueue(self)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _segments(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.directory):
+            match = _SEGMENT_NAME.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _segment_path(self, number: int) -> str:
+        return self._path(f"journal-{number:06d}.log")
+
+    def _restore(self) -> int:
+        """Load the snapshot, replay the journal and return the last segment."""
+        first = 0
+        snapshot = self._path(_SNAPSHOT_NAME)
+        if os.path.exists(snapshot):
+            with open(snapshot, "rb") as handle:
+                restored, first = read_snapshot(handle)
+            super().extend(restored)
+
+        last = first
+        for number in self._segments():
+            if number < first:
+                continue
+            last = number
+            path = self._segment_path(number)
+            valid = 0
+            with open(path, "rb") as handle:
+                while True:
+                    record, size = _read_frame(handle)
+                    if record is None:
+                        break
+                    self._replay(record)
+                    valid += size
+            if valid < os.path.getsize(path):
+                # Drop a torn tail left by a crash mid-write
+                os.truncate(path, valid)
+        return last
+
+    def _replay(self, record: Tuple[Any, ...]) -> None:
+        op = record[0]
+        if op == "enqueue":
+            IsraeliQueue.append(self, _unpack(record[1]))
+        elif op == "put":
+            IsraeliQueue.put(self, _unpack(record[1]), _unpack(record[2]))
+        elif op == "enqueue_many":
+            pairs = [
+                (_unpack(item), None if friend is None else _unpack(friend))
+                for item, friend in record[1]
+            ]
+            try:
+                IsraeliQueue.enqueue_many(self, pairs)
+            except ValueError:
+                # The original call failed the same way, after the same items
+                pass
+        elif op == "extend":
+            IsraeliQueue.extend(self, [_unpack(item) for item in record[1]])
+        elif op == "insert":
+            IsraeliQueue.insert(self, record[1], _unpack(record[2]))
+        elif op == "pop":
+            IsraeliQueue.pop(self, record[1])
+        elif op == "setitem":
+            index = record[1]
+            if isinstance(index, slice):
+                IsraeliQueue.__setitem__(
+                    self, index, [_unpack(item) for item in record[2]]
+                )
+            else:
+                IsraeliQueue.__setitem__(self, index, _unpack(record[2]))
+        elif op == "delitem":
+            IsraeliQueue.__delitem__(self, record[1])
+        elif op == "clear":
+            IsraeliQueue.clear(self)
+        elif op == "reverse":
+            IsraeliQueue.reverse(self)
+        elif op == "imul":
+            IsraeliQueue.__imul__(self, record[1])
+        elif op == "order":
+            IsraeliQueue.__setitem__(
+                self, slice(None), [_unpack(item) for item in record[1]]
+            )
+        elif op == "dequeue":
+            IsraeliQueue.dequeue_many(self, record[1])
+        elif op == "drop":
+            IsraeliQueue._drop(self, record[1])
+        else:
+            raise ValueError(f"Unknown journal operation {op!r}")
+
+    def _open_segment(self, number: int) -> None:
+        if self._journal is not None:
+            self._journal.close()
+        self._segment = number
+        self._journal = open(self._segment_path(number), "ab")
+
+    def _check_open(self) -> BinaryIO:
+        if self._journal is None:
+            raise ValueError("I/O operation on closed queue")
+        return self._journal
+
+    def _log(self, *record: Any) -> None:
+        journal = self._check_open()
+        journal.write(_frame(record))
+        journal.flush()
+        if self.sync:
+            os.fsync(journal.fileno())
+
+    def _journaled(
+        self, record: Tuple[Any, ...], call: Callable[..., T], *args: Any
+    ) -> T:
+        """Run a change and journal it, unless it is part of a larger one."""
+        if self._journal_depth:
+            return call(*args)
+        self._check_open()
+        self._journal_depth += 1
+        try:
+            result = call(*args)
+        finally:
+            self._journal_depth -= 1
+        self._log(*record)
+        return result
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line and journal it."""
+        self._journaled(("enqueue", _pack(item)), super().append, item)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add several items to the end of the line and journal them."""
+        items = list(items)
+        packed = [_pack(item) for item in items]
+        self._journaled(("extend", packed), super().extend, items)
+
+    def insert(self, index: SupportsIndex, item: Item) -> None:
+        """Insert an item before index and journal it."""
+        record = ("insert", as_index(index), _pack(item))
+        self._journaled(record, super().insert, index, item)
+
+    def pop(self, index: SupportsIndex = -1) -> Item:
+        """Remove and return the item at index and journal it."""
+        return self._journaled(("pop", as_index(index)), super().pop, index)
+
+    def clear(self) -> None:
+        """Remove every item and journal it."""
+        self._journaled(("clear",), super().clear)
+
+    def reverse(self) -> None:
+        """Reverse the line in place and journal it."""
+        self._journaled(("reverse",), super().reverse)
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """Sort the line in place and journal the order it produced."""
+        if self._journal_depth:
+            super().sort(*args, **kwargs)
+            return
+        self._check_open()
+        super().sort(*args, **kwargs)
+        # Sort keys may not pickle, so journal the order they produced
+        self._log("order", [_pack(item) for item in self])
+
+    def __imul__(self, times: SupportsIndex) -> "JournaledIsraeliQueue":
+        self._journaled(("imul", as_index(times)), super().__imul__, times)
+        return self
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Any) -> None:
+        record: Tuple[Any, ...]
+        if isinstance(index, slice):
+            value = list(value)
+            record = ("setitem", index, [_pack(item) for item in value])
+        else:
+            record = ("setitem", as_index(index), _pack(value))
+        self._journaled(record, super().__setitem__, index, value)
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        key = index if isinstance(index, slice) else as_index(index)
+        self._journaled(("delitem", key), super().__delitem__, index)
+
+    def put(self, item: Item, friend: Item) -> None:
+        """Add an item next to its friends and journal it."""
+        record = ("put", _pack(item), _pack(friend))
+        self._journaled(record, super().put, item, friend)
+
+    def enqueue(
+        self,
+        item: Item,
+        friend: Optional[Item] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """Add an item, as ``IsraeliQueue.enqueue`` does, and journal it."""
+        if friend is None:
+            self.append(item)
+        else:
+            self.put(item, friend)
+        if expires_at is not None:
+            self._set_deadline(item, expires_at)
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """Add a batch of ``(item, friend)`` pairs and journal the batch."""
+        if self._journal_depth:
+            super().enqueue_many(pairs)
+            return
+        self._check_open()
+        pairs = list(pairs)
+        packed = [
+            (_pack(item), None if friend is None else _pack(friend))
+            for item, friend in pairs
+        ]
+        self._journal_depth += 1
+        try:
+            super().enqueue_many(pairs)
+        except ValueError:
+            # A failed batch still placed the items before the bad pair
+            self._log("enqueue_many", packed)
+            raise
+        finally:
+            self._journal_depth -= 1
+        self._log("enqueue_many", packed)
+
+    def dequeue(self) -> Item:
+        """Remove and return the first item and journal it."""
+        return self._journaled(("dequeue", 1), super().dequeue)
+
+    def dequeue_many(self, n: int) -> List[Item]:
+        """Remove and return up to ``n`` items and journal them."""
+        return self._journaled(("dequeue", n), super().dequeue_many, n)
+
+    def _drop(self, positions: List[int]) -> List[Item]:
+        # cancel, remove_group and discard_expired all end up here, and
+        # positions replay exactly even with equal items in line
+        return self._journaled(("drop", positions), super()._drop, positions)
+
+    def iter_checkpoint(self) -> Iterator[None]:
+        """
+        Checkpoint step by step, yielding after every snapshot chunk.
+
+        The queue may be used between steps: the snapshot is of the queue
+        as it was when the generator started, and later operations go to
+        the new journal segment.
+        """
+        items = list(self)
+        previous = self._segment
+        self._open_segment(previous + 1)
+        temporary = self._path(_SNAPSHOT_NAME + ".tmp")
+        with open(temporary, "wb") as handle:
+            for chunk in iter_snapshot(items, self.chunk_size, self._segment):
+                handle.write(chunk)
+                yield
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self._path(_SNAPSHOT_NAME))
+        for number in self._segments():
+            if number <= previous:
+                os.remove(self._segment_path(number))
+
+    def checkpoint(self) -> None:
+        """Write a snapshot and drop the journal segments it covers."""
+        for _ in self.iter_checkpoint():
+            pass
+
+    def close(self) -> None:
+        """Close the journal; later operations raise ValueError."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def __enter__(self) -> "JournaledIsraeliQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,594 @@
+from bisect import bisect_left, insort
+from collections import deque
+from heapq import heapify, heappop, heappush
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+
+from ._fenwick import _Fenwick
+from .IsraeliQueue import Item, _ItemCounter, _estimated_wait
+from .views import QueueView
+
+
+class _Block:
+    """A run of consecutive items that all belong to the same group."""
+
+    __slots__ = (
+        "group",
+        "items",
+        "prev",
+        "next",
+        "group_prev",
+        "group_next",
+        "slot",
+        "pushed",
+        "popped",
+        "holes",
+    )
+
+    def __init__(self, group: Any, slot: int) -> None:
+        self.group = group
+        # Cancelled items are left in place as None until served past
+        self.items: Deque[Optional[Item]] = deque()
+        self.prev: Optional["_Block"] = None
+        self.next: Optional["_Block"] = None
+        # The neighbouring blocks of the same group
+        self.group_prev: Optional["_Block"] = None
+        self.group_next: Optional["_Block"] = None
+        # Position in the order-statistics tree
+        self.slot = slot
+        # Entries ever added to and taken from the front of the block
+        self.pushed = 0
+        self.popped = 0
+        # Which entries were cancelled, in ascending order
+        self.holes: List[int] = []
+
+    def live(self) -> bool:
+        """Return True if an item in the block is still queued."""
+        if not self.holes:
+            return bool(self.items)
+        return len(self.items) > len(self.holes) - bisect_left(self.holes, self.popped)
+
+
+def _queued(block: _Block) -> Iterator[Item]:
+    """Iterate over the queued items of a block, skipping tombstones."""
+    if block.holes:
+        return (item for item in block.items if item is not None)
+    return cast(Iterator[Item], iter(block.items))
+
+
+class LinkedIsraeliQueue:
+    """
+    An Israeli queue stored as a linked list of per-group blocks.
+
+    Consecutive items of the same group share a block, and a
+    ``group -> tail block`` index points at the last block of every group
+    in line. Joining behind the last friend, appending and serving from the
+    front are all O(1), unlike ``IsraeliQueue`` which shifts the whole list.
+
+    Blocks are only opened at the back and served from the front, so their
+    opening order is their order in line. A Fenwick tree over that order
+    counts the items every block has taken in, which answers
+    ``position_of``, ``group_span`` and positional indexing in O(log n),
+    and keeps joins at O(log n) instead of O(1).
+
+    ``cancel``, ``remove_group`` and ``discard_expired`` leave a tombstone
+    where every removed item was and take it out of the tree, so they cost
+    O(log n) per removed item whatever the length of the line. Tombstones
+    are dropped as the front of the line reaches them, and a block left
+    with tombstones only is unlinked at once.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._head: Optional[_Block] = None
+        self._tail: Optional[_Block] = None
+        self._tails: Dict[Any, _Block] = {}
+        self._members = _ItemCounter()
+        self._group_counts: Dict[Any, int] = {}
+        self._size = 0
+        # The first block of every group in line
+        self._firsts: Dict[Any, _Block] = {}
+        # Blocks by tree slot; served blocks are cleared
+        self._slots: List[Optional[_Block]] = []
+        self._tree = _Fenwick([], 0)
+        # Items served from the blocks in the tree
+        self._served = 0
+        # Where every hashable item sits, as (block, nth item of the block),
+        # with equal items in line order
+        self._places: Dict[Any, Deque[Tuple[_Block, int]]] = {}
+        # Deadlines by (block, nth item of the block), and a heap of them
+        # that may also hold entries of items since removed
+        self._expiry: Dict[Tuple[_Block, int], float] = {}
+        self._deadlines: List[Tuple[float, int, _Block, int]] = []
+        # Deadlines set so far, to order equal deadlines in the heap
+        self._scheduled = 0
+        self.extend(items)
+
+    def _rebuild_tree(self) -> None:
+        """Renumber the blocks in line and make room for as many new ones."""
+        blocks: List[_Block] = []
+        block = self._head
+        while block is not None:
+            block.slot = len(blocks)
+            blocks.append(block)
+            block = block.next
+        self._slots = list(blocks)
+        self._tree = _Fenwick(
+            [b.pushed - len(b.holes) for b in blocks], max(8, 2 * len(blocks))
+        )
+        self._served = sum(b.popped - bisect_left(b.holes, b.popped) for b in blocks)
+
+    def _new_block(self, group: Any) -> _Block:
+        """Link a new empty block at the end of the line."""
+        if len(self._slots) == len(self._tree):
+            self._rebuild_tree()
+        block = _Block(group, len(self._slots))
+        self._slots.append(block)
+        if self._tail is None:
+            self._head = block
+        else:
+            self._tail.next = block
+            block.prev = self._tail
+        self._tail = block
+        previous = self._tails.get(group)
+        if previous is None:
+            self._firsts[group] = block
+        else:
+            previous.group_next = block
+            block.group_prev = previous
+        self._tails[group] = block
+        return block
+
+    def _unlink(self, block: _Block) -> None:
+        """Take a block with no queued items out of the line and its group."""
+        if block.prev is None:
+            self._head = block.next
+        else:
+            block.prev.next = block.next
+        if block.next is None:
+            self._tail = block.prev
+        else:
+            block.next.prev = block.prev
+        group = block.group
+        before, after = block.group_prev, block.group_next
+        if before is None:
+            if after is None:
+                del self._firsts[group]
+            else:
+                self._firsts[group] = after
+        else:
+            before.group_next = after
+        if after is None:
+            if before is None:
+                del self._tails[group]
+            else:
+                self._tails[group] = before
+        else:
+            after.group_prev = before
+        self._slots[block.slot] = None
+        if block.prev is None and self._head is not None:
+            # The new head has queued items, so this only drops tombstones
+            self._trim(self._head)
+
+    def _push(self, block: _Block, item: Item) -> None:
+        self._locate(item, block, block.pushed)
+        block.items.append(item)
+        block.pushed += 1
+        self._tree.add(block.slot, 1)
+        self._members.add(item)
+        self._group_counts[block.group] = self._group_counts.get(block.group, 0) + 1
+        self._size += 1
+
+    def _locate(self, item: Item, block: _Block, nth: int) -> None:
+        try:
+            places = self._places.get(item)
+        except TypeError:
+            # Unhashable items are found by scanning instead
+            return
+        if places is None:
+            places = self._places[item] = deque()
+        places.append((block, nth))
+
+    def _position(self, block: _Block, nth: int) -> int:
+        """Return the position of the nth item ever added to block."""
+        if block.holes:
+            nth -= bisect_left(block.holes, nth)
+        return self._tree.prefix(block.slot) - self._served + nth
+
+    def _uncount(self, item: Item, group: Any) -> None:
+        self._members.remove(item)
+        remaining = self._group_counts[group] - 1
+        if remaining:
+            self._group_counts[group] = remaining
+        else:
+            del self._group_counts[group]
+        self._size -= 1
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line."""
+        block = self._tail
+        if block is None or block.group != item.group:
+            block = self._new_block(item.group)
+        self._push(block, item)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add several items to the end of the line."""
+        for item in items:
+            self.append(item)
+
+    def put(self, item: Item, friend: Item) -> None:
+        """
+        Add an item to the queue next to its friends.
+
+        Args:
+            item: The item to add to the queue
+            friend: An existing item in the queue (used for validation)
+
+        Raises:
+            ValueError: If friend is not found in the queue
+        """
+        if friend not in self:
+            raise ValueError("Friend not found in queue")
+
+        block = self._tails.get(item.group)
+        if block is None:
+            # No friends in queue, append to end
+            self.append(item)
+        else:
+            # The group's tail block always ends with its furthest member
+            self._push(block, item)
+
+    def enqueue(
+        self,
+        item: Item,
+        friend: Optional[Item] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """
+        Add an item to the queue, next to friend if one is given.
+
+        Without a friend the item goes to the end of the line.
+
+        Args:
+            item: The item to add
+            friend: Optional existing item to join
+            expires_at: Optional deadline after which ``discard_expired``
+                removes the item, on whatever clock its caller uses
+        """
+        if friend is None:
+            self.append(item)
+        else:
+            self.put(item, friend)
+        if expires_at is not None:
+            # Either way the item is now the last of its group
+            block = self._tails[item.group]
+            self._set_deadline(block, block.pushed - 1, expires_at)
+
+    def _set_deadline(self, block: _Block, nth: int, expires_at: float) -> None:
+        self._expiry[block, nth] = expires_at
+        self._scheduled += 1
+        heappush(self._deadlines, (expires_at, self._scheduled, block, nth))
+        if len(self._deadlines) > 2 * len(self._expiry) + 64:
+            # Drop the entries of items that are gone
+            self._deadlines = [
+                (when, sequence, block, nth)
+                for sequence, ((block, nth), when) in enumerate(self._expiry.items())
+            ]
+            heapify(self._deadlines)
+
+    def dequeue(self) -> Item:
+        """
+        Remove and return the first item from the queue.
+
+        Returns:
+            The first item in the queue
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        block = self._head
+        if block is None:
+            raise IndexError("Cannot dequeue from empty queue")
+        # The head block never starts with a tombstone
+        item = cast(Item, block.items.popleft())
+        if self._expiry:
+            self._expiry.pop((block, block.popped), None)
+        block.popped += 1
+        self._served += 1
+        self._trim(block)
+        try:
+            places = self._places[item]
+        except TypeError:
+            pass
+        else:
+            places.popleft()
+            if not places:
+                del self._places[item]
+        self._uncount(item, block.group)
+        return item
+
+    def _trim(self, block: _Block) -> None:
+        """Drop the tombstones at the front of the head block, or the block."""
+        items = block.items
+        while items and items[0] is None:
+            items.popleft()
+            block.popped += 1
+        if not items:
+            self._unlink(block)
+
+    def _remove(self, block: _Block, nth: int) -> Item:
+        """Replace the nth item ever added to block with a tombstone."""
+        offset = nth - block.popped
+        item = cast(Item, block.items[offset])
+        block.items[offset] = None
+        insort(block.holes, nth)
+        self._tree.add(block.slot, -1)
+        if self._expiry:
+            self._expiry.pop((block, nth), None)
+        if block is self._head:
+            self._trim(block)
+        elif not block.live():
+            self._unlink(block)
+        try:
+            places = self._places[item]
+        except TypeError:
+            pass
+        else:
+            places.remove((block, nth))
+            if not places:
+                del self._places[item]
+        self._uncount(item, block.group)
+        return item
+
+    def _find(self, item: Item) -> Tuple[_Block, int]:
+        """Return where the first occurrence of item is, as (block, nth)."""
+        try:
+            places = self._places.get(item)
+        except TypeError:
+            # Unhashable items are found by scanning instead
+            block = self._head
+            while block is not None:
+                for offset, other in enumerate(block.items):
+                    if other is not None and other == item:
+                        return block, block.popped + offset
+                block = block.next
+        else:
+            if places:
+                return places[0]
+        raise ValueError(f"{item!r} is not in queue")
+
+    def cancel(self, item: Item) -> Item:
+        """
+        Remove the first occurrence of item from the line and return it.
+
+        Leaves a tombstone in its block, in O(log n).
+
+        Raises:
+            ValueError: If item is not in the queue
+        """
+        return self._remove(*self._find(item))
+
+    def remove_group(self, group: Any) -> List[Item]:
+        """
+        Remove every item of a group and return them in line order.
+
+        Costs O(log n) per item removed.
+        """
+        removed = []
+        block = self._firsts.get(group)
+        while block is not None:
+            after = block.group_next
+            start = block.popped
+            for offset, item in enumerate(list(block.items)):
+                if item is not None:
+                    removed.append(self._remove(block, start + offset))
+            block = after
+        return removed
+
+    def discard_expired(self, now: float) -> List[Item]:
+        """
+        Remove the items whose ``expires_at`` is at or before ``now``.
+
+        The expired items come off the deadline heap and are replaced with
+        tombstones, in O(log n) for each of them; the rest of the line is
+        not visited.
+
+        Returns:
+            The removed items in line order
+        """
+        expired = []
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            expires_at, _, block, nth = heappop(deadlines)
+            if self._expiry.get((block, nth)) == expires_at:
+                del self._expiry[block, nth]
+                expired.append((block.slot, nth, block))
+        # Tree slots follow the line, and tombstones never open a block
+        expired.sort(key=lambda entry: entry[:2])
+        return [self._remove(block, nth) for _, nth, block in expired]
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """
+        Add a batch of ``(item, friend)`` pairs, as ``enqueue`` would.
+
+        Raises:
+            ValueError: If a friend is not found in the queue. Items before
+                the offending pair are still added.
+        """
+        for item, friend in pairs:
+            self.enqueue(item, friend)
+
+    def dequeue_many(self, n: int) -> List[Item]:
+        """
+        Remove and return up to ``n`` items from the front of the queue.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        return [self.dequeue() for _ in range(min(n, self._size))]
+
+    def drain(self, max_items: Optional[int] = None) -> Iterator[Item]:
+        """
+        Remove and yield as many items from the front as were in line.
+
+        Every item is dequeued as it is yielded, in O(1).
+
+        Raises:
+            ValueError: If max_items is negative
+        """
+        if max_items is not None and max_items < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        limit = self._size if max_items is None else min(max_items, self._size)
+        return (self.dequeue() for _ in range(limit) if self._head is not None)
+
+    def iter_dequeue(self) -> Iterator[Item]:
+        """
+        Remove and yield items until the queue is empty.
+
+        Items added while iterating are yielded too.
+        """
+        while self._head is not None:
+            yield self.dequeue()
+
+    def peek(self) -> Item:
+        """
+        Return the first item without removing it.
+
+        Returns:
+            The first item in the queue
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if self._head is None:
+            raise IndexError("Cannot peek empty queue")
+        # The head block never starts with a tombstone
+        return cast(Item, self._head.items[0])
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty."""
+        return self._size == 0
+
+    def size(self) -> int:
+        """Return the number of items in the queue."""
+        return self._size
+
+    def get_groups(self) -> List[Any]:
+        """Get all unique group numbers in the queue."""
+        return list(self._tails)
+
+    def group_size(self, group: Any) -> int:
+        """Return the number of queued items in a group."""
+        return self._group_counts.get(group, 0)
+
+    def _iter_group(self, group: Any) -> Iterator[Item]:
+        block = self._firsts.get(group)
+        while block is not None:
+            yield from _queued(block)
+            block = block.group_next
+
+    def items_in_group(self, group: Any) -> QueueView:
+        """
+        Get a live, read-only view of the items of a group, in line order.
+
+        Reading the view walks the blocks of the group only, and ``len`` is
+        O(1).
+        """
+        return QueueView(
+            lambda: self._iter_group(group),
+            lambda: self._group_counts.get(group, 0),
+        )
+
+    def position_of(self, item: Item) -> int:
+        """
+        Return the position of the first occurrence of item, in O(log n).
+
+        Raises:
+            ValueError: If item is not in the queue
+        """
+        return self._position(*self._find(item))
+
+    index = position_of
+
+    def group_span(self, group: Any) -> Tuple[int, int]:
+        """
+        Return the positions of the first and last items of a group.
+
+        Raises:
+            ValueError: If the group is not in the queue
+        """
+        first = self._firsts.get(group)
+        if first is None:
+            raise ValueError("Group not found in queue")
+        last = self._tails[group]
+        # Tombstones take no position, so start and end past them
+        return (
+            self._position(first, first.popped),
+            self._position(last, last.pushed) - 1,
+        )
+
+    def estimated_wait(self, item: Item, service_rate: float) -> float:
+        """
+        Estimate how long item waits before reaching the front.
+
+        Args:
+            item: An item in the queue
+            service_rate: Items served per unit of time
+
+        Raises:
+            ValueError: If item is not in the queue or the rate is not positive
+        """
+        return _estimated_wait(self.position_of(item), service_rate)
+
+    def count(self, item: Item) -> int:
+        """Return the number of queued items equal to item."""
+        return self._members.count(item)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._members
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Item]:
+        block = self._head
+        while block is not None:
+            yield from _queued(block)
+            block = block.next
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("queue index out of range")
+        # Served items still count in the tree, so skip past them
+        slot, before = self._tree.search(index + self._served)
+        # The slot is live since it covers a queued position
+        block = cast(_Block, self._slots[slot])
+        nth = index + self._served - before
+        for hole in block.holes:
+            if hole > nth:
+                break
+            nth += 1
+        return block.items[nth - block.popped]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LinkedIsraeliQueue)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
@@ -0,0 +1,222 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Callable, Dict, Optional
+
+from ._wordqueue import _H_CAPACITY, _H_TABLE_SIZE, _WordQueue, layout_words
+from .IsraeliQueue import Item
+
+if sys.platform != "win32":
+    import fcntl
+
+_WORD = 8
+# Log record header: magic, number of (index, value) pairs, CRC32 of pairs
+_RECORD = struct.Struct("<III")
+_RECORD_MAGIC = 0x4951574C  # "IQWL"
+
+
+class MappedIsraeliQueue(_WordQueue):
+    """
+    A durable Israeli queue of integer items stored in a memory-mapped file.
+
+    Every entry is a fixed-size record of the item, its group and two links,
+    and a table in the same file keeps the head, tail and size of every
+    group, so ``put`` joins the last friend without scanning the line.
+    Reopening a file only maps it: nothing is replayed or rebuilt, and the
+    OS pages records in and out as needed, so the queue can outgrow RAM.
+    The file grows by doubling when it runs out of slots, and the group
+    table doubles when more than ``max_groups`` groups are in line, which
+    moves every slot in use once.
+
+    Items must have integer ``item`` and ``group`` attributes; to queue
+    other objects, store them elsewhere and queue their ids. Items are
+    rebuilt with ``item_factory`` when they are read back.
+
+    Every operation is crash-consistent. Its writes are first appended to a
+    write-ahead log next to the file (``path + "-wal"``), then applied to
+    the mapping. Opening the queue redoes any logged operation that may not
+    have reached the file, and drops a torn log tail. With ``sync=True``
+    the log is fsynced on every operation, so committed operations also
+    survive power loss; otherwise they survive a crash of the process.
+    Only one queue may have a file open at a time: where ``fcntl`` is
+    available the file is locked while open, and opening it again, from
+    this process or another, raises ``BlockingIOError``.
+
+    Args:
+        path: The queue file; created if missing or empty
+        capacity: Initial number of slots for a new file
+        max_groups: Number of distinct groups a new file has room for
+            before its group table grows
+        item_factory: Builds the returned items from ``(item, group)``
+        sync: Fsync the log on every operation
+        checkpoint_bytes: Log size after which the mapping is flushed and
+            the log truncated
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = 1024,
+        max_groups: int = 1024,
+        item_factory: Callable[[int, int], Any] = Item,
+        sync: bool = True,
+        checkpoint_bytes: int = 1 << 20,
+    ) -> None:
+        super().__init__(item_factory)
+        if capacity < 1 or max_groups < 1:
+            raise ValueError("capacity and max_groups must be positive")
+        self.path = path
+        self.sync = sync
+        self.checkpoint_bytes = checkpoint_bytes
+        # Writes of the operation in progress, by word index
+        self._pending: Optional[Dict[int, int]] = None
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._wal = os.open(path + "-wal", os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            self._lock()
+            if not any(os.read(self._fd, _WORD)):
+                # A new file, or one whose creation was interrupted
+                os.ftruncate(self._fd, layout_words(capacity, max_groups) * _WORD)
+                self._map()
+                self._format(capacity, max_groups)
+                self._flush()
+            else:
+                size = os.fstat(self._fd).st_size
+                if size % _WORD or size < layout_words(0, 1) * _WORD:
+                    raise ValueError("Not an Israeli queue buffer")
+                self._map()
+                self._validate()
+            self._recover()
+        except BaseException:
+            os.close(self._fd)
+            os.close(self._wal)
+            raise
+
+    def _lock(self) -> None:
+        """Take an exclusive lock on the file, held until it is closed."""
+        if sys.platform == "win32":
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise BlockingIOError(f"{self.path!r} is already open") from None
+
+    def _map(self) -> None:
+        self._mmap = mmap.mmap(self._fd, 0)
+        self._words = memoryview(self._mmap).cast("q")
+
+    def _unmap(self) -> None:
+        self._words.release()
+        self._mmap.close()
+
+    def _flush(self) -> None:
+        self._mmap.flush()
+        if self.sync:
+            os.fsync(self._fd)
+
+    # Logged buffer access
+
+    def _get(self, index: int) -> int:
+        pending = self._pending
+        if pending is not None and index in pending:
+            return pending[index]
+        return self._words[index]
+
+    def _set(self, index: int, value: int) -> None:
+        if self._pending is None:
+            self._pending = {}
+        self._pending[index] = value
+
+    def _commit(self) -> None:
+        pending = self._pending
+        self._pending = None
+        if not pending:
+            return
+        pairs = array("q")
+        for index, value in pending.items():
+            pairs.append(index)
+            pairs.append(value)
+        payload = pairs.tobytes()
+        header = _RECORD.pack(_RECORD_MAGIC, len(pending), zlib.crc32(payload))
+        os.write(self._wal, header + payload)
+        if self.sync:
+            os.fsync(self._wal)
+        # The log is durable, so the mapping may now be changed
+        words = self._words
+        for index, value in pending.items():
+            words[index] = value
+        if os.fstat(self._wal).st_size >= self.checkpoint_bytes:
+            self.checkpoint()
+
+    def _abort(self) -> None:
+        self._pending = None
+
+    def _grow(self) -> None:
+        capacity = self._get(_H_CAPACITY)
+        # Growing the file first is harmless if the operation never commits
+        self._resize(self._slot(2 * capacity))
+        self._set(_H_CAPACITY, 2 * capacity)
+
+    def _grow_table(self) -> None:
+        size = 2 * self._get(_H_TABLE_SIZE)
+        self._resize(layout_words(self._get(_H_CAPACITY), size // 2))
+        self._rehash(size)
+
+    def _resize(self, words: int) -> None:
+        if os.fstat(self._fd).st_size >= words * _WORD:
+            return
+        self._unmap()
+        os.ftruncate(self._fd, words * _WORD)
+        if self.sync:
+            os.fsync(self._fd)
+        self._map()
+
+    def _recover(self) -> None:
+        """Redo every complete logged operation, then empty the log."""
+        with open(self.path + "-wal", "rb") as log:
+            data = log.read()
+        offset = 0
+        while offset + _RECORD.size <= len(data):
+            magic, count, crc = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            end = start + count * 2 * _WORD
+            if magic != _RECORD_MAGIC or not count or end > len(data):
+                break
+            payload = data[start:end]
+            if zlib.crc32(payload) != crc:
+                break
+            pairs = array("q")
+            pairs.frombytes(payload)
+            self._resize(max(pairs[0::2]) + 1)
+            for index, value in zip(pairs[0::2], pairs[1::2]):
+                self._words[index] = value
+            offset = end
+        if data:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Flush the mapping to disk and empty the write-ahead log."""
+        self._flush()
+        os.ftruncate(self._wal, 0)
+        if self.sync:
+            os.fsync(self._wal)
+
+    def close(self) -> None:
+        """Checkpoint and close the queue; it cannot be used afterwards."""
+        if self._fd < 0:
+            return
+        self.checkpoint()
+        self._unmap()
+        os.close(self._fd)
+        os.close(self._wal)
+        self._fd = self._wal = -1
+
+    def __enter__(self) -> "MappedIsraeliQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
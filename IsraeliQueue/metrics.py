@@ -0,0 +1,553 @@
+"""
+Opt-in instrumentation for ``IsraeliQueue`` and ``IsraeliQueueByType``.
+
+``instrument(queue)`` switches a queue over to an instrumented subclass
+that records, into a ``QueueMetrics``:
+
+- a call counter and a latency histogram for every queue operation,
+- an error counter per operation and exception type (for example how
+  often ``put`` raised ``ValueError`` because the friend was gone),
+- the wait time of every item, from enqueue (or ``append`` and
+  ``extend``) to dequeue, as a histogram per group (per type for
+  ``IsraeliQueueByType``). ``drain`` and ``iter_dequeue`` dequeue every
+  item as they yield it, so each wait ends when its item is yielded.
+  Items taken out of line unserved, by ``cancel`` and the like or by list
+  methods such as ``pop``, ``del`` and ``clear``, are forgotten unobserved.
+
+Queues that are never instrumented keep their original class, so they
+pay nothing. ``uninstrument(queue)`` switches a queue back.
+
+Metrics are exported by passing an exporter to ``QueueMetrics.export``:
+``snapshot`` returns plain dicts and ``prometheus_text`` renders the
+Prometheus text exposition format. Any callable taking the metrics works.
+"""
+
+import time
+from bisect import bisect_left
+from collections import deque
+from operator import index as as_index
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    SupportsIndex,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from .IsraeliQueue import Item, IsraeliQueue, IsraeliQueueByType
+from .views import QueueView
+
+T = TypeVar("T")
+
+#: Default bucket bounds, in seconds, for operation latencies
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 0.1, 1.0)
+#: Default bucket bounds, in seconds, for time spent waiting in the queue
+WAIT_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 3600.0)
+
+
+class Histogram:
+    """
+    Counts observations into buckets with fixed upper bounds.
+
+    Observations above the last bound land in an implicit ``+Inf`` bucket.
+    """
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return ``(upper bound, observations at or below it)`` pairs."""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+class QueueMetrics:
+    """
+    Counters, latency timers and wait-time histograms for instrumented queues.
+
+    One instance can be shared by several queues to aggregate them. Like
+    the queues themselves it is not thread-safe.
+
+    Args:
+        clock: Returns the current time in seconds; used for latencies
+            and wait times
+        latency_buckets: Histogram bounds for operation latencies
+        wait_buckets: Histogram bounds for wait times
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.perf_counter,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        wait_buckets: Sequence[float] = WAIT_BUCKETS,
+    ) -> None:
+        self.clock = clock
+        self.latency_buckets = tuple(latency_buckets)
+        self.wait_buckets = tuple(wait_buckets)
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self.wait: Dict[Any, Histogram] = {}
+        # Enqueue times of the items still waiting, by object identity
+        self._arrivals: Dict[int, Deque[float]] = {}
+
+    @property
+    def waiting(self) -> int:
+        """Number of enqueued items whose wait has not been observed yet."""
+        return sum(len(times) for times in self._arrivals.values())
+
+    def record_call(self, op: str, seconds: float, error: Optional[str] = None) -> None:
+        """Count one call of op and its latency, and its error if it raised."""
+        self.calls[op] = self.calls.get(op, 0) + 1
+        histogram = self.latency.get(op)
+        if histogram is None:
+            histogram = self.latency[op] = Histogram(self.latency_buckets)
+        histogram.observe(seconds)
+        if error is not None:
+            key = (op, error)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def record_enqueue(self, items: Iterable[Any], now: float) -> None:
+        """Remember when items entered the queue."""
+        for item in items:
+            self._arrivals.setdefault(id(item), deque()).append(now)
+
+    def record_removal(self, items: Iterable[Any]) -> None:
+        """Forget items that left the queue without being served."""
+        for item in items:
+            times = self._arrivals.get(id(item))
+            if times is not None:
+                times.popleft()
+                if not times:
+                    del self._arrivals[id(item)]
+
+    def record_dequeue(
+        self, items: Iterable[Any], now: float, group_of: Callable[[Any], Any]
+    ) -> None:
+        """Observe the wait of items leaving the queue, by group."""
+        for item in items:
+            times = self._arrivals.get(id(item))
+            if times is None:
+                # Enqueued before the queue was instrumented
+                continue
+            started = times.popleft()
+            if not times:
+                del self._arrivals[id(item)]
+            group = group_of(item)
+            histogram = self.wait.get(group)
+            if histogram is None:
+                histogram = self.wait[group] = Histogram(self.wait_buckets)
+            histogram.observe(now - started)
+
+    def reset(self) -> None:
+        """Forget all recorded calls, errors and waits."""
+        self.calls.clear()
+        self.errors.clear()
+        self.latency.clear()
+        self.wait.clear()
+        self._arrivals.clear()
+
+    def export(self, exporter: Optional[Callable[["QueueMetrics"], Any]] = None) -> Any:
+        """Return the metrics in the form produced by exporter (``snapshot``)."""
+        return (exporter or snapshot)(self)
+
+
+def _histogram_dict(histogram: Histogram) -> Dict[str, Any]:
+    return {
+        "count": histogram.count,
+        "sum": histogram.sum,
+        "max": histogram.max,
+        "buckets": histogram.cumulative(),
+    }
+
+
+def snapshot(metrics: QueueMetrics) -> Dict[str, Any]:
+    """Export the metrics as plain dicts, lists and numbers."""
+    return {
+        "calls": dict(metrics.calls),
+        "errors": {f"{op}:{error}": n for (op, error), n in metrics.errors.items()},
+        "latency": {op: _histogram_dict(h) for op, h in metrics.latency.items()},
+        "wait": {group: _histogram_dict(h) for group, h in metrics.wait.items()},
+        "waiting": metrics.waiting,
+    }
+
+
+def _label(value: Any) -> str:
+    if isinstance(value, type):
+        value = value.__qualname__
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return text.replace("\n", "\\n")
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def _histogram_lines(name: str, label: str, series: Dict[Any, Histogram]) -> List[str]:
+    lines = []
+    for key, histogram in series.items():
+        labels = f'{label}="{_label(key)}"'
+        for bound, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{labels},le="{_bound(bound)}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def prometheus_text(metrics: QueueMetrics, namespace: str = "israeli_queue") -> str:
+    """Export the metrics in the Prometheus text exposition format."""
+    lines = [
+        f"# HELP {namespace}_operations_total Queue operations called.",
+        f"# TYPE {namespace}_operations_total counter",
+    ]
+    for op, n in metrics.calls.items():
+        lines.append(f'{namespace}_operations_total{{op="{_label(op)}"}} {n}')
+    lines += [
+        f"# HELP {namespace}_errors_total Queue operations that raised.",
+        f"# TYPE {namespace}_errors_total counter",
+    ]
+    for (op, error), n in metrics.errors.items():
+        lines.append(
+            f'{namespace}_errors_total{{op="{_label(op)}",error="{_label(error)}"}} {n}'
+        )
+    lines += [
+        f"# HELP {namespace}_operation_seconds Latency of queue operations.",
+        f"# TYPE {namespace}_operation_seconds histogram",
+    ]
+    lines += _histogram_lines(f"{namespace}_operation_seconds", "op", metrics.latency)
+    lines += [
+        f"# HELP {namespace}_wait_seconds Time items spent in the queue.",
+        f"# TYPE {namespace}_wait_seconds histogram",
+    ]
+    lines += _histogram_lines(f"{namespace}_wait_seconds", "group", metrics.wait)
+    lines += [
+        f"# HELP {namespace}_waiting Items enqueued and not yet dequeued.",
+        f"# TYPE {namespace}_waiting gauge",
+        f"{namespace}_waiting {metrics.waiting}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class _Instrumented:
+    """Timing shared by the instrumented queue classes."""
+
+    _metrics: QueueMetrics
+    # Nesting depth of timed calls; only the outermost call is recorded.
+    # Unpickling appends the items before the instance state is restored,
+    # so until then every call counts as nested and is left alone.
+    _metrics_depth: int = 1
+
+    def _timed(self, op: str, call: Callable[..., T], *args: Any) -> T:
+        if self._metrics_depth:
+            return call(*args)
+        metrics = self._metrics
+        clock = metrics.clock
+        self._metrics_depth += 1
+        started = clock()
+        try:
+            result = call(*args)
+        except Exception as error:
+            metrics.record_call(op, clock() - started, type(error).__name__)
+            raise
+        finally:
+            self._metrics_depth -= 1
+        metrics.record_call(op, clock() - started)
+        return result
+
+
+class InstrumentedIsraeliQueue(_Instrumented, IsraeliQueue):
+    """An ``IsraeliQueue`` that reports to ``QueueMetrics``; see ``instrument``."""
+
+    def append(self, item: Item) -> None:
+        """Time ``append`` and record the item's arrival."""
+        outermost = not self._metrics_depth
+        self._timed("append", super().append, item)
+        if outermost:
+            self._metrics.record_enqueue((item,), self._metrics.clock())
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Time ``extend`` and record the items' arrivals."""
+        outermost = not self._metrics_depth
+        items = list(items)
+        self._timed("extend", super().extend, items)
+        if outermost:
+            self._metrics.record_enqueue(items, self._metrics.clock())
+
+    def put(self, item: Item, friend: Item) -> None:
+        """Time ``put`` and record the item's arrival."""
+        outermost = not self._metrics_depth
+        self._timed("put", super().put, item, friend)
+        if outermost:
+            self._metrics.record_enqueue((item,), self._metrics.clock())
+
+    def enqueue(
+        self,
+        item: Item,
+        friend: Optional[Item] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """Time ``enqueue`` and record the item's arrival."""
+        outermost = not self._metrics_depth
+        self._timed("enqueue", super().enqueue, item, friend, expires_at)
+        if outermost:
+            self._metrics.record_enqueue((item,), self._metrics.clock())
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """Time ``enqueue_many`` and record the arrivals of the items placed."""
+        pairs = list(pairs)
+        size = len(self)
+        try:
+            self._timed("enqueue_many", super().enqueue_many, pairs)
+        except ValueError:
+            # The pairs before the offending one were still added, in order
+            placed = [item for item, _ in pairs[: len(self) - size]]
+            self._metrics.record_enqueue(placed, self._metrics.clock())
+            raise
+        self._metrics.record_enqueue((item for item, _ in pairs), self._metrics.clock())
+
+    def dequeue(self) -> Item:
+        """Time ``dequeue`` and observe the item's wait."""
+        item = self._timed("dequeue", super().dequeue)
+        self._metrics.record_dequeue((item,), self._metrics.clock(), _group_of)
+        return item
+
+    def dequeue_many(self, n: int) -> List[Item]:
+        """Time ``dequeue_many`` and observe the items' waits."""
+        items = self._timed("dequeue_many", super().dequeue_many, n)
+        self._metrics.record_dequeue(items, self._metrics.clock(), _group_of)
+        return items
+
+    def peek(self) -> Item:
+        """Time ``peek``."""
+        return self._timed("peek", super().peek)
+
+    def items_in_group(self, group: int) -> QueueView:
+        """Time ``items_in_group``."""
+        return self._timed("items_in_group", super().items_in_group, group)
+
+    def cancel(self, item: Item) -> Item:
+        """Time ``cancel`` and forget the removed item."""
+        removed = self._timed("cancel", super().cancel, item)
+        self._metrics.record_removal((removed,))
+        return removed
+
+    def remove_group(self, group: int) -> List[Item]:
+        """Time ``remove_group`` and forget the removed items."""
+        removed = self._timed("remove_group", super().remove_group, group)
+        self._metrics.record_removal(removed)
+        return removed
+
+    def discard_expired(self, now: float) -> List[Item]:
+        """Time ``discard_expired`` and forget the removed items."""
+        removed = self._timed("discard_expired", super().discard_expired, now)
+        self._metrics.record_removal(removed)
+        return removed
+
+    # The inherited list methods are not timed, but the items they take out
+    # of line are forgotten, so their identities can be reused safely
+
+    def pop(self, index: SupportsIndex = -1) -> Item:
+        """Remove and return an item, forgetting its arrival."""
+        item = super().pop(index)
+        if not self._metrics_depth:
+            self._metrics.record_removal((item,))
+        return item
+
+    def clear(self) -> None:
+        """Remove every item, forgetting their arrivals."""
+        removed = [] if self._metrics_depth else list(self)
+        super().clear()
+        self._metrics.record_removal(removed)
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Any) -> None:
+        if self._metrics_depth:
+            super().__setitem__(index, value)
+            return
+        if isinstance(index, slice):
+            value = list(value)
+        old = _entries(self, index)
+        super().__setitem__(index, value)
+        kept = {id(item) for item in (value if isinstance(index, slice) else [value])}
+        self._metrics.record_removal(item for item in old if id(item) not in kept)
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        removed = [] if self._metrics_depth else _entries(self, index)
+        super().__delitem__(index)
+        self._metrics.record_removal(removed)
+
+    def __imul__(self, times: SupportsIndex) -> "InstrumentedIsraeliQueue":
+        emptied = not self._metrics_depth and as_index(times) <= 0
+        removed = list(self) if emptied else []
+        super().__imul__(times)
+        self._metrics.record_removal(removed)
+        return self
+
+
+class InstrumentedIsraeliQueueByType(_Instrumented, IsraeliQueueByType):
+    """An ``IsraeliQueueByType`` that reports to ``QueueMetrics``."""
+
+    def enqueue(self, item: Any) -> None:
+        """Time ``enqueue`` and record the item's arrival."""
+        self._timed("enqueue", super().enqueue, item)
+        self._metrics.record_enqueue((item,), self._metrics.clock())
+
+    def enqueue_many(self, items: Iterable[Any]) -> None:
+        """Time ``enqueue_many`` and record the items' arrivals."""
+        items = list(items)
+        self._timed("enqueue_many", super().enqueue_many, items)
+        self._metrics.record_enqueue(items, self._metrics.clock())
+
+    def dequeue(self) -> Any:
+        """Time ``dequeue`` and observe the item's wait."""
+        item = self._timed("dequeue", super().dequeue)
+        self._metrics.record_dequeue((item,), self._metrics.clock(), type)
+        return item
+
+    def dequeue_many(self, n: int) -> List[Any]:
+        """Time ``dequeue_many`` and observe the items' waits."""
+        items = self._timed("dequeue_many", super().dequeue_many, n)
+        self._metrics.record_dequeue(items, self._metrics.clock(), type)
+        return items
+
+    def peek(self) -> Any:
+        """Time ``peek``."""
+        return self._timed("peek", super().peek)
+
+    def items_of_type(self, item_type: type) -> QueueView:
+        """Time ``items_of_type``."""
+        return self._timed("items_of_type", super().items_of_type, item_type)
+
+    # As on InstrumentedIsraeliQueue, the items of subqueues taken out of
+    # line by the inherited list methods are forgotten
+
+    def pop(self, index: SupportsIndex = -1) -> List[Any]:
+        """Remove and return a subqueue, forgetting its items' arrivals."""
+        subqueue = super().pop(index)
+        if not self._metrics_depth:
+            self._metrics.record_removal(subqueue)
+        return subqueue
+
+    def remove(self, subqueue: List[Any]) -> None:
+        """Remove a subqueue, forgetting its items' arrivals."""
+        removed = [] if self._metrics_depth else self[self.index(subqueue)]
+        super().remove(subqueue)
+        self._metrics.record_removal(removed)
+
+    def clear(self) -> None:
+        """Remove every subqueue, forgetting their items' arrivals."""
+        removed = [] if self._metrics_depth else _contents(self)
+        super().clear()
+        self._metrics.record_removal(removed)
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Any) -> None:
+        if self._metrics_depth:
+            super().__setitem__(index, value)
+            return
+        if isinstance(index, slice):
+            value = list(value)
+        old = _contents(_entries(self, index))
+        super().__setitem__(index, value)
+        new = _contents(value if isinstance(index, slice) else [value])
+        kept = {id(item) for item in new}
+        self._metrics.record_removal(item for item in old if id(item) not in kept)
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        removed = [] if self._metrics_depth else _contents(_entries(self, index))
+        super().__delitem__(index)
+        self._metrics.record_removal(removed)
+
+    def __imul__(self, times: SupportsIndex) -> "InstrumentedIsraeliQueueByType":
+        emptied = not self._metrics_depth and as_index(times) <= 0
+        removed = _contents(self) if emptied else []
+        super().__imul__(times)
+        self._metrics.record_removal(removed)
+        return self
+
+
+def _group_of(item: Item) -> Any:
+    return item.group
+
+
+def _entries(queue: List[Any], index: Union[SupportsIndex, slice]) -> List[Any]:
+    return queue[index] if isinstance(index, slice) else [queue[index]]
+
+
+def _contents(subqueues: Iterable[List[Any]]) -> List[Any]:
+    return [item for subqueue in subqueues for item in subqueue]
+
+
+_INSTRUMENTED: Dict[type, type] = {
+    IsraeliQueue: InstrumentedIsraeliQueue,
+    IsraeliQueueByType: InstrumentedIsraeliQueueByType,
+}
+
+_PLAIN = {instrumented: plain for plain, instrumented in _INSTRUMENTED.items()}
+
+Queue = Union[IsraeliQueue, IsraeliQueueByType]
+
+
+def instrument(queue: Queue, metrics: Optional[QueueMetrics] = None) -> QueueMetrics:
+    """
+    Start recording metrics for a queue.
+
+    Items already in the queue when it is instrumented have no recorded
+    enqueue time, so their waits are not observed. Copies and pickles of
+    an instrumented queue stay instrumented.
+
+    Args:
+        queue: An ``IsraeliQueue`` or ``IsraeliQueueByType``
+        metrics: Where to record; a new ``QueueMetrics`` by default
+
+    Returns:
+        The metrics the queue records into
+
+    Raises:
+        TypeError: If the queue is of another (or a derived) class
+    """
+    if isinstance(queue, _Instrumented):
+        if metrics is not None:
+            queue._metrics = metrics
+        return queue._metrics
+    instrumented = _INSTRUMENTED.get(type(queue))
+    if instrumented is None:
+        raise TypeError(f"Cannot instrument {type(queue).__name__}")
+    if metrics is None:
+        metrics = QueueMetrics()
+    queue.__class__ = instrumented
+    target = cast(_Instrumented, queue)
+    target._metrics = metrics
+    target._metrics_depth = 0
+    return metrics
+
+
+def uninstrument(queue: Queue) -> None:
+    """Stop recording metrics for a queue; a no-op if it is not instrumented."""
+    if not isinstance(queue, _Instrumented):
+        return
+    queue.__class__ = _PLAIN[type(queue)]
+    del queue._metrics
+    del queue._metrics_depth
@@ -0,0 +1,292 @@
+import itertools
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .IsraeliQueue import Item, _ItemCounter
+from .views import QueueView
+
+
+class _Block:
+    """A run of members of a group, with its place in the heap."""
+
+    __slots__ = ("group", "items", "priority", "arrival", "index")
+
+    def __init__(self, group: Any, priority: float, arrival: int) -> None:
+        self.group = group
+        self.items: Deque[Item] = deque()
+        self.priority = priority
+        # Breaks ties between equal priorities in line order
+        self.arrival = arrival
+        # Position in the heap array
+        self.index = 0
+
+    def before(self, other: "_Block") -> bool:
+        if self.priority != other.priority:
+            return self.priority > other.priority
+        return self.arrival < other.arrival
+
+
+class PriorityIsraeliQueue:
+    """
+    An Israeli queue that serves groups by priority.
+
+    Like in ``IsraeliQueue``, an item that joins a friend goes behind the
+    last member of its group in line, and an item without a friend goes to
+    the end of the line. Each run of members is a block, so an item
+    without a friend opens a new block unless its group's block is the
+    last one in line. The blocks sit in a binary heap keyed on the group's
+    priority, higher first, then on when the block was opened: the line
+    stably sorted by priority. The heap is indexed (every block knows its
+    position), so a group's priority can change in place. ``dequeue``
+    serves the head of the top block, which is O(1) until the block
+    empties and O(log #blocks) when it does, and ``set_priority`` is
+    O(log #blocks) per block of the group.
+
+    Args:
+        items: Initial items, enqueued in order
+        priorities: Priority of some groups
+        default_priority: Priority of the other groups
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Item] = (),
+        priorities: Optional[Dict[Any, float]] = None,
+        default_priority: float = 0,
+    ) -> None:
+        self.default_priority = default_priority
+        self._priorities: Dict[Any, float] = dict(priorities or {})
+        self._heap: List[_Block] = []
+        # The blocks of every group in line, in line order
+        self._blocks: Dict[Any, Deque[_Block]] = {}
+        self._group_counts: Dict[Any, int] = {}
+        # The block opened last, which items without a friend may extend
+        self._newest: Optional[_Block] = None
+        self._arrivals = itertools.count()
+        self._members = _ItemCounter()
+        self._size = 0
+        self.extend(items)
+
+    # Indexed heap
+
+    def _place(self, block: _Block, index: int) -> None:
+        self._heap[index] = block
+        block.index = index
+
+    def _sift_up(self, block: _Block) -> None:
+        heap = self._heap
+        index = block.index
+        while index:
+            parent = (index - 1) >> 1
+            if not block.before(heap[parent]):
+                break
+            self._place(heap[parent], index)
+            index = parent
+        self._place(block, index)
+
+    def _sift_down(self, block: _Block) -> None:
+        heap = self._heap
+        index = block.index
+        while True:
+            child = 2 * index + 1
+            if child >= len(heap):
+                break
+            if child + 1 < len(heap) and heap[child + 1].before(heap[child]):
+                child += 1
+            if not heap[child].before(block):
+                break
+            self._place(heap[child], index)
+            index = child
+        self._place(block, index)
+
+    def _pop_top(self) -> None:
+        top = self._heap[0]
+        last = self._heap.pop()
+        if last is not top:
+            last.index = 0
+            self._sift_down(last)
+        # A group's blocks share its priority, so its first block is on top
+        blocks = self._blocks[top.group]
+        blocks.popleft()
+        if not blocks:
+            del self._blocks[top.group]
+        if top is self._newest:
+            self._newest = None
+
+    # Queue operations
+
+    def priority_of(self, group: Any) -> float:
+        """Return the priority of a group."""
+        return self._priorities.get(group, self.default_priority)
+
+    def set_priority(self, group: Any, priority: float) -> None:
+        """Set the priority of a group, moving its blocks if it is in line."""
+        self._priorities[group] = priority
+        for block in self._blocks.get(group, ()):
+            raised = priority > block.priority
+            block.priority = priority
+            if raised:
+                self._sift_up(block)
+            else:
+                self._sift_down(block)
+
+    def _open_block(self, group: Any) -> _Block:
+        block = _Block(group, self.priority_of(group), next(self._arrivals))
+        self._blocks.setdefault(group, deque()).append(block)
+        block.index = len(self._heap)
+        self._heap.append(block)
+        self._sift_up(block)
+        self._newest = block
+        return block
+
+    def _add(self, item: Item, block: _Block) -> None:
+        block.items.append(item)
+        self._members.add(item)
+        self._group_counts[item.group] = self._group_counts.get(item.group, 0) + 1
+        self._size += 1
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line, opening a block if needed."""
+        block = self._newest
+        if block is None or block.group != item.group:
+            # Only the block opened last ends the line, so only its group's
+            # items may join it without a friend
+            block = self._open_block(item.group)
+        self._add(item, block)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add several items, as ``append`` would."""
+        for item in items:
+            self.append(item)
+
+    def put(self, item: Item, friend: Item) -> None:
+        """
+        Add an item to the queue behind its friends.
+
+        Args:
+            item: The item to add to the queue
+            friend: An existing item in the queue (used for validation)
+
+        Raises:
+            ValueError: If friend is not found in the queue
+        """
+        if friend not in self:
+            raise ValueError("Friend not found in queue")
+        blocks = self._blocks.get(item.group)
+        if blocks:
+            self._add(item, blocks[-1])
+        else:
+            self.append(item)
+
+    def enqueue(self, item: Item, friend: Optional[Item] = None) -> None:
+        """
+        Add an item to the queue, next to friend if one is given.
+
+        With a friend the item joins its group's last block; without one it
+        goes to the end of the line.
+
+        Args:
+            item: The item to add
+            friend: Optional existing item to join
+        """
+        if friend is None:
+            self.append(item)
+        else:
+            self.put(item, friend)
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """
+        Add a batch of ``(item, friend)`` pairs, as ``enqueue`` would.
+
+        Raises:
+            ValueError: If a friend is not found in the queue. Items before
+                the offending pair are still added.
+        """
+        for item, friend in pairs:
+            self.enqueue(item, friend)
+
+    def dequeue(self) -> Item:
+        """
+        Remove and return the first item of the highest-priority group.
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if not self._heap:
+            raise IndexError("Cannot dequeue from empty queue")
+        block = self._heap[0]
+        item = block.items.popleft()
+        if not block.items:
+            self._pop_top()
+        self._members.remove(item)
+        count = self._group_counts[item.group] - 1
+        if count:
+            self._group_counts[item.group] = count
+        else:
+            del self._group_counts[item.group]
+        self._size -= 1
+        return item
+
+    def dequeue_many(self, n: int) -> List[Item]:
+        """
+        Remove and return up to ``n`` items in the order they are served.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        return [self.dequeue() for _ in range(min(n, self._size))]
+
+    def peek(self) -> Item:
+        """
+        Return the next item to be served without removing it.
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if not self._heap:
+            raise IndexError("Cannot peek empty queue")
+        return self._heap[0].items[0]
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty."""
+        return self._size == 0
+
+    def size(self) -> int:
+        """Return the number of items in the queue."""
+        return self._size
+
+    def get_groups(self) -> List[Any]:
+        """Get the groups in line, in the order they are first served."""
+        return list(dict.fromkeys(block.group for block in self._ordered_blocks()))
+
+    def group_size(self, group: Any) -> int:
+        """Return the number of queued items in a group."""
+        return self._group_counts.get(group, 0)
+
+    def items_in_group(self, group: Any) -> QueueView:
+        """Get a live, read-only view of the items of a group, in order."""
+        return QueueView(
+            lambda: itertools.chain.from_iterable(
+                block.items for block in self._blocks.get(group, ())
+            ),
+            lambda: self.group_size(group),
+        )
+
+    def _ordered_blocks(self) -> List[_Block]:
+        return sorted(self._heap, key=lambda block: (-block.priority, block.arrival))
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._members
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Item]:
+        """Iterate in the order items would be served if nothing changed."""
+        for block in self._ordered_blocks():
+            yield from block.items
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
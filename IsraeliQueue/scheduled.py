@@ -0,0 +1,99 @@
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .IsraeliQueue import Item, IsraeliQueue
+from .timers import TimerWheel
+
+
+class ScheduledIsraeliQueue(IsraeliQueue):
+    """
+    An IsraeliQueue that also takes arrivals scheduled for later.
+
+    ``enqueue_at`` and ``enqueue_after`` put an item on a timer wheel
+    instead of in line. ``dequeue``, ``dequeue_many``, ``peek`` and
+    ``drain`` first move the arrivals that are due into the line, in the
+    order they were due, and only those are touched; ``promote_due`` does
+    the same on demand. Until then, scheduled items are not counted by ``len`` or
+    ``in``; ``pending`` counts them.
+
+    A scheduled friend is looked up when the item arrives: if the friend
+    is in line the item joins them, otherwise it goes to the back.
+
+    Args:
+        items: Initial items
+        clock: Returns the current time, in seconds
+        resolution: Timer tick, in seconds; arrivals are never early and
+            at most one tick late
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Item] = (),
+        clock: Callable[[], float] = time.monotonic,
+        resolution: float = 0.01,
+    ) -> None:
+        super().__init__(items)
+        self.clock = clock
+        self._wheel: TimerWheel[Tuple[Item, Optional[Item]]] = TimerWheel(
+            resolution, start=clock()
+        )
+
+    def enqueue_at(
+        self, item: Item, when: float, friend: Optional[Item] = None
+    ) -> None:
+        """
+        Schedule an item to join the queue at time ``when`` on ``clock``.
+
+        Args:
+            item: The item to add
+            when: When the item arrives
+            friend: Optional item to join on arrival
+        """
+        self._wheel.schedule(when, (item, friend))
+
+    def enqueue_after(
+        self, item: Item, delay: float, friend: Optional[Item] = None
+    ) -> None:
+        """Schedule an item to join the queue ``delay`` seconds from now."""
+        self.enqueue_at(item, self.clock() + delay, friend)
+
+    def pending(self) -> int:
+        """Return the number of scheduled items that have not arrived yet."""
+        return len(self._wheel)
+
+    def promote_due(self, now: Optional[float] = None) -> List[Item]:
+        """
+        Move the scheduled items that are due into the queue.
+
+        Items are due at ``now``, by default the clock's time.
+
+        Returns:
+            The items that arrived, in arrival order
+        """
+        arrived = self._wheel.advance(self.clock() if now is None else now)
+        for item, friend in arrived:
+            if friend is not None and friend in self:
+                self.put(item, friend)
+            else:
+                self.append(item)
+        return [item for item, _ in arrived]
+
+    def dequeue(self) -> Item:
+        """Remove and return the first item, after promoting due arrivals."""
+        self.promote_due()
+        return super().dequeue()
+
+    def dequeue_many(self, n: int) -> List[Item]:
+        """Remove and return up to ``n`` items, after promoting due arrivals."""
+        self.promote_due()
+        return super().dequeue_many(n)
+
+    def drain(self, max_items: Optional[int] = None) -> Iterator[Item]:
+        """Remove and yield the items in line, counting the arrivals due."""
+        self.promote_due()
+        return super().drain(max_items)
+
+    def peek(self) -> Item:
+        """Return the first item, after promoting due arrivals."""
+        self.promote_due()
+        return super().peek()
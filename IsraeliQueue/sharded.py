@@ -0,0 +1,331 @@
+import heapq
+import itertools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import (
+    Any,
+    ContextManager,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .IsraeliQueue import Item, _ItemCounter
+
+
+class _Block:
+    """A run of consecutive items of one group, ranked by its arrival number."""
+
+    __slots__ = ("key", "group", "items")
+
+    def __init__(self, key: int, group: Any) -> None:
+        self.key = key
+        self.group = group
+        self.items: Deque[Item] = deque()
+
+
+class _Shard:
+    """The blocks of the groups hashed to one shard, in line order."""
+
+    __slots__ = ("lock", "blocks", "tails", "members", "group_counts", "size")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.blocks: Deque[_Block] = deque()
+        self.tails: Dict[Any, _Block] = {}
+        self.members = _ItemCounter()
+        self.group_counts: Dict[Any, int] = {}
+        self.size = 0
+
+    def push(self, block: _Block, item: Item) -> None:
+        block.items.append(item)
+        self.members.add(item)
+        self.group_counts[block.group] = self.group_counts.get(block.group, 0) + 1
+        self.size += 1
+
+    def pop(self) -> Item:
+        block = self.blocks[0]
+        item = block.items.popleft()
+        if not block.items:
+            self.blocks.popleft()
+            if self.tails.get(block.group) is block:
+                del self.tails[block.group]
+        self.members.remove(item)
+        remaining = self.group_counts[block.group] - 1
+        if remaining:
+            self.group_counts[block.group] = remaining
+        else:
+            del self.group_counts[block.group]
+        self.size -= 1
+        return item
+
+
+class ShardedIsraeliQueue:
+    """
+    A thread-safe Israeli queue whose groups are spread over locked shards.
+
+    Every group is hashed onto one of ``shards`` shards, each with its own
+    lock, so producers working on groups in different shards do not wait
+    for each other. Within a shard, items are kept in blocks of
+    consecutive friends, and every block is stamped with a global arrival
+    number when it is opened. The line is all blocks in arrival-number
+    order, so ``dequeue`` serves the shard whose first block has the
+    lowest number and still returns the global front. Consumers share one
+    extra lock, and a dequeue holds every shard lock (taken in shard
+    order) while it picks and serves the front, so no arrival can slip in
+    ahead of one it has already passed over. It costs O(shards), and
+    producers wait for it only that long.
+
+    Enqueues running at the same time on different shards are ordered by
+    the arrival numbers they draw. ``put`` holds the locks of the item's
+    and the friend's shards while it checks the friend and places the item.
+    """
+
+    def __init__(self, items: Iterable[Item] = (), shards: int = 8) -> None:
+        if shards < 1:
+            raise ValueError("shards must be positive")
+        self._shards = [_Shard() for _ in range(shards)]
+        self._arrivals = itertools.count()
+        self._dequeue_lock = threading.Lock()
+        self.extend(items)
+
+    @property
+    def shards(self) -> int:
+        """Number of shards."""
+        return len(self._shards)
+
+    def _shard_index(self, group: Any) -> int:
+        return hash(group) % len(self._shards)
+
+    def _shard(self, group: Any) -> _Shard:
+        return self._shards[self._shard_index(group)]
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line."""
+        shard = self._shard(item.group)
+        with shard.lock:
+            self._locked_append(shard, item)
+
+    def _locked_append(self, shard: _Shard, item: Item) -> None:
+        """Open a block for item at the end of the line; hold shard's lock."""
+        block = _Block(next(self._arrivals), item.group)
+        shard.blocks.append(block)
+        shard.tails[item.group] = block
+        shard.push(block, item)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add several items to the end of the line."""
+        for item in items:
+            self.append(item)
+
+    def put(self, item: Item, friend: Item) -> None:
+        """
+        Add an item to the queue next to its friends.
+
+        Args:
+            item: The item to add to the queue
+            friend: An existing item in the queue (used for validation)
+
+        Raises:
+            ValueError: If friend is not found in the queue
+        """
+        index = self._shard_index(item.group)
+        try:
+            friend_index = self._shard_index(getattr(friend, "group", None))
+        except TypeError:
+            raise ValueError("Friend not found in queue") from None
+        shard = self._shards[index]
+        # Check the friend and place the item as one step, so no dequeue or
+        # other put can come in between
+        with self._holding([self._shards[i] for i in sorted({index, friend_index})]):
+            if friend not in self._shards[friend_index].members:
+                raise ValueError("Friend not found in queue")
+            block = shard.tails.get(item.group)
+            if block is None:
+                # No friends in queue, append to end
+                self._locked_append(shard, item)
+            else:
+                # The group's tail block always ends with its furthest member
+                shard.push(block, item)
+
+    def enqueue(self, item: Item, friend: Optional[Item] = None) -> None:
+        """
+        Add an item to the queue, next to friend if one is given.
+
+        Without a friend the item goes to the end of the line.
+
+        Args:
+            item: The item to add
+            friend: Optional existing item to join
+        """
+        if friend is None:
+            self.append(item)
+        else:
+            self.put(item, friend)
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """
+        Add a batch of ``(item, friend)`` pairs, as ``enqueue`` would.
+
+        Raises:
+            ValueError: If a friend is not found in the queue. Items before
+                the offending pair are still added.
+        """
+        for item, friend in pairs:
+            self.enqueue(item, friend)
+
+    @contextmanager
+    def _holding(self, shards: List[_Shard]) -> Iterator[None]:
+        """Hold the locks of shards, which must be listed in shard order."""
+        for shard in shards:
+            shard.lock.acquire()
+        try:
+            yield
+        finally:
+            for shard in shards:
+                shard.lock.release()
+
+    def _all_shards(self) -> ContextManager[None]:
+        """Hold every shard lock, taken in shard order."""
+        return self._holding(self._shards)
+
+    def _front(self) -> Optional[_Shard]:
+        """Return the shard holding the first block; hold every shard lock."""
+        front = None
+        lowest = 0
+        for shard in self._shards:
+            if shard.blocks:
+                key = shard.blocks[0].key
+                if front is None or key < lowest:
+                    front, lowest = shard, key
+        return front
+
+    def dequeue(self) -> Item:
+        """
+        Remove and return the first item from the queue.
+
+        Returns:
+            The first item in the queue
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        with self._dequeue_lock, self._all_shards():
+            shard = self._front()
+            if shard is None:
+                raise IndexError("Cannot dequeue from empty queue")
+            return shard.pop()
+
+    def dequeue_many(self, n: int) -> List[Item]:
+        """
+        Remove and return up to ``n`` items from the front of the queue.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        result: List[Item] = []
+        with self._dequeue_lock, self._all_shards():
+            while len(result) < n:
+                shard = self._front()
+                if shard is None:
+                    break
+                # Serve the whole front block, up to n items
+                block = shard.blocks[0]
+                for _ in range(min(n - len(result), len(block.items))):
+                    result.append(shard.pop())
+        return result
+
+    def peek(self) -> Item:
+        """
+        Return the first item without removing it.
+
+        Returns:
+            The first item in the queue
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        with self._dequeue_lock, self._all_shards():
+            shard = self._front()
+            if shard is None:
+                raise IndexError("Cannot peek empty queue")
+            return shard.blocks[0].items[0]
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty."""
+        return self.size() == 0
+
+    def size(self) -> int:
+        """Return the number of items in the queue."""
+        return sum(shard.size for shard in self._shards)
+
+    def get_groups(self) -> List[Any]:
+        """Get all unique group numbers in the queue."""
+        groups: List[Any] = []
+        for shard in self._shards:
+            with shard.lock:
+                groups.extend(shard.group_counts)
+        return groups
+
+    def group_size(self, group: Any) -> int:
+        """Return the number of queued items in a group."""
+        return self._shard(group).group_counts.get(group, 0)
+
+    def items_in_group(self, group: Any) -> List[Item]:
+        """Get all items belonging to a specific group."""
+        shard = self._shard(group)
+        with shard.lock:
+            return [
+                item
+                for block in shard.blocks
+                if block.group == group
+                for item in block.items
+            ]
+
+    def index(self, item: Item) -> int:
+        """Return the position of the first occurrence of item."""
+        for position, other in enumerate(self):
+            if other == item:
+                return position
+        raise ValueError(f"{item!r} is not in queue")
+
+    def __contains__(self, item: object) -> bool:
+        group = getattr(item, "group", None)
+        try:
+            shard = self._shard(group)
+        except TypeError:
+            return False
+        with shard.lock:
+            return item in shard.members
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def __iter__(self) -> Iterator[Item]:
+        """Iterate over a snapshot of the line, taken under every lock."""
+        with self._dequeue_lock, self._all_shards():
+            blocks = [
+                [(block.key, list(block.items)) for block in shard.blocks]
+                for shard in self._shards
+            ]
+        for _, items in heapq.merge(*blocks, key=lambda block: block[0]):
+            yield from items
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return list(self)[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, ShardedIsraeliQueue)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
@@ -0,0 +1,190 @@
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, cast
+
+from ._wordqueue import _WordQueue, layout_words
+from .IsraeliQueue import Item
+
+_WORD = 8
+
+
+def _attach(
+    name: str, lock: Any, item_factory: Callable[[int, int], Any]
+) -> "SharedIsraeliQueue":
+    return SharedIsraeliQueue(
+        name=name, create=False, lock=lock, item_factory=item_factory
+    )
+
+
+class SharedIsraeliQueue(_WordQueue):
+    """
+    An Israeli queue of integer items shared by processes through shared memory.
+
+    The queue lives in a ``multiprocessing.shared_memory`` block: a header,
+    a table with the head, tail and size of every group, and a fixed pool of
+    ``capacity`` records of ``(item, group, next, group next)``. Any process
+    attached to the block can ``enqueue``, ``put`` and ``dequeue`` with the
+    usual join semantics, guarded by one lock; nothing goes through a
+    manager process and items are never pickled.
+
+    Items must have integer ``item`` and ``group`` attributes, so share ids
+    (of rows, files or other shared buffers) rather than objects. Items are
+    rebuilt with ``item_factory`` when they are read back.
+
+    A queue pickles as a reference to its block and lock, so it can be
+    passed to a ``multiprocessing.Process``; for a pool, pass it through
+    the pool's ``initializer``, since locks only travel to new processes.
+    Other processes can also attach by ``name`` with the same lock. The
+    creating process should call ``unlink`` once every process is done.
+
+    Args:
+        capacity: Number of items the queue can hold
+        max_groups: Number of distinct groups the queue can hold at once
+        item_factory: Builds the returned items from ``(item, group)``
+        name: The shared memory block to create or attach to
+        create: Create a new block rather than attach to ``name``
+        lock: The lock guarding the queue; a new ``multiprocessing.RLock``
+            for a new block. Must be reentrant, shared by all users and,
+            to reach spawned processes, made by the same start method's
+            context as them.
+
+    Raises:
+        OverflowError: From the queue operations, when the queue is full
+            or holds ``max_groups`` groups already
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        max_groups: int = 1024,
+        item_factory: Callable[[int, int], Any] = Item,
+        name: Optional[str] = None,
+        create: bool = True,
+        lock: Any = None,
+    ) -> None:
+        super().__init__(item_factory)
+        if create:
+            if capacity < 1 or max_groups < 1:
+                raise ValueError("capacity and max_groups must be positive")
+            size = layout_words(capacity, max_groups) * _WORD
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            if name is None:
+                raise ValueError("name is required to attach to a queue")
+            if lock is None:
+                raise ValueError("lock is required to attach to a queue")
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._lock = multiprocessing.RLock() if lock is None else lock
+        # The block may be rounded up to whole pages
+        usable = self._shm.size // _WORD * _WORD
+        # The buffer is only None once the block is closed
+        self._words = cast(memoryview, self._shm.buf)[:usable].cast("q")
+        if create:
+            self._format(capacity, max_groups)
+        else:
+            self._validate()
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def lock(self) -> Any:
+        """The lock guarding the queue."""
+        return self._lock
+
+    def __reduce__(self) -> Any:
+        return (_attach, (self._shm.name, self._lock, self.item_factory))
+
+    def close(self) -> None:
+        """Detach this process from the queue."""
+        self._words.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Destroy the shared memory block once every process has closed it."""
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedIsraeliQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Every public operation holds the lock
+
+    def append(self, item: Item) -> None:
+        """Add an item to the end of the line, holding the lock."""
+        with self._lock:
+            super().append(item)
+
+    def put(self, item: Item, friend: Item) -> None:
+        """Add an item next to its friends, holding the lock."""
+        with self._lock:
+            super().put(item, friend)
+
+    def enqueue(self, item: Item, friend: Optional[Item] = None) -> None:
+        """Add an item, next to friend if given, holding the lock."""
+        with self._lock:
+            super().enqueue(item, friend)
+
+    def enqueue_many(self, pairs: Iterable[Tuple[Item, Optional[Item]]]) -> None:
+        """Add a batch of ``(item, friend)`` pairs, holding the lock."""
+        pairs = list(pairs)
+        with self._lock:
+            super().enqueue_many(pairs)
+
+    def dequeue(self) -> Any:
+        """Remove and return the first item, holding the lock."""
+        with self._lock:
+            return super().dequeue()
+
+    def dequeue_many(self, n: int) -> List[Any]:
+        """Remove and return up to ``n`` items, holding the lock."""
+        with self._lock:
+            return super().dequeue_many(n)
+
+    def peek(self) -> Any:
+        """Return the first item without removing it, holding the lock."""
+        with self._lock:
+            return super().peek()
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty, holding the lock."""
+        with self._lock:
+            return super().is_empty()
+
+    def size(self) -> int:
+        """Return the number of items in the queue, holding the lock."""
+        with self._lock:
+            return super().size()
+
+    def get_groups(self) -> List[int]:
+        """Get all unique group numbers in the queue, holding the lock."""
+        with self._lock:
+            return super().get_groups()
+
+    def group_size(self, group: int) -> int:
+        """Return the number of queued items in a group, holding the lock."""
+        with self._lock:
+            return super().group_size(group)
+
+    def _iter_group(self, group: int) -> Iterator[Any]:
+        # Every read of a group view copies the group under the lock
+        with self._lock:
+            items = list(super()._iter_group(group))
+        return iter(items)
+
+    def __contains__(self, item: object) -> bool:
+        with self._lock:
+            return super().__contains__(item)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return super().__len__()
+
+    def __iter__(self) -> Iterator[Any]:
+        with self._lock:
+            items = list(super().__iter__())
+        return iter(items)
@@ -0,0 +1,327 @@
+"""
+Discrete-event simulation of Israeli queues.
+
+A ``Simulation`` feeds parties of customers from an arrival process into
+a queue served by identical servers, and reports wait-time, throughput
+and utilization statistics. Parties belong to groups; a party whose group
+is already waiting joins its friends in line, otherwise it goes to the
+back. Events (arrivals and service completions) are kept in a heap, and
+the queue is a ``LinkedIsraeliQueue`` by default, so joining a friend and
+serving the front stay cheap however long the line grows.
+
+Distributions and arrival processes are small frozen dataclasses rather
+than closures, so a simulation can be pickled and its replications run in
+a process pool with ``replicate``. Runs are reproducible from their seed.
+"""
+
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from heapq import heappop, heappush
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .IsraeliQueue import Item
+from .linked import LinkedIsraeliQueue
+
+# Event kinds, in the order simultaneous events are handled
+_DEPARTURE = 0
+_ARRIVAL = 1
+
+
+@dataclass(frozen=True)
+class Constant:
+    """Always ``value``."""
+
+    value: float
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value."""
+        return self.value
+
+
+@dataclass(frozen=True)
+class Exponential:
+    """Exponentially distributed with the given mean."""
+
+    mean: float
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value."""
+        return rng.expovariate(1 / self.mean)
+
+
+@dataclass(frozen=True)
+class Uniform:
+    """Uniformly distributed between ``low`` and ``high``."""
+
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value."""
+        return rng.uniform(self.low, self.high)
+
+
+@dataclass(frozen=True)
+class LogNormal:
+    """Log-normally distributed; ``mu`` and ``sigma`` are of the logarithm."""
+
+    mu: float
+    sigma: float
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value."""
+        return rng.lognormvariate(self.mu, self.sigma)
+
+
+@dataclass(frozen=True)
+class Geometric:
+    """Positive integers, geometrically distributed with the given mean."""
+
+    mean: float
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value."""
+        if self.mean <= 1:
+            return 1
+        return 1 + int(math.log(1 - rng.random()) / math.log(1 - 1 / self.mean))
+
+
+@dataclass(frozen=True)
+class Empirical:
+    """One of ``values``, drawn with the given weights (or uniformly)."""
+
+    values: Sequence[float]
+    weights: Optional[Sequence[float]] = None
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one value."""
+        return rng.choices(self.values, self.weights)[0]
+
+
+@dataclass(frozen=True)
+class Poisson:
+    """Arrivals at a constant ``rate`` per unit of time."""
+
+    rate: float
+
+    def times(self, rng: random.Random) -> Iterator[float]:
+        """Yield the arrival times, starting from 0."""
+        now = 0.0
+        rate = self.rate
+        expovariate = rng.expovariate
+        while True:
+            now += expovariate(rate)
+            yield now
+
+
+@dataclass(frozen=True)
+class Bursty:
+    """
+    Arrivals that alternate between calm and burst periods.
+
+    Periods last an exponentially distributed time with means
+    ``mean_calm`` and ``mean_burst``, and arrivals come at ``rate`` in
+    calm periods and at ``burst_rate`` in bursts (a two-state
+    Markov-modulated Poisson process). The run starts calm.
+    """
+
+    rate: float
+    burst_rate: float
+    mean_calm: float
+    mean_burst: float
+
+    def times(self, rng: random.Random) -> Iterator[float]:
+        """Yield the arrival times, starting from 0."""
+        now = 0.0
+        bursting = False
+        period_end = rng.expovariate(1 / self.mean_calm)
+        while True:
+            rate = self.burst_rate if bursting else self.rate
+            gap = rng.expovariate(rate) if rate > 0 else math.inf
+            if now + gap <= period_end:
+                now += gap
+                yield now
+                continue
+            # The wait is memoryless, so start it again in the next period
+            now = period_end
+            bursting = not bursting
+            mean = self.mean_burst if bursting else self.mean_calm
+            period_end = now + rng.expovariate(1 / mean)
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """
+    The statistics of one run.
+
+    Waits are the time from joining the line to the start of service, of
+    the customers whose service started before the horizon.
+    """
+
+    duration: float
+    events: int
+    arrivals: int
+    served: int
+    waiting: int
+    mean_wait: float
+    p50_wait: float
+    p90_wait: float
+    p99_wait: float
+    max_wait: float
+    throughput: float
+    utilization: float
+    mean_queue_length: float
+
+
+def _percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values, 0 when there are none."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+@dataclass(frozen=True)
+class Simulation:
+    """
+    A queue served by ``servers`` identical servers.
+
+    Every arrival brings a party of ``group_size`` customers of one group.
+    With ``groups=None`` every party is a group of its own; otherwise the
+    group is drawn uniformly from ``groups`` groups, and a party whose
+    group is in line joins it. Free servers take the front of the line.
+
+    Args:
+        arrivals: When parties arrive (``Poisson`` or ``Bursty``)
+        service: Service time of one customer
+        servers: Number of servers
+        group_size: Customers per party
+        groups: Number of groups parties are drawn from, or None
+        queue_factory: Builds the empty queue to simulate
+        seed: Seed of the run's random numbers
+    """
+
+    arrivals: Any
+    service: Any
+    servers: int = 1
+    group_size: Any = Constant(1)
+    groups: Optional[int] = None
+    queue_factory: Callable[[], Any] = LinkedIsraeliQueue
+    seed: Optional[int] = None
+
+    def run(self, until: float) -> SimulationResult:
+        """Simulate from time 0 to ``until`` and return the statistics."""
+        if until <= 0:
+            raise ValueError("until must be positive")
+        if self.servers < 1:
+            raise ValueError("servers must be at least 1")
+        rng = random.Random(self.seed)
+        queue = self.queue_factory()
+        arrival_times = self.arrivals.times(rng)
+        sample_service = self.service.sample
+        sample_size = self.group_size.sample
+        groups = self.groups
+        enqueue = queue.enqueue
+        dequeue = queue.dequeue
+
+        # The last customer of every group to join; while the group has
+        # anyone in line, that customer is still there
+        last: Dict[Any, Item] = {}
+        joined: Dict[int, float] = {}
+        waits: List[float] = []
+        calendar: List[Any] = [(next(arrival_times), _ARRIVAL)]
+        idle = self.servers
+        customers = 0
+        parties = 0
+        events = 0
+        served = 0
+        busy = 0.0
+        area = 0.0
+        clock = 0.0
+
+        while calendar and calendar[0][0] <= until:
+            now, kind = heappop(calendar)
+            events += 1
+            area += len(queue) * (now - clock)
+            clock = now
+            if kind == _ARRIVAL:
+                if groups is None:
+                    group: Any = parties
+                else:
+                    group = rng.randrange(groups)
+                parties += 1
+                friend = last.get(group)
+                if friend is not None and not queue.group_size(group):
+                    friend = None
+                for _ in range(max(1, int(sample_size(rng)))):
+                    item = Item(customers, group)
+                    joined[customers] = now
+                    customers += 1
+                    enqueue(item, friend)
+                    friend = item
+                # A party always has at least one member
+                last[group] = item
+                heappush(calendar, (next(arrival_times), _ARRIVAL))
+            else:
+                idle += 1
+                served += 1
+            while idle and queue:
+                item = dequeue()
+                waits.append(now - joined.pop(item.item))
+                duration = sample_service(rng)
+                busy += min(duration, until - now)
+                idle -= 1
+                heappush(calendar, (now + duration, _DEPARTURE))
+
+        area += len(queue) * (until - clock)
+        waits.sort()
+        return SimulationResult(
+            duration=until,
+            events=events,
+            arrivals=customers,
+            served=served,
+            waiting=len(queue),
+            mean_wait=sum(waits) / len(waits) if waits else 0.0,
+            p50_wait=_percentile(waits, 0.5),
+            p90_wait=_percentile(waits, 0.9),
+            p99_wait=_percentile(waits, 0.99),
+            max_wait=waits[-1] if waits else 0.0,
+            throughput=served / until,
+            utilization=busy / (self.servers * until),
+            mean_queue_length=area / until,
+        )
+
+
+def _run_seeded(simulation: Simulation, seed: int, until: float) -> SimulationResult:
+    return replace(simulation, seed=seed).run(until)
+
+
+def replicate(
+    simulation: Simulation,
+    until: float,
+    seeds: Iterable[int],
+    processes: Optional[int] = None,
+) -> List[SimulationResult]:
+    """
+    Run independent replications of a simulation, one per seed.
+
+    Args:
+        simulation: The simulation to replicate; its own seed is ignored
+        until: Horizon of every run
+        seeds: One seed per replication
+        processes: Worker processes; by default one per CPU, and 0 runs
+            the replications in this process
+
+    Returns:
+        The results in the order of ``seeds``
+    """
+    seeds = list(seeds)
+    if processes == 0:
+        return [_run_seeded(simulation, seed, until) for seed in seeds]
+    with ProcessPoolExecutor(processes) as pool:
+        return list(
+            pool.map(
+                _run_seeded, [simulation] * len(seeds), seeds, [until] * len(seeds)
+            )
+        )
@@ -0,0 +1,169 @@
+"""
+Back-pressured pipelines through an Israeli queue.
+
+``stream`` and ``astream`` pull ``(item, friend)`` pairs from a source
+only while the queue holds fewer than ``maxsize`` items, and yield items
+in the order the queue serves them, so producer and consumer run in step
+without intermediate lists. ``feed`` and ``afeed`` push a source into a
+``ConcurrentIsraeliQueue`` or ``AsyncIsraeliQueue`` for consumers
+elsewhere, waiting whenever the queue is full.
+
+Sources may be iterables or, for the async adapters, async iterables.
+A friend that has already been served by the time its pair is taken
+cannot be joined, and the item goes to the back of the line instead.
+"""
+
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .IsraeliQueue import Item
+from .aio import AsyncIsraeliQueue
+from .linked import LinkedIsraeliQueue
+from .threaded import ConcurrentIsraeliQueue
+
+Pair = Tuple[Item, Optional[Item]]
+
+
+def _check_maxsize(maxsize: int) -> None:
+    if maxsize < 1:
+        raise ValueError("maxsize must be positive")
+
+
+def _join(queue: Any, item: Item, friend: Optional[Item]) -> None:
+    if friend is not None and friend not in queue:
+        friend = None
+    queue.enqueue(item, friend)
+
+
+async def _pairs(
+    pairs: Union[Iterable[Pair], AsyncIterable[Pair]]
+) -> AsyncIterator[Pair]:
+    if isinstance(pairs, AsyncIterable):
+        async for pair in pairs:
+            yield pair
+    else:
+        for pair in pairs:
+            yield pair
+
+
+def stream(
+    pairs: Iterable[Pair], queue: Optional[Any] = None, maxsize: int = 64
+) -> Iterator[Item]:
+    """
+    Pass pairs through a queue and yield the items it serves.
+
+    The source is read ahead only until the queue holds ``maxsize``
+    items, and then one pair per item served.
+
+    Args:
+        pairs: ``(item, friend)`` pairs; friend may be None
+        queue: The queue to pass the items through, a new
+            ``LinkedIsraeliQueue`` by default
+        maxsize: Maximum number of items waiting in the queue
+
+    Raises:
+        ValueError: If maxsize is not positive
+    """
+    _check_maxsize(maxsize)
+    if queue is None:
+        queue = LinkedIsraeliQueue()
+    return _stream(iter(pairs), queue, maxsize)
+
+
+def _stream(source: Iterator[Pair], queue: Any, maxsize: int) -> Iterator[Item]:
+    for item, friend in source:
+        _join(queue, item, friend)
+        if len(queue) >= maxsize:
+            yield queue.dequeue()
+    while queue:
+        yield queue.dequeue()
+
+
+def astream(
+    pairs: Union[Iterable[Pair], AsyncIterable[Pair]],
+    queue: Optional[Any] = None,
+    maxsize: int = 64,
+) -> AsyncIterator[Item]:
+    """
+    Like ``stream``, for an iterable or async iterable of pairs.
+
+    Raises:
+        ValueError: If maxsize is not positive
+    """
+    _check_maxsize(maxsize)
+    if queue is None:
+        queue = LinkedIsraeliQueue()
+    return _astream(pairs, queue, maxsize)
+
+
+async def _astream(
+    pairs: Union[Iterable[Pair], AsyncIterable[Pair]], queue: Any, maxsize: int
+) -> AsyncIterator[Item]:
+    async for item, friend in _pairs(pairs):
+        _join(queue, item, friend)
+        if len(queue) >= maxsize:
+            yield queue.dequeue()
+    while queue:
+        yield queue.dequeue()
+
+
+def feed(
+    pairs: Iterable[Pair],
+    queue: ConcurrentIsraeliQueue,
+    timeout: Optional[float] = None,
+) -> int:
+    """
+    Put pairs into a thread-safe queue, blocking while it is full.
+
+    Args:
+        pairs: ``(item, friend)`` pairs; friend may be None
+        queue: The queue to fill; its ``maxsize`` bounds the items waiting
+        timeout: Maximum number of seconds to wait for each free slot
+
+    Returns:
+        The number of items put
+
+    Raises:
+        queue.Full: If no slot became free in time
+    """
+    count = 0
+    for item, friend in pairs:
+        try:
+            queue.put(item, friend, timeout=timeout)
+        except ValueError:
+            if friend is None:
+                raise
+            # The friend was served before the item arrived
+            queue.put(item, timeout=timeout)
+        count += 1
+    return count
+
+
+async def afeed(
+    pairs: Union[Iterable[Pair], AsyncIterable[Pair]], queue: AsyncIsraeliQueue
+) -> int:
+    """
+    Put pairs into an asyncio queue, waiting while it is full.
+
+    Returns:
+        The number of items put
+    """
+    count = 0
+    async for item, friend in _pairs(pairs):
+        try:
+            await queue.put(item, friend)
+        except ValueError:
+            if friend is None:
+                raise
+            # The friend was served before the item arrived
+            await queue.put(item)
+        count += 1
+    return count
@@ -0,0 +1,171 @@
+import threading
+from queue import Empty, Full
+from time import monotonic
+from typing import Any, List, Optional, Tuple
+
+from .IsraeliQueue import Item
+from .linked import LinkedIsraeliQueue
+
+
+class ConcurrentIsraeliQueue:
+    """
+    A thread-safe Israeli queue with the interface of ``queue.Queue``.
+
+    Producers ``put`` items (joining a friend when one is given) and
+    consumers ``get`` them, blocking on condition variables rather than
+    polling. A positive ``maxsize`` makes ``put`` block while the queue is
+    full. The read-only stats (``qsize``, ``empty``, ``full``,
+    ``group_size`` and ``get_groups``) do not take the lock, so like
+    ``queue.Queue.qsize`` their answers may be stale by the time they are
+    used.
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self.maxsize = maxsize
+        self._queue = LinkedIsraeliQueue()
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+        self.all_tasks_done = threading.Condition(self.mutex)
+        self.unfinished_tasks = 0
+
+    def put(
+        self,
+        item: Item,
+        friend: Optional[Item] = None,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Add an item to the queue, joining friend if one is given.
+
+        Args:
+            item: The item to add
+            friend: Optional existing item to join
+            block: Whether to wait for a free slot when the queue is full
+            timeout: Maximum number of seconds to wait, or None to wait forever
+
+        Raises:
+            queue.Full: If no slot became free in time
+            ValueError: If friend is not found in the queue
+        """
+        with self.not_full:
+            if self.maxsize > 0:
+                if not block:
+                    if len(self._queue) >= self.maxsize:
+                        raise Full
+                elif timeout is None:
+                    while len(self._queue) >= self.maxsize:
+                        self.not_full.wait()
+                elif timeout < 0:
+                    raise ValueError("'timeout' must be a non-negative number")
+                else:
+                    endtime = monotonic() + timeout
+                    while len(self._queue) >= self.maxsize:
+                        remaining = endtime - monotonic()
+                        if remaining <= 0.0:
+                            raise Full
+                        self.not_full.wait(remaining)
+            try:
+                self._queue.enqueue(item, friend)
+            except ValueError:
+                # Pass on the free slot this producer may have been woken for
+                self.not_full.notify()
+                raise
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Item:
+        """
+        Remove and return the first item from the queue.
+
+        Args:
+            block: Whether to wait for an item when the queue is empty
+            timeout: Maximum number of seconds to wait, or None to wait forever
+
+        Raises:
+            queue.Empty: If no item became available in time
+        """
+        with self.not_empty:
+            if not block:
+                if not len(self._queue):
+                    raise Empty
+            elif timeout is None:
+                while not len(self._queue):
+                    self.not_empty.wait()
+            elif timeout < 0:
+                raise ValueError("'timeout' must be a non-negative number")
+            else:
+                endtime = monotonic() + timeout
+                while not len(self._queue):
+                    remaining = endtime - monotonic()
+                    if remaining <= 0.0:
+                        raise Empty
+                    self.not_empty.wait(remaining)
+            item = self._queue.dequeue()
+            self.not_full.notify()
+            return item
+
+    def put_nowait(self, item: Item, friend: Optional[Item] = None) -> None:
+        """Add an item without blocking, or raise ``queue.Full``."""
+        self.put(item, friend, block=False)
+
+    def get_nowait(self) -> Item:
+        """Remove and return an item without blocking, or raise ``queue.Empty``."""
+        return self.get(block=False)
+
+    def task_done(self) -> None:
+        """
+        Mark a previously fetched item as processed.
+
+        Raises:
+            ValueError: If called more times than there were items put
+        """
+        with self.all_tasks_done:
+            unfinished = self.unfinished_tasks - 1
+            if unfinished <= 0:
+                if unfinished < 0:
+                    raise ValueError("task_done() called too many times")
+                self.all_tasks_done.notify_all()
+            self.unfinished_tasks = unfinished
+
+    def join(self) -> None:
+        """Block until every item put has been fetched and marked done."""
+        with self.all_tasks_done:
+            while self.unfinished_tasks:
+                self.all_tasks_done.wait()
+
+    def qsize(self) -> int:
+        """Return the approximate number of items in the queue."""
+        return len(self._queue)
+
+    def empty(self) -> bool:
+        """Return True if the queue has no items; not reliable, see ``qsize``."""
+        return not len(self._queue)
+
+    def full(self) -> bool:
+        """Return True if the queue holds maxsize items; see ``qsize``."""
+        return 0 < self.maxsize <= len(self._queue)
+
+    def group_size(self, group: Any) -> int:
+        """Return the approximate number of queued items in a group."""
+        return self._queue.group_size(group)
+
+    def get_groups(self) -> List[Any]:
+        """Get the groups currently in the queue (not reliable, see ``qsize``)."""
+        return self._queue.get_groups()
+
+    def position_of(self, item: Item) -> int:
+        """Return the position of item in line, in O(log n)."""
+        with self.mutex:
+            return self._queue.position_of(item)
+
+    def group_span(self, group: Any) -> Tuple[int, int]:
+        """Return the positions of the first and last items of a group."""
+        with self.mutex:
+            return self._queue.group_span(group)
+
+    def estimated_wait(self, item: Item, service_rate: float) -> float:
+        """Estimate how long item waits, with service_rate items served per unit."""
+        with self.mutex:
+            return self._queue.estimated_wait(item, service_rate)
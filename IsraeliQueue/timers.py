@@ -0,0 +1,144 @@
+"""
+A hierarchical timer wheel for scheduled arrivals.
+
+Time is cut into ticks of ``resolution`` seconds. Level 0 of the wheel has
+a slot per tick for the next 64 ticks, level 1 a slot per 64 ticks for
+the next 64 * 64, and so on; entries further out than the top level wait
+in a heap. An entry sits in the lowest level whose span covers it, and
+moves down a level when the wheel reaches its slot, so every entry is
+handled once per level. Each level keeps a bitmask of its occupied slots,
+so ``advance`` jumps straight to the next occupied slot and never visits
+empty ones, however far the clock moved.
+"""
+
+import math
+from heapq import heappop, heappush
+from typing import Any, Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_BITS = 6
+_SLOTS = 1 << _BITS
+_MASK = _SLOTS - 1
+
+# (when, sequence, tick, payload)
+_Entry = Tuple[float, int, int, Any]
+
+
+def _next_slot(occupied: int, counter: int) -> int:
+    """Return the smallest d >= 1 such that slot (counter + d) is occupied."""
+    start = (counter + 1) & _MASK
+    # Rotate the mask so that bit 0 is the slot right after counter
+    rotated = ((occupied >> start) | (occupied << (_SLOTS - start))) & (
+        (1 << _SLOTS) - 1
+    )
+    return (rotated & -rotated).bit_length()
+
+
+class TimerWheel(Generic[T]):
+    """
+    Payloads scheduled for a time, handed back by ``advance`` once due.
+
+    An entry for time ``when`` falls due at the first tick boundary at or
+    after ``when``, so it is never early and at most one tick late.
+    Scheduling is O(1). ``advance`` costs O(levels) per occupied slot it
+    reaches, plus O(1) per entry moved down a level, plus sorting the due
+    entries by time.
+
+    Args:
+        resolution: Length of a tick, in the clock's units
+        start: The current time
+        levels: Number of wheel levels; the wheel spans ``64 ** levels``
+            ticks and later entries wait in a heap
+    """
+
+    def __init__(
+        self, resolution: float = 0.01, start: float = 0, levels: int = 4
+    ) -> None:
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        if levels < 1:
+            raise ValueError("levels must be at least 1")
+        self.resolution = resolution
+        self._tick = math.floor(start / resolution)
+        self._span = 1 << (_BITS * levels)
+        self._slots: List[List[List[_Entry]]] = [
+            [[] for _ in range(_SLOTS)] for _ in range(levels)
+        ]
+        self._occupied = [0] * levels
+        self._far: List[_Entry] = []
+        self._due: List[_Entry] = []
+        self._sequence = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, when: float, payload: T) -> None:
+        """Schedule a payload for time ``when``."""
+        tick = math.ceil(when / self.resolution)
+        self._place((when, self._sequence, tick, payload))
+        self._sequence += 1
+        self._size += 1
+
+    def _place(self, entry: _Entry) -> None:
+        tick = entry[2]
+        delta = tick - self._tick
+        if delta <= 0:
+            self._due.append(entry)
+            return
+        if delta >= self._span:
+            heappush(self._far, entry)
+            return
+        level = (delta.bit_length() - 1) // _BITS
+        slot = (tick >> (_BITS * level)) & _MASK
+        self._slots[level][slot].append(entry)
+        self._occupied[level] |= 1 << slot
+
+    def _next_event(self) -> float:
+        """Return the next tick at which an occupied slot is reached."""
+        best = math.inf
+        for level, occupied in enumerate(self._occupied):
+            if occupied:
+                shift = _BITS * level
+                counter = self._tick >> shift
+                best = min(best, (counter + _next_slot(occupied, counter)) << shift)
+        if self._far:
+            best = min(best, self._far[0][2] - self._span + 1)
+        return best
+
+    def advance(self, now: float) -> List[T]:
+        """
+        Move the wheel to time ``now`` and return the payloads that fell due.
+
+        They are ordered by their scheduled time, then by scheduling order.
+        """
+        target = math.floor(now / self.resolution)
+        while self._size > len(self._due):
+            tick = self._next_event()
+            if tick > target:
+                break
+            self._tick = int(tick)
+            # Move entries down before emptying the level 0 slot they may land in
+            for level in range(len(self._slots) - 1, -1, -1):
+                shift = _BITS * level
+                if self._tick & ((1 << shift) - 1):
+                    continue
+                slot = (self._tick >> shift) & _MASK
+                if self._occupied[level] >> slot & 1:
+                    entries = self._slots[level][slot]
+                    self._slots[level][slot] = []
+                    self._occupied[level] &= ~(1 << slot)
+                    for entry in entries:
+                        self._place(entry)
+            far = self._far
+            while far and far[0][2] - self._tick < self._span:
+                self._place(heappop(far))
+        self._tick = max(self._tick, target)
+        due = self._due
+        if not due:
+            return []
+        self._due = []
+        self._size -= len(due)
+        due.sort(key=lambda entry: entry[:2])
+        return [entry[3] for entry in due]
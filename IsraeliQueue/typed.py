@@ -0,0 +1,138 @@
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .views import QueueView
+
+
+class DequeIsraeliQueueByType:
+    """
+    A queue that groups items by their type, with one deque per type lane.
+
+    Lanes are served in the order they were created and are kept in an
+    ordered ``type -> deque`` map, so enqueue, dequeue, peek and the lane
+    lookup in ``items_of_type`` are O(1).
+
+    Lane matching policy:
+        By default an item joins the lane of its *exact* type, so ``True``
+        never lands in an ``int`` lane and a subclass instance always gets
+        its own lane. With ``match_subclasses=True`` an item joins the lane
+        of its nearest type in ``type(item).__mro__`` that already has a
+        lane, and only opens a new lane for its exact type when none does.
+        Either way the lane chosen depends only on which lanes exist, never
+        on the order in which they were scanned.
+    """
+
+    def __init__(self, match_subclasses: bool = False) -> None:
+        self.match_subclasses = match_subclasses
+        self._lanes: Dict[type, Deque[Any]] = {}
+        self._order: Deque[Tuple[type, Deque[Any]]] = deque()
+        self._size = 0
+
+    def _lane_for(self, item_type: type) -> Optional[Deque[Any]]:
+        lane = self._lanes.get(item_type)
+        if lane is None and self.match_subclasses:
+            for base in item_type.__mro__[1:]:
+                lane = self._lanes.get(base)
+                if lane is not None:
+                    break
+        return lane
+
+    def enqueue(self, item: Any) -> None:
+        """
+        Add an item to the queue, grouping by type.
+
+        Args:
+            item: The item to add to the queue
+        """
+        item_type = type(item)
+        lane = self._lane_for(item_type)
+        if lane is None:
+            # No existing lane for this type, create new one
+            lane = deque()
+            self._lanes[item_type] = lane
+            self._order.append((item_type, lane))
+        lane.append(item)
+        self._size += 1
+
+    def dequeue(self) -> Any:
+        """
+        Remove and return the first item from the first lane.
+
+        Returns:
+            The first item from the first lane
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if not self._order:
+            raise IndexError("Cannot dequeue from empty queue")
+        item_type, lane = self._order[0]
+        result = lane.popleft()
+        if not lane:
+            # Drop empty lanes so the type starts over at the back
+            self._order.popleft()
+            del self._lanes[item_type]
+        self._size -= 1
+        return result
+
+    def enqueue_many(self, items: Iterable[Any]) -> None:
+        """Add a batch of items, as ``enqueue`` would."""
+        for item in items:
+            self.enqueue(item)
+
+    def dequeue_many(self, n: int) -> List[Any]:
+        """
+        Remove and return up to ``n`` items, in the order ``dequeue`` would.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("Cannot dequeue a negative number of items")
+        return [self.dequeue() for _ in range(min(n, self._size))]
+
+    def peek(self) -> Any:
+        """
+        Return the first item without removing it.
+
+        Returns:
+            The first item from the first lane
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if not self._order:
+            raise IndexError("Cannot peek empty queue")
+        return self._order[0][1][0]
+
+    def is_empty(self) -> bool:
+        """Check if the queue is empty."""
+        return self._size == 0
+
+    def size(self) -> int:
+        """Return the total number of items across all lanes."""
+        return self._size
+
+    def get_types(self) -> List[type]:
+        """Get all lane types in the order they will be served."""
+        return [item_type for item_type, _ in self._order]
+
+    def type_size(self, item_type: type) -> int:
+        """Return the number of items in the lane of exactly ``item_type``."""
+        lane = self._lanes.get(item_type)
+        return len(lane) if lane is not None else 0
+
+    def items_of_type(self, item_type: type) -> QueueView:
+        """Get a live, read-only view of the lane of exactly ``item_type``."""
+        return QueueView(lambda: self._lanes.get(item_type, ()))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        for _, lane in self._order:
+            yield from lane
+
+    def __repr__(self) -> str:
+        lanes = [list(lane) for _, lane in self._order]
+        return f"{type(self).__name__}({lanes!r})"
@@ -0,0 +1,138 @@
+"""
+Batch placement of a whole arrival log in one pass.
+
+When every arrival joins its group if the group is already waiting (and
+nobody is served in between), the final Israeli-queue order is simply the
+arrivals stably sorted by the first arrival of their group, then by their
+own arrival. That ordering is computed here with NumPy when it is
+installed (``pip install IsraeliQueue[numpy]``) and in pure Python
+otherwise.
+"""
+
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .IsraeliQueue import Item, IsraeliQueue
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+try:
+    import numpy
+
+    np: Optional[ModuleType] = numpy
+except ImportError:  # pragma: no cover - exercised when NumPy is missing
+    np = None
+
+# Indices in queue order: a NumPy array on the NumPy path, else a list
+Order = Union[List[int], "npt.NDArray[numpy.intp]"]
+
+
+def _use_numpy(use_numpy: Optional[bool]) -> bool:
+    if use_numpy is None:
+        return np is not None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is required for use_numpy=True")
+    return use_numpy
+
+
+def israeli_order(
+    groups: Sequence[int],
+    arrival_order: Optional[Sequence[Any]] = None,
+    use_numpy: Optional[bool] = None,
+) -> Order:
+    """
+    Compute the final queue order of a log of group-joining arrivals.
+
+    Args:
+        groups: The group of every arrival
+        arrival_order: Sortable arrival keys (such as timestamps); the
+            position in ``groups`` is used when omitted. Ties keep their
+            position order.
+        use_numpy: Force the NumPy (True) or pure-Python (False) path;
+            by default NumPy is used when it is installed
+
+    Returns:
+        Indices into ``groups`` in queue order, as a NumPy array on the
+        NumPy path and a list otherwise
+
+    Raises:
+        ValueError: If arrival_order and groups differ in length
+    """
+    if arrival_order is not None and len(arrival_order) != len(groups):
+        raise ValueError("groups and arrival_order must have the same length")
+
+    if _use_numpy(use_numpy) and np is not None:
+        group_ids: "npt.NDArray[Any]" = np.asarray(groups)
+        order: "npt.NDArray[numpy.intp]"
+        if arrival_order is None:
+            order = np.arange(len(group_ids))
+        else:
+            order = np.argsort(np.asarray(arrival_order), kind="stable")
+        # Rank of the first arrival of every item's group
+        first: "npt.NDArray[numpy.intp]"
+        inverse: "npt.NDArray[numpy.intp]"
+        _, first, inverse = np.unique(
+            group_ids[order], return_index=True, return_inverse=True
+        )
+        served: "npt.NDArray[numpy.intp]" = order[
+            np.argsort(first[inverse.ravel()], kind="stable")
+        ]
+        return served
+
+    if arrival_order is None:
+        positions: Sequence[int] = range(len(groups))
+    else:
+        positions = sorted(range(len(groups)), key=arrival_order.__getitem__)
+    # Dicts keep insertion order, so groups come out by first arrival
+    buckets: Dict[Any, List[int]] = {}
+    for index in positions:
+        buckets.setdefault(groups[index], []).append(index)
+    return [index for bucket in buckets.values() for index in bucket]
+
+
+def replay(
+    items: Sequence[Any],
+    groups: Sequence[int],
+    arrival_order: Optional[Sequence[Any]] = None,
+    item_factory: Callable[[Any, Any], Item] = Item,
+    use_numpy: Optional[bool] = None,
+) -> IsraeliQueue:
+    """
+    Build the IsraeliQueue that results from replaying an arrival log.
+
+    The result is the same as calling ``put`` for every arrival whose group
+    is already waiting and ``enqueue`` for the others, in arrival order,
+    on an empty queue.
+
+    Args:
+        items: The payload of every arrival
+        groups: The group of every arrival
+        arrival_order: Optional sortable arrival keys, see ``israeli_order``
+        item_factory: Builds a queue item from a payload and a group
+        use_numpy: See ``israeli_order``
+
+    Raises:
+        ValueError: If the input sequences differ in length
+    """
+    if len(items) != len(groups):
+        raise ValueError("items and groups must have the same length")
+    order = israeli_order(groups, arrival_order, use_numpy)
+    if np is not None:
+        # Hand plain Python values to item_factory, not NumPy scalars
+        if isinstance(order, np.ndarray):
+            order = order.tolist()
+        if isinstance(items, np.ndarray):
+            items = items.tolist()
+        if isinstance(groups, np.ndarray):
+            groups = groups.tolist()
+    return IsraeliQueue(item_factory(items[index], groups[index]) for index in order)
@@ -0,0 +1,80 @@
+from collections.abc import Sequence
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+
+class QueueView(Sequence):
+    """
+    A live, read-only view of some of the items in a queue.
+
+    The view copies nothing: ``len`` asks the queue, iteration walks the
+    queue's own storage, and ``page`` (or a forward slice) reads only the
+    items it returns plus the ones it skips. It always reflects the
+    current queue, so like a dict view it must not be iterated while the
+    queue changes. Views compare equal to lists (and other views) with the
+    same items; use ``list(view)`` for a copy.
+
+    Args:
+        source: Returns the items the view shows, in queue order
+        length: Returns their number; defaults to ``len(source())``
+    """
+
+    __slots__ = ("_source", "_length")
+
+    def __init__(
+        self,
+        source: Callable[[], Any],
+        length: Optional[Callable[[], int]] = None,
+    ) -> None:
+        self._source = source
+        self._length = length
+
+    def __len__(self) -> int:
+        if self._length is not None:
+            return self._length()
+        return len(self._source())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._source())
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.start, index.stop, index.step
+            if (
+                (start is None or start >= 0)
+                and (stop is None or stop >= 0)
+                and (step is None or step > 0)
+            ):
+                return list(islice(self._source(), start, stop, step))
+            return list(self._source())[index]
+        source = self._source()
+        if hasattr(source, "__getitem__"):
+            return source[index]
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for item in islice(source, index, None):
+                return item
+        raise IndexError("view index out of range")
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Any]:
+        """
+        Return up to ``limit`` items, skipping the first ``offset``.
+
+        Raises:
+            ValueError: If offset or limit is negative
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset and limit must not be negative")
+        stop = None if limit is None else offset + limit
+        return list(islice(self._source(), offset, stop))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, QueueView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: bytes per queued item for Item vs. the compact variants.
+
+Also reports the cost of hashing one item, which queue membership checks
+pay on every put. Exits non-zero if a compact variant does not take fewer
+bytes than ``Item``.
+
+Usage:
+    python benchmarks/memory_item.py [--count N] [--groups G]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue import CompactItem, FrozenCompactItem, Item  # noqa: E402
+
+
+def bytes_per_item(factory, count, groups):
+    """Measure the traced allocation per instance built by factory."""
+    # Payloads and groups exist before measuring, so only the wrapper counts
+    payloads = list(range(count))
+    group_ids = [index % groups for index in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = [factory(payload, group) for payload, group in zip(payloads, group_ids)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Leave out the list holding the instances
+    allocated -= sys.getsizeof(items)
+    del items
+    return allocated / count
+
+
+def ns_per_hash(factory, count, groups):
+    """Time hash() over a sample of instances built by factory."""
+    items = [factory(index, index % groups) for index in range(min(count, 10_000))]
+    seconds = min(timeit.repeat(lambda: [hash(item) for item in items], number=5))
+    return seconds / (5 * len(items)) * 1e9
+
+
+def main():
+    """Measure every item class and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--groups", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{args.count:,} items across {args.groups:,} groups")
+    print(f"{'variant':<20} {'bytes/item':>10} {'ns/hash':>8}")
+    sizes = {}
+    for name, factory in [
+        ("Item", Item),
+        ("CompactItem", CompactItem),
+        ("FrozenCompactItem", FrozenCompactItem),
+    ]:
+        size = sizes[name] = bytes_per_item(factory, args.count, args.groups)
+        cost = ns_per_hash(factory, args.count, args.groups)
+        print(f"{name:<20} {size:>10.1f} {cost:>8.1f}")
+
+    larger = [name for name, size in sizes.items() if size >= sizes["Item"]]
+    larger.remove("Item")
+    if larger:
+        print(f"\nNot smaller than Item: {', '.join(larger)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
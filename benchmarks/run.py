@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Operation benchmarks for every queue operation, across queue sizes.
+
+Each operation is timed on queues of several sizes, group (or type) counts
+and group-size skews. Mutating operations use the hold model: every timed
+operation is paired with an untimed inverse (a dequeue after an enqueue,
+and so on) so the queue stays at the requested size.
+
+From the timings, the script fits the scaling exponent of every operation
+(the slope of log time against log size: about 0 for O(1), about 1 for
+O(n)). ``--save`` writes the results as a JSON baseline, and ``--check``
+fails when any exponent grew past the baseline by more than the tolerance.
+Comparing exponents instead of raw times keeps the check meaningful
+across machines.
+
+Usage:
+    python benchmarks/run.py --save benchmarks/baselines/default.json
+    python benchmarks/run.py --check benchmarks/baselines/default.json
+    python benchmarks/run.py --sizes 100 1000 10000 --budget 0.02 \
+        --check benchmarks/baselines/ci.json
+    python benchmarks/run.py --sizes 100 1000 1000000 --groups 10 1000
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue import (  # noqa: E402
+    DequeIsraeliQueueByType,
+    IsraeliQueue,
+    IsraeliQueueByType,
+    Item,
+    LinkedIsraeliQueue,
+)
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_GROUPS = [100]
+DEFAULT_SKEWS = ["uniform", "zipf"]
+BATCH = 100
+
+
+class Probe:
+    """A type that is never in a benchmark queue before it is measured."""
+
+
+def draw_groups(count: int, groups: int, skew: str, rng: random.Random) -> List[int]:
+    """Draw a group for each of count items."""
+    if skew == "uniform":
+        return [rng.randrange(groups) for _ in range(count)]
+    if skew == "zipf":
+        weights = [1 / (rank + 1) ** 1.2 for rank in range(groups)]
+        return rng.choices(range(groups), weights=weights, k=count)
+    raise ValueError(f"Unknown skew {skew!r}")
+
+
+def hold(
+    queue: Any,
+    op: Callable[[Any], Any],
+    undo: Callable[[Any, Any], Any],
+    budget: float,
+) -> float:
+    """Time op with an untimed undo after each call; return seconds per op."""
+    timer = time.perf_counter
+    total = 0.0
+    calls = 0
+    deadline = timer() + budget
+    while calls < 5 or (timer() < deadline and calls < 10_000):
+        started = timer()
+        result = op(queue)
+        total += timer() - started
+        undo(queue, result)
+        calls += 1
+    return total / calls
+
+
+def repeat(queue: Any, op: Callable[[Any], Any], budget: float) -> float:
+    """Time a read-only op; return seconds per op."""
+    timer = time.perf_counter
+    calls = 0
+    started = timer()
+    deadline = started + budget
+    while calls < 5 or (timer() < deadline and calls < 100_000):
+        op(queue)
+        calls += 1
+    return (timer() - started) / calls
+
+
+def item_queue_ops(queue_cls: type) -> Dict[str, Callable[..., float]]:
+    """Benchmarks for IsraeliQueue-like classes."""
+    fresh = itertools.count(-1, -1)
+
+    def joiner(queue: Any) -> Tuple[Item, Item]:
+        friend = queue.peek()
+        return Item(next(fresh), friend.group), friend
+
+    def dequeue_all(queue: Any, count: int) -> None:
+        queue.dequeue_many(count)
+
+    def expiring(queue: Any) -> None:
+        # BATCH items joining friends spread over the line, already expired
+        step = max(1, len(queue) // BATCH)
+        friends = [queue[position] for position in range(0, len(queue), step)]
+        for friend in friends[:BATCH]:
+            queue.enqueue(Item(next(fresh), friend.group), friend, expires_at=0)
+
+    def discard(queue: Any, budget: float) -> float:
+        # Time removing BATCH expired items, whatever the length of the line
+        expiring(queue)
+        return hold(
+            queue, lambda q: q.discard_expired(0), lambda q, _: expiring(q), budget
+        )
+
+    return {
+        "enqueue": lambda q, b: hold(
+            q, lambda q: q.enqueue(Item(next(fresh), 0)), lambda q, _: q.dequeue(), b
+        ),
+        "put": lambda q, b: hold(
+            q, lambda q: q.put(*joiner(q)), lambda q, _: q.dequeue(), b
+        ),
+        "dequeue": lambda q, b: hold(
+            q, lambda q: q.dequeue(), lambda q, item: q.enqueue(item), b
+        ),
+        "enqueue_many": lambda q, b: hold(
+            q,
+            lambda q: q.enqueue_many([joiner(q) for _ in range(BATCH)]),
+            lambda q, _: dequeue_all(q, BATCH),
+            b,
+        ),
+        "dequeue_many": lambda q, b: hold(
+            q,
+            lambda q: q.dequeue_many(BATCH),
+            lambda q, items: q.enqueue_many((item, None) for item in items),
+            b,
+        ),
+        "cancel": lambda q, b: hold(
+            q, lambda q: q.cancel(q[len(q) // 2]), lambda q, item: q.enqueue(item), b
+        ),
+        "discard_expired": discard,
+        "peek": lambda q, b: repeat(q, lambda q: q.peek(), b),
+        "size": lambda q, b: repeat(q, lambda q: q.size(), b),
+        "is_empty": lambda q, b: repeat(q, lambda q: q.is_empty(), b),
+        "get_groups": lambda q, b: repeat(q, lambda q: q.get_groups(), b),
+        "group_size": lambda q, b: repeat(q, lambda q: q.group_size(0), b),
+        "items_in_group": lambda q, b: repeat(
+            q, lambda q: list(q.items_in_group(0)), b
+        ),
+    }
+
+
+def type_queue_ops(queue_cls: type) -> Dict[str, Callable[..., float]]:
+    """Benchmarks for IsraeliQueueByType-like classes."""
+    return {
+        "enqueue": lambda q, b: hold(
+            q, lambda q: q.enqueue(Probe()), lambda q, _: q.dequeue(), b
+        ),
+        "dequeue": lambda q, b: hold(
+            q, lambda q: q.dequeue(), lambda q, item: q.enqueue(item), b
+        ),
+        "enqueue_many": lambda q, b: hold(
+            q,
+            lambda q: q.enqueue_many([Probe() for _ in range(BATCH)]),
+            lambda q, _: q.dequeue_many(BATCH),
+            b,
+        ),
+        "dequeue_many": lambda q, b: hold(
+            q,
+            lambda q: q.dequeue_many(BATCH),
+            lambda q, items: q.enqueue_many(items),
+            b,
+        ),
+        "peek": lambda q, b: repeat(q, lambda q: q.peek(), b),
+        "size": lambda q, b: repeat(q, lambda q: q.size(), b),
+        "is_empty": lambda q, b: repeat(q, lambda q: q.is_empty(), b),
+        "get_types": lambda q, b: repeat(q, lambda q: q.get_types(), b),
+        "type_size": lambda q, b: repeat(q, lambda q: q.type_size(int), b),
+        "items_of_type": lambda q, b: repeat(
+            q, lambda q: list(q.items_of_type(int)), b
+        ),
+    }
+
+
+def build_item_queue(queue_cls: type, groups: List[int]) -> Any:
+    """Build a queue of Items, one per drawn group."""
+    return queue_cls(Item(index, group) for index, group in enumerate(groups))
+
+
+def build_type_queue(queue_cls: type, groups: List[int]) -> Any:
+    """Build a queue by type, mapping every drawn group to a type."""
+    # One type per group; group 0 is int so items_of_type(int) has work to do
+    types: Dict[int, type] = {0: int}
+    queue = queue_cls()
+    for index, group in enumerate(groups):
+        item_type = types.get(group)
+        if item_type is None:
+            item_type = types[group] = type(f"T{group}", (), {})
+        queue.enqueue(index if item_type is int else item_type())
+    return queue
+
+
+BACKENDS: Dict[str, Tuple[type, Callable[..., Any], Callable[[type], Dict]]] = {
+    "IsraeliQueue": (IsraeliQueue, build_item_queue, item_queue_ops),
+    "LinkedIsraeliQueue": (LinkedIsraeliQueue, build_item_queue, item_queue_ops),
+    "IsraeliQueueByType": (IsraeliQueueByType, build_type_queue, type_queue_ops),
+    "DequeIsraeliQueueByType": (
+        DequeIsraeliQueueByType,
+        build_type_queue,
+        type_queue_ops,
+    ),
+}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every selected benchmark and return the JSON-ready results."""
+    rng = random.Random(args.seed)
+    results = []
+    for name in args.backends:
+        queue_cls, build, ops = BACKENDS[name]
+        for groups, skew, size in itertools.product(
+            args.groups, args.skews, args.sizes
+        ):
+            drawn = draw_groups(size, groups, skew, rng)
+            for op_name, bench in ops(queue_cls).items():
+                if args.ops and op_name not in args.ops:
+                    continue
+                queue = build(queue_cls, drawn)
+                seconds = bench(queue, args.budget)
+                results.append(
+                    {
+                        "backend": name,
+                        "op": op_name,
+                        "groups": groups,
+                        "skew": skew,
+                        "size": size,
+                        "seconds_per_op": seconds,
+                    }
+                )
+                if not args.quiet:
+                    print(
+                        f"{name:<24} {op_name:<15} groups={groups:<6} "
+                        f"{skew:<8} n={size:<9} {seconds * 1e6:12.3f} us/op"
+                    )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "sizes": args.sizes,
+        },
+        "results": results,
+        "exponents": exponents(results),
+    }
+
+
+def exponents(results: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Fit log(time) = k * log(size) + c for every series; return the k's."""
+    series: Dict[str, List[Tuple[float, float]]] = {}
+    for row in results:
+        key = f"{row['backend']}.{row['op']}[groups={row['groups']},{row['skew']}]"
+        point = (math.log(row["size"]), math.log(max(row["seconds_per_op"], 1e-12)))
+        series.setdefault(key, []).append(point)
+
+    fitted = {}
+    for key, points in series.items():
+        if len(points) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        spread = sum((x - mean_x) ** 2 for x, _ in points)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+        fitted[key] = round(slope, 3)
+    return fitted
+
+
+def check(
+    current: Dict[str, float], baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    """Return a message for every series that scales worse than its baseline."""
+    failures = []
+    for key, expected in sorted(baseline.items()):
+        actual = current.get(key)
+        if actual is not None and actual > expected + tolerance:
+            failures.append(f"{key}: exponent {actual:.2f} (baseline {expected:.2f})")
+    return failures
+
+
+def main() -> int:
+    """Parse the command line, run the benchmarks and report; return the exit code."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--groups", type=int, nargs="+", default=DEFAULT_GROUPS)
+    parser.add_argument(
+        "--skews", nargs="+", default=DEFAULT_SKEWS, choices=["uniform", "zipf"]
+    )
+    parser.add_argument(
+        "--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS)
+    )
+    parser.add_argument("--ops", nargs="+", help="only run these operations")
+    parser.add_argument(
+        "--budget", type=float, default=0.05, help="seconds to spend per measurement"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--check", help="compare exponents against this baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed growth of a scaling exponent before --check fails",
+    )
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    report = run(args)
+
+    if args.save:
+        with open(args.save, "w") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+    if args.check:
+        with open(args.check) as handle:
+            baseline = json.load(handle)
+        if baseline["meta"]["sizes"] != args.sizes:
+            print(
+                f"\nWarning: baseline sizes {baseline['meta']['sizes']} differ from "
+                f"{args.sizes}; exponents may not be comparable"
+            )
+        failures = check(report["exponents"], baseline["exponents"], args.tolerance)
+        if failures:
+            print("\nScaling regressions:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print(f"\nNo scaling regressions against {args.check}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -44,8 +44,7 @@ def demo_israeli_queue():
 
     # Process the queue
     print("\nProcessing queue (FIFO order):")
-    while not queue.is_empty():
-        person = queue.dequeue()
+    for person in queue.drain():
         print(f"  Serving: {person}")
 
 
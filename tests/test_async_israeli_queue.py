@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item
+from IsraeliQueue.aio import AsyncIsraeliQueue
+
+
+class TestAsyncIsraeliQueue:
+    """Test cases for the AsyncIsraeliQueue class."""
+
+    def test_put_and_get(self):
+        """Test that friends join each other in line."""
+
+        async def scenario():
+            q = AsyncIsraeliQueue()
+            alice = Item("Alice", 1)
+            charlie = Item("Charlie", 2)
+            bob = Item("Bob", 1)
+
+            await q.put(alice)
+            await q.put(charlie)
+            await q.put(bob, alice)
+
+            assert q.qsize() == 3
+            assert q.get_groups() == [1, 2]
+            return [await q.get() for _ in range(3)]
+
+        result = asyncio.run(scenario())
+        assert [item.item for item in result] == ["Alice", "Bob", "Charlie"]
+
+    def test_nowait_errors(self):
+        """Test QueueEmpty, QueueFull and a missing friend."""
+
+        async def scenario():
+            q = AsyncIsraeliQueue(maxsize=1)
+            with pytest.raises(asyncio.QueueEmpty):
+                q.get_nowait()
+            with pytest.raises(ValueError, match="Friend not found in queue"):
+                q.put_nowait(Item("Bob", 1), Item("Alice", 1))
+            q.put_nowait(Item("Alice", 1))
+            assert q.full()
+            with pytest.raises(asyncio.QueueFull):
+                q.put_nowait(Item("Bob", 1))
+
+        asyncio.run(scenario())
+
+    def test_waiting_consumer_is_woken(self):
+        """Test that a get waiting on an empty queue receives the next put."""
+
+        async def scenario():
+            q = AsyncIsraeliQueue()
+            getter = asyncio.ensure_future(q.get())
+            await asyncio.sleep(0)
+            assert not getter.done()
+
+            q.put_nowait(Item("Alice", 1))
+            return await asyncio.wait_for(getter, timeout=1)
+
+        assert asyncio.run(scenario()) == Item("Alice", 1)
+
+    def test_maxsize_backpressure(self):
+        """Test that put waits until a get frees a slot."""
+
+        async def scenario():
+            q = AsyncIsraeliQueue(maxsize=1)
+            await q.put(Item("Alice", 1))
+            putter = asyncio.ensure_future(q.put(Item("Bob", 2)))
+            await asyncio.sleep(0)
+            assert not putter.done()
+
+            assert await q.get() == Item("Alice", 1)
+            await asyncio.wait_for(putter, timeout=1)
+            return q.get_nowait()
+
+        assert asyncio.run(scenario()) == Item("Bob", 2)
+
+    def test_failed_put_passes_on_wakeup(self):
+        """Test that a woken put whose friend is gone wakes the next one."""
+
+        async def scenario():
+            q = AsyncIsraeliQueue(maxsize=1)
+            await q.put(Item("Alice", 1))
+            failing = asyncio.ensure_future(q.put(Item("Bob", 1), Item("Zoe", 1)))
+            putter = asyncio.ensure_future(q.put(Item("Charlie", 2)))
+            await asyncio.sleep(0)
+
+            assert await q.get() == Item("Alice", 1)
+            with pytest.raises(ValueError, match="Friend not found in queue"):
+                await failing
+            await asyncio.wait_for(putter, timeout=1)
+            return q.get_nowait()
+
+        assert asyncio.run(scenario()) == Item("Charlie", 2)
+
+    def test_cancelled_getter_is_skipped(self):
+        """Test that a cancelled get does not swallow the next item."""
+
+        async def scenario():
+            q = AsyncIsraeliQueue()
+            cancelled = asyncio.ensure_future(q.get())
+            waiting = asyncio.ensure_future(q.get())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+
+            q.put_nowait(Item("Alice", 1))
+            return await asyncio.wait_for(waiting, timeout=1)
+
+        assert asyncio.run(scenario()) == Item("Alice", 1)
+
+    def test_task_done_and_join(self):
+        """Test join waits until every item is marked done."""
+
+        async def scenario():
+            q = AsyncIsraeliQueue()
+            for i in range(10):
+                await q.put(Item(i, i % 2))
+
+            async def worker():
+                while not q.empty():
+                    await q.get()
+                    await asyncio.sleep(0)
+                    q.task_done()
+
+            workers = [asyncio.ensure_future(worker()) for _ in range(3)]
+            await asyncio.wait_for(q.join(), timeout=1)
+            await asyncio.gather(*workers)
+            with pytest.raises(ValueError, match="task_done"):
+                q.task_done()
+
+        asyncio.run(scenario())
@@ -0,0 +1,127 @@
+import pytest
+import sys
+import os
+from queue import Full
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item
+from IsraeliQueue.bounded import BoundedIsraeliQueue
+
+
+class TestBoundedIsraeliQueue:
+    """Test cases for the BoundedIsraeliQueue class."""
+
+    def setup_method(self):
+        """Set up a few items in two groups."""
+        self.alice = Item("Alice", 1)
+        self.bob = Item("Bob", 1)
+        self.charlie = Item("Charlie", 2)
+        self.dropped = []
+
+    def test_unbounded_by_default(self):
+        """Test that a queue without limits behaves like IsraeliQueue."""
+        queue = BoundedIsraeliQueue([self.alice, self.charlie])
+        queue.enqueue(self.bob, self.alice)
+
+        assert queue == [self.alice, self.bob, self.charlie]
+        assert not queue.full()
+
+    def test_maxsize_reject(self):
+        """Test that a full queue raises and stays unchanged."""
+        queue = BoundedIsraeliQueue([self.alice, self.charlie], maxsize=2)
+
+        assert queue.full()
+        with pytest.raises(Full):
+            queue.enqueue(self.bob, self.alice)
+        assert queue == [self.alice, self.charlie]
+
+    def test_maxsize_drop_policies(self):
+        """Test evicting the front of the line or dropping the arrival."""
+        oldest = BoundedIsraeliQueue(
+            [self.alice, self.charlie],
+            maxsize=2,
+            overflow="drop-oldest",
+            on_drop=self.dropped.append,
+        )
+        oldest.enqueue(Item("Dana", 3))
+        assert oldest == [self.charlie, Item("Dana", 3)]
+
+        newest = BoundedIsraeliQueue(
+            [self.alice, self.charlie],
+            maxsize=2,
+            overflow="drop-newest",
+            on_drop=self.dropped.append,
+        )
+        newest.enqueue(self.bob, self.alice)
+        newest.enqueue(Item("Dana", 3), expires_at=1)
+        assert newest == [self.alice, self.charlie]
+        assert newest.discard_expired(1) == []
+        assert self.dropped == [self.alice, self.bob, Item("Dana", 3)]
+
+    def test_group_quota_reject(self):
+        """Test that a full group cannot grow but others can."""
+        queue = BoundedIsraeliQueue([self.alice, self.charlie], max_group_size=1)
+
+        with pytest.raises(Full, match="Group 1"):
+            queue.enqueue(self.bob, self.alice)
+        queue.enqueue(Item("Dana", 3))
+        assert queue.group_size(1) == 1
+
+    def test_group_quota_drop_policies(self):
+        """Test evicting the first member of a full group or the arrival."""
+        queue = BoundedIsraeliQueue(
+            max_group_size=2, group_overflow="drop-oldest", on_drop=self.dropped.append
+        )
+        queue.enqueue_many(
+            [(self.alice, None), (self.charlie, None), (self.bob, self.alice)]
+        )
+        # Alice is evicted, and Dana still joins Bob
+        queue.enqueue(Item("Dana", 1), self.alice)
+        assert queue == [self.bob, Item("Dana", 1), self.charlie]
+
+        queue.group_overflow = "drop-newest"
+        queue.enqueue(Item("Eve", 1), self.bob)
+        queue.enqueue(Item("Fay", 2))
+        assert queue == [self.bob, Item("Dana", 1), self.charlie, Item("Fay", 2)]
+        assert self.dropped == [self.alice, Item("Eve", 1)]
+
+    def test_group_quota_new_block(self):
+        """Test that members over the quota go to the back of the line."""
+        queue = BoundedIsraeliQueue(
+            [self.alice, self.charlie], max_group_size=1, group_overflow="new-block"
+        )
+        queue.enqueue(self.bob, self.alice)
+        queue.enqueue(Item("Dana", 3))
+        queue.enqueue(Item("Eve", 1), self.bob)
+
+        assert queue == [
+            self.alice,
+            self.charlie,
+            self.bob,
+            Item("Dana", 3),
+            Item("Eve", 1),
+        ]
+        assert queue.group_size(1) == 3
+
+    def test_group_eviction_frees_a_slot(self):
+        """Test that a group eviction makes room in a full queue."""
+        queue = BoundedIsraeliQueue(
+            [self.alice, self.bob, self.charlie],
+            maxsize=3,
+            max_group_size=2,
+            group_overflow="drop-oldest",
+        )
+        queue.enqueue(Item("Dana", 1), self.bob)
+
+        assert queue == [self.bob, Item("Dana", 1), self.charlie]
+
+    def test_invalid_policies(self):
+        """Test that unknown policies and quotas are refused."""
+        with pytest.raises(ValueError):
+            BoundedIsraeliQueue(overflow="new-block")
+        with pytest.raises(ValueError):
+            BoundedIsraeliQueue(group_overflow="drop-random")
+        with pytest.raises(ValueError):
+            BoundedIsraeliQueue(max_group_size=0)
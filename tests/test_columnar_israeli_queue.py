@@ -0,0 +1,130 @@
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue
+from IsraeliQueue.columnar import ColumnarIsraeliQueue
+from IsraeliQueue.views import QueueView
+
+
+class TestColumnarIsraeliQueue:
+    """Test cases for the ColumnarIsraeliQueue class."""
+
+    def test_empty_queue_creation(self):
+        """Test creating an empty queue."""
+        queue = ColumnarIsraeliQueue()
+        assert queue.is_empty()
+        assert queue.size() == 0
+        assert queue.nbytes() == 0
+
+    def test_put_with_friend(self):
+        """Test joining behind the furthest friend."""
+        queue = ColumnarIsraeliQueue([Item(1, 10), Item(2, 20), Item(3, 10)])
+
+        queue.put(Item(4, 10), Item(1, 10))
+        queue.put(Item(5, 20), Item(3, 10))
+
+        assert list(queue) == [
+            Item(1, 10),
+            Item(2, 20),
+            Item(5, 20),
+            Item(3, 10),
+            Item(4, 10),
+        ]
+
+    def test_put_friend_not_in_queue(self):
+        """Test error when friend is not in queue."""
+        queue = ColumnarIsraeliQueue([Item(1, 10)])
+
+        with pytest.raises(ValueError, match="Friend not found in queue"):
+            queue.put(Item(2, 10), Item(1, 20))
+        assert Item(1, 10) in queue
+        assert Item(1, 20) not in queue
+        assert "x" not in queue
+
+    def test_dequeue_and_peek(self):
+        """Test serving the front and errors on an empty queue."""
+        queue = ColumnarIsraeliQueue([Item(1, 10), Item(2, 20)])
+
+        assert queue.peek() == Item(1, 10)
+        assert queue.dequeue() == Item(1, 10)
+        assert queue.dequeue() == Item(2, 20)
+        with pytest.raises(IndexError, match="Cannot dequeue from empty queue"):
+            queue.dequeue()
+        with pytest.raises(IndexError, match="Cannot peek empty queue"):
+            queue.peek()
+
+    def test_slots_are_recycled(self):
+        """Test that dequeued slots are reused instead of growing the arrays."""
+        queue = ColumnarIsraeliQueue()
+        for i in range(100):
+            queue.enqueue(Item(i, i % 3))
+        used = queue.nbytes()
+
+        for i in range(1000):
+            queue.dequeue()
+            queue.enqueue(Item(100 + i, i % 3))
+
+        assert queue.nbytes() == used
+        assert queue.size() == 100
+
+    def test_items_in_group_is_a_live_view(self):
+        """Test that a group view follows the queue and can be read again."""
+        queue = ColumnarIsraeliQueue([Item(1, 10), Item(2, 20), Item(3, 10)])
+
+        members = queue.items_in_group(10)
+        assert isinstance(members, QueueView)
+        assert members == [Item(1, 10), Item(3, 10)]
+        assert len(members) == 2
+        queue.dequeue()
+        queue.put(Item(4, 10), Item(3, 10))
+        assert members == [Item(3, 10), Item(4, 10)]
+        assert members[-1] == Item(4, 10)
+        assert queue.items_in_group(30) == []
+
+    def test_rejected_item_leaves_columns_intact(self):
+        """Test that a non-integer or oversized entry changes nothing."""
+        queue = ColumnarIsraeliQueue([Item(1, 1)])
+        with pytest.raises(TypeError):
+            queue.append(Item(2, "two"))
+        with pytest.raises(TypeError):
+            queue.put(Item(1 << 64, 1), Item(1, 1))
+        assert Item(2, "two") not in queue
+
+        queue.append(Item(2, 2))
+        queue.put(Item(3, 1), Item(1, 1))
+        assert list(queue) == [Item(1, 1), Item(3, 1), Item(2, 2)]
+
+    def test_item_factory(self):
+        """Test rebuilding entries with a custom factory."""
+        queue = ColumnarIsraeliQueue([Item(1, 10)], item_factory=lambda i, g: (i, g))
+        assert queue.peek() == (1, 10)
+
+    def test_matches_list_backend(self):
+        """Test a random mix of operations against IsraeliQueue."""
+        rng = random.Random(3)
+        reference = IsraeliQueue()
+        queue = ColumnarIsraeliQueue()
+
+        for step in range(2000):
+            action = rng.random()
+            if action < 0.35 and reference:
+                friend = rng.choice(reference)
+                item = Item(step, rng.randrange(8))
+                reference.put(item, friend)
+                queue.put(item, friend)
+            elif action < 0.7:
+                item = Item(step, rng.randrange(8))
+                reference.enqueue(item)
+                queue.enqueue(item)
+            elif reference:
+                assert queue.dequeue() == reference.dequeue()
+
+        assert list(queue) == list(reference)
+        assert sorted(queue.get_groups()) == sorted(reference.get_groups())
+        for group in range(8):
+            assert list(queue.items_in_group(group)) == reference.items_in_group(group)
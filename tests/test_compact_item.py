@@ -0,0 +1,151 @@
+import copy
+import pickle
+import pytest
+import sys
+import os
+from dataclasses import FrozenInstanceError
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue
+from IsraeliQueue.compact import CompactItem, FrozenCompactItem, GroupTable, groups
+
+
+class TestGroupTable:
+    """Test cases for the GroupTable class."""
+
+    def test_intern_is_stable(self):
+        """Test that equal groups intern to the same object."""
+        table = GroupTable()
+        first = table.intern(10**12)
+        table.intern("other")
+
+        assert table.intern(int("1" + "0" * 12)) is first
+        assert len(table) == 2
+        assert "other" in table
+
+    def test_release_forgets_unused_groups(self):
+        """Test that a group is dropped after its last holder releases it."""
+        table = GroupTable()
+        table.intern("shared")
+        table.intern("shared")
+
+        table.release("shared")
+        assert "shared" in table
+        table.release("shared")
+        assert "shared" not in table
+        assert len(table) == 0
+
+
+class TestCompactItem:
+    """Test cases for the CompactItem class."""
+
+    def test_no_instance_dict(self):
+        """Test that compact items are slotted."""
+        item = CompactItem("Alice", 1)
+        assert not hasattr(item, "__dict__")
+        assert item.item == "Alice"
+        assert item.group == 1
+
+    def test_equality_and_hash_match_item(self):
+        """Test that compact and regular items are interchangeable."""
+        compact = CompactItem("Alice", 1)
+
+        assert compact == CompactItem("Alice", 1)
+        assert compact == Item("Alice", 1)
+        assert Item("Alice", 1) == compact
+        assert compact != CompactItem("Alice", 2)
+        assert compact != "Alice"
+        assert hash(compact) == hash(Item("Alice", 1))
+        assert len({compact, Item("Alice", 1)}) == 1
+
+    def test_same_group_across_kinds(self):
+        """Test group comparison between compact and regular items."""
+        alice = CompactItem("Alice", 10**12)
+        bob = CompactItem("Bob", int("1" + "0" * 12))
+
+        assert alice.group is bob.group
+        assert alice.same_group(bob)
+        assert alice.same_group(Item("Eve", 10**12))
+        assert Item("Eve", 10**12).same_group(alice)
+        assert not Item("Eve", 3).same_group(alice)
+        assert not alice.same_group(CompactItem("Eve", 3))
+        assert not Item("Eve", 3).same_group("Eve")
+
+    def test_groups_are_released(self):
+        """Test that the shared table forgets a group once its items are gone."""
+        group = ("test_groups_are_released", 1)
+        items = [CompactItem(index, group) for index in range(3)]
+        items[0].group = "elsewhere"
+        del items[1].group
+        assert group in groups
+
+        del items
+        assert group not in groups
+        assert "elsewhere" not in groups
+
+    def test_assignment_updates_hash_and_group(self):
+        """Test that reassigning fields keeps hash and group id in sync."""
+        item = CompactItem("Alice", 1)
+        item.group = 2
+        item.item = "Bob"
+
+        assert item == Item("Bob", 2)
+        assert hash(item) == hash(Item("Bob", 2))
+        assert item.same_group(CompactItem("Eve", 2))
+
+    def test_unhashable_payload(self):
+        """Test that unhashable payloads behave like they do in Item."""
+        item = CompactItem([1, 2], 1)
+
+        assert item == CompactItem([1, 2], 1)
+        with pytest.raises(TypeError):
+            hash(item)
+
+    def test_frozen_variant(self):
+        """Test that frozen items reject assignment."""
+        item = FrozenCompactItem("Alice", 1)
+
+        with pytest.raises(FrozenInstanceError):
+            item.group = 2
+        with pytest.raises(FrozenInstanceError):
+            del item.item
+        assert item == CompactItem("Alice", 1)
+
+    def test_pickle_and_copy(self):
+        """Test that compact items survive pickling and copying."""
+        item = FrozenCompactItem("Alice", 1)
+
+        restored = pickle.loads(pickle.dumps(item))
+        assert restored == item
+        assert type(restored) is FrozenCompactItem
+        assert copy.deepcopy(item) == item
+
+    def test_repr_and_str(self):
+        """Test string representations."""
+        item = CompactItem("Alice", 1)
+        assert repr(item) == "CompactItem(item='Alice', group=1)"
+        assert str(item) == "CompactItem(Alice, group=1)"
+
+    def test_in_israeli_queue(self):
+        """Test compact items joining friends in an IsraeliQueue."""
+        queue = IsraeliQueue()
+        alice = CompactItem("Alice", 1)
+        charlie = CompactItem("Charlie", 2)
+        bob = CompactItem("Bob", 1)
+
+        queue.extend([alice, charlie])
+        queue.put(bob, Item("Alice", 1))
+
+        assert queue == [alice, bob, charlie]
+
+    def test_mixed_with_items_in_queue(self):
+        """Test a compact item joining a regular friend, and the reverse."""
+        alice = Item("Alice", 1)
+        queue = IsraeliQueue([alice, Item("Bob", 2)])
+
+        queue.put(CompactItem("Charlie", 1), alice)
+        queue.put(Item("Dave", 1), CompactItem("Charlie", 1))
+
+        assert [item.item for item in queue] == ["Alice", "Charlie", "Dave", "Bob"]
@@ -0,0 +1,182 @@
+import pytest
+import queue
+import threading
+import time
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item
+from IsraeliQueue.threaded import ConcurrentIsraeliQueue
+
+
+class TestConcurrentIsraeliQueue:
+    """Test cases for the ConcurrentIsraeliQueue class."""
+
+    def test_put_and_get(self):
+        """Test that friends join each other in line."""
+        q = ConcurrentIsraeliQueue()
+        alice = Item("Alice", 1)
+        charlie = Item("Charlie", 2)
+        bob = Item("Bob", 1)
+
+        q.put(alice)
+        q.put(charlie)
+        q.put(bob, alice)
+
+        assert q.qsize() == 3
+        assert q.group_size(1) == 2
+        assert [q.get(), q.get(), q.get()] == [alice, bob, charlie]
+        assert q.empty()
+
+    def test_positions(self):
+        """Test position lookups through the thread-safe wrapper."""
+        q = ConcurrentIsraeliQueue()
+        alice = Item("Alice", 1)
+        q.put(alice)
+        q.put(Item("Charlie", 2))
+        q.put(Item("Bob", 1), alice)
+
+        assert q.position_of(Item("Charlie", 2)) == 2
+        assert q.group_span(1) == (0, 1)
+        assert q.estimated_wait(Item("Charlie", 2), service_rate=2) == 1.0
+
+    def test_put_friend_not_in_queue(self):
+        """Test error when friend is not in queue."""
+        q = ConcurrentIsraeliQueue()
+
+        with pytest.raises(ValueError, match="Friend not found in queue"):
+            q.put(Item("Bob", 1), Item("Alice", 1))
+        assert q.unfinished_tasks == 0
+
+    def test_get_nowait_and_timeout_on_empty(self):
+        """Test non-blocking and timed gets on an empty queue."""
+        q = ConcurrentIsraeliQueue()
+
+        with pytest.raises(queue.Empty):
+            q.get_nowait()
+        started = time.monotonic()
+        with pytest.raises(queue.Empty):
+            q.get(timeout=0.05)
+        assert time.monotonic() - started >= 0.04
+
+    def test_maxsize_backpressure(self):
+        """Test that a full queue rejects or delays producers."""
+        q = ConcurrentIsraeliQueue(maxsize=1)
+        q.put(Item("Alice", 1))
+
+        assert q.full()
+        with pytest.raises(queue.Full):
+            q.put_nowait(Item("Bob", 2))
+        with pytest.raises(queue.Full):
+            q.put(Item("Bob", 2), timeout=0.01)
+
+    def test_blocked_producer_resumes(self):
+        """Test that a get frees a slot for a waiting producer."""
+        q = ConcurrentIsraeliQueue(maxsize=1)
+        q.put(Item("Alice", 1))
+        producer = threading.Thread(target=q.put, args=(Item("Bob", 2),))
+        producer.start()
+
+        time.sleep(0.02)
+        assert producer.is_alive()
+        assert q.get() == Item("Alice", 1)
+        producer.join(timeout=1)
+        assert not producer.is_alive()
+        assert q.get_nowait() == Item("Bob", 2)
+
+    def test_failed_put_passes_on_wakeup(self):
+        """Test that a woken producer whose friend is gone wakes the next one."""
+        q = ConcurrentIsraeliQueue(maxsize=1)
+        q.put(Item("Alice", 1))
+        errors = []
+
+        def put_with_missing_friend():
+            try:
+                q.put(Item("Bob", 1), Item("Zoe", 1))
+            except ValueError as error:
+                errors.append(error)
+
+        # Condition waiters are woken in order, so the failing put goes first
+        failing = threading.Thread(target=put_with_missing_friend, daemon=True)
+        failing.start()
+        time.sleep(0.02)
+        producer = threading.Thread(
+            target=q.put, args=(Item("Charlie", 2),), daemon=True
+        )
+        producer.start()
+        time.sleep(0.02)
+
+        assert q.get() == Item("Alice", 1)
+        failing.join(timeout=1)
+        producer.join(timeout=1)
+        assert len(errors) == 1
+        assert not producer.is_alive()
+        assert q.get_nowait() == Item("Charlie", 2)
+
+    def test_blocked_consumer_wakes(self):
+        """Test that a waiting consumer receives the next item."""
+        q = ConcurrentIsraeliQueue()
+        received = []
+        consumer = threading.Thread(target=lambda: received.append(q.get()))
+        consumer.start()
+
+        time.sleep(0.02)
+        q.put(Item("Alice", 1))
+        consumer.join(timeout=1)
+        assert received == [Item("Alice", 1)]
+
+    def test_task_done_and_join(self):
+        """Test join waits until every item is marked done."""
+        q = ConcurrentIsraeliQueue()
+        for i in range(20):
+            q.put(Item(i, i % 3))
+
+        def worker():
+            while True:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    return
+                q.task_done()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        q.join()
+        for thread in threads:
+            thread.join()
+
+        assert q.unfinished_tasks == 0
+        with pytest.raises(ValueError, match="task_done"):
+            q.task_done()
+
+    def test_many_producers_and_consumers(self):
+        """Test that no item is lost or duplicated under contention."""
+        q = ConcurrentIsraeliQueue(maxsize=8)
+        produced = [Item(i, i % 5) for i in range(400)]
+        consumed = []
+        lock = threading.Lock()
+
+        def producer(items):
+            for item in items:
+                q.put(item)
+
+        def consumer(count):
+            for _ in range(count):
+                item = q.get(timeout=5)
+                with lock:
+                    consumed.append(item)
+
+        threads = [
+            threading.Thread(target=producer, args=(produced[i::4],)) for i in range(4)
+        ] + [threading.Thread(target=consumer, args=(100,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert sorted(item.item for item in consumed) == list(range(400))
+        assert q.empty()
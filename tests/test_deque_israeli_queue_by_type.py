@@ -0,0 +1,128 @@
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.typed import DequeIsraeliQueueByType
+
+
+class Base:
+    """A base class, to check that subclasses get their own subqueue."""
+
+
+class Child(Base):
+    """A subclass of Base."""
+
+
+class TestDequeIsraeliQueueByType:
+    """Test cases for the DequeIsraeliQueueByType class."""
+
+    def test_empty_queue_creation(self):
+        """Test creating an empty type queue."""
+        queue = DequeIsraeliQueueByType()
+        assert queue.is_empty()
+        assert queue.size() == 0
+        assert len(queue) == 0
+
+    def test_enqueue_multiple_types(self):
+        """Test enqueuing items of different types into lanes."""
+        queue = DequeIsraeliQueueByType()
+        for item in ["hello", 42, "world", 100]:
+            queue.enqueue(item)
+
+        assert queue.size() == 4
+        assert queue.get_types() == [str, int]
+        assert queue.items_of_type(str) == ["hello", "world"]
+        assert queue.items_of_type(int) == [42, 100]
+        assert queue.items_of_type(float) == []
+
+    def test_dequeue_until_empty(self):
+        """Test that lanes are served in order of creation."""
+        queue = DequeIsraeliQueueByType()
+        for item in ["a", 1, "b", 2, "c"]:
+            queue.enqueue(item)
+
+        dequeued = []
+        while not queue.is_empty():
+            dequeued.append(queue.dequeue())
+
+        assert dequeued == ["a", "b", "c", 1, 2]
+        assert queue.size() == 0
+
+    def test_emptied_lane_reopens_at_back(self):
+        """Test that a type whose lane emptied starts a new lane at the back."""
+        queue = DequeIsraeliQueueByType()
+        queue.enqueue("a")
+        queue.enqueue(1)
+        queue.dequeue()
+        queue.enqueue("b")
+
+        assert queue.get_types() == [int, str]
+        assert list(queue) == [1, "b"]
+
+    def test_peek(self):
+        """Test peeking at front item without removing."""
+        queue = DequeIsraeliQueueByType()
+        queue.enqueue("first")
+        queue.enqueue(42)
+
+        assert queue.peek() == "first"
+        assert queue.size() == 2
+
+    def test_empty_queue_errors(self):
+        """Test dequeue and peek on an empty queue raise errors."""
+        queue = DequeIsraeliQueueByType()
+
+        with pytest.raises(IndexError, match="Cannot dequeue from empty queue"):
+            queue.dequeue()
+        with pytest.raises(IndexError, match="Cannot peek empty queue"):
+            queue.peek()
+
+    def test_exact_type_policy(self):
+        """Test that bool and subclasses get their own lanes by default."""
+        queue = DequeIsraeliQueueByType()
+        queue.enqueue(1)
+        queue.enqueue(True)
+        queue.enqueue(Base())
+        queue.enqueue(Child())
+
+        assert queue.get_types() == [int, bool, Base, Child]
+        assert queue.items_of_type(int) == [1]
+
+    def test_match_subclasses_policy(self):
+        """Test that subclasses join the nearest existing ancestor lane."""
+        queue = DequeIsraeliQueueByType(match_subclasses=True)
+        queue.enqueue(1)
+        queue.enqueue(True)
+        assert queue.get_types() == [int]
+        assert queue.items_of_type(int) == [1, True]
+
+    def test_match_subclasses_is_order_independent(self):
+        """Test that a base lane created later does not capture subclasses."""
+        queue = DequeIsraeliQueueByType(match_subclasses=True)
+        child = Child()
+        queue.enqueue(child)
+        base = Base()
+        queue.enqueue(base)
+        queue.enqueue(Child())
+
+        assert queue.get_types() == [Child, Base]
+        assert queue.items_of_type(Base) == [base]
+
+    def test_batch_operations(self):
+        """Test enqueue_many and dequeue_many across lanes."""
+        queue = DequeIsraeliQueueByType()
+        queue.enqueue_many(["a", 1, "b", 2])
+
+        assert queue.dequeue_many(3) == ["a", "b", 1]
+        assert queue.dequeue_many(3) == [2]
+        assert queue.is_empty()
+
+    def test_repr(self):
+        """Test the lane-by-lane representation."""
+        queue = DequeIsraeliQueueByType()
+        queue.enqueue("a")
+        queue.enqueue(1)
+        assert repr(queue) == "DequeIsraeliQueueByType([['a'], [1]])"
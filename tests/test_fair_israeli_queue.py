@@ -0,0 +1,150 @@
+import math
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item
+from IsraeliQueue.fair import FairIsraeliQueue
+
+
+def fill(queue, group, count, first=0):
+    """Enqueue count items of a group, each joining the group's first item."""
+    head = Item(first, group)
+    queue.enqueue(head)
+    for i in range(1, count):
+        queue.put(Item(first + i, group), head)
+    return head
+
+
+class TurnByTurnQueue(FairIsraeliQueue):
+    """A FairIsraeliQueue that passes the turn on one lane at a time."""
+
+    def _head(self):
+        while True:
+            lane = self._ring[0]
+            if lane.ready and lane.deficit >= 1:
+                return lane
+            self._ring.rotate(-1)
+            lane.turn_over()
+
+
+class TestFairIsraeliQueue:
+    """Test cases for the FairIsraeliQueue class."""
+
+    def test_round_robin_between_groups(self):
+        """Test that a large group cannot starve the groups behind it."""
+        queue = FairIsraeliQueue()
+        fill(queue, 1, 5)
+        queue.enqueue(Item("Bob", 2))
+        queue.enqueue(Item("Carol", 3))
+
+        groups = [item.group for item in queue.dequeue_many(7)]
+        assert groups == [1, 2, 3, 1, 1, 1, 1]
+
+    def test_weights(self):
+        """Test that weights set each group's share of a round."""
+        queue = FairIsraeliQueue(weights={1: 3})
+        fill(queue, 1, 6)
+        fill(queue, 2, 3, first=10)
+
+        groups = [item.group for item in queue.dequeue_many(9)]
+        assert groups == [1, 1, 1, 2, 1, 1, 1, 2, 2]
+
+    def test_fractional_weights(self):
+        """Test that credit carries over between turns."""
+        queue = FairIsraeliQueue(weights={1: 1.5})
+        fill(queue, 1, 6)
+        fill(queue, 2, 4, first=10)
+
+        groups = [item.group for item in queue.dequeue_many(10)]
+        assert groups == [1, 2, 1, 1, 2, 1, 2, 1, 1, 2]
+
+    def test_small_weights_skip_idle_rounds(self):
+        """Test that weights far below one serve in the same order, at once."""
+        rng = random.Random(8)
+        # Weights that add up exactly, so both queues see the same credit
+        weights = {0: 0.375, 1: 0.25, 2: 2**-10, 3: 2}
+        queue = FairIsraeliQueue(
+            weights=weights, default_weight=0.125, max_join_ahead=1
+        )
+        expected = TurnByTurnQueue(
+            weights=weights, default_weight=0.125, max_join_ahead=1
+        )
+        for step in range(3000):
+            if len(queue) and rng.random() < 0.45:
+                assert queue.dequeue() == expected.dequeue()
+                continue
+            item = Item(step, rng.randrange(6))
+            friends = queue.items_in_group(item.group)
+            friend = friends[0] if len(friends) and rng.random() < 0.5 else None
+            queue.enqueue(item, friend)
+            expected.enqueue(item, friend)
+        assert list(queue) == list(expected)
+
+        tiny = FairIsraeliQueue(default_weight=1e-9)
+        fill(tiny, 1, 3)
+        fill(tiny, 2, 3, first=10)
+        assert [item.group for item in tiny.dequeue_many(6)] == [1, 2, 1, 2, 1, 2]
+
+    def test_max_join_ahead(self):
+        """Test that friends past the cap wait for the next turn."""
+        queue = FairIsraeliQueue(default_weight=math.inf, max_join_ahead=1)
+        alice = Item("Alice", 1)
+        queue.enqueue(alice)
+        queue.enqueue(Item("Bob", 2))
+        queue.put(Item("Alice's friend", 1), alice)
+        queue.put(Item("Late friend", 1), alice)
+
+        assert [item.item for item in queue] == [
+            "Alice",
+            "Alice's friend",
+            "Bob",
+            "Late friend",
+        ]
+        assert [item.item for item in queue.dequeue_many(4)] == [
+            "Alice",
+            "Alice's friend",
+            "Bob",
+            "Late friend",
+        ]
+
+    def test_iteration_matches_service_order(self):
+        """Test that iterating predicts the dequeue order."""
+        rng = random.Random(21)
+        queue = FairIsraeliQueue(weights={0: 2, 1: 0.5}, max_join_ahead=2)
+        for step in range(2000):
+            if len(queue) and rng.random() < 0.4:
+                expected = list(queue)
+                assert queue.peek() == expected[0]
+                assert queue.dequeue() == expected[0]
+                continue
+            item = Item(step, rng.randrange(5))
+            friends = queue.items_in_group(item.group)
+            friend = friends[0] if len(friends) and rng.random() < 0.7 else None
+            queue.enqueue(item, friend)
+        expected = list(queue)
+        assert queue.dequeue_many(len(queue)) == expected
+        assert queue.is_empty()
+
+    def test_queue_interface(self):
+        """Test membership, counts and errors."""
+        queue = FairIsraeliQueue()
+        alice = fill(queue, 1, 2)
+
+        assert alice in queue
+        assert queue.group_size(1) == 2
+        assert queue.items_in_group(1) == [alice, Item(1, 1)]
+        assert queue.get_groups() == [1]
+        with pytest.raises(ValueError, match="Friend not found"):
+            queue.put(Item("Bob", 2), Item("Ghost", 2))
+        queue.dequeue_many(2)
+        with pytest.raises(IndexError):
+            queue.dequeue()
+        with pytest.raises(IndexError):
+            queue.peek()
+        with pytest.raises(ValueError):
+            queue.set_weight(1, 0)
@@ -1,4 +1,7 @@
+import copy
+import pickle
 import pytest
+import random
 import sys
 import os
 
@@ -204,3 +207,438 @@ class TestIsraeliQueue:
         assert queue.dequeue() == alice
         assert queue.dequeue() == bob
         assert queue.peek() == frank
+
+
+class TestIsraeliQueueMembership:
+    """Test cases for the hash-indexed membership of IsraeliQueue."""
+
+    def test_contains_tracks_queue_methods(self):
+        """Test membership after enqueue, put and dequeue."""
+        queue = IsraeliQueue()
+        alice = Item("Alice", 1)
+        bob = Item("Bob", 1)
+
+        queue.enqueue(alice)
+        queue.put(bob, alice)
+        assert alice in queue and bob in queue
+        assert Item("Alice", 1) in queue
+
+        queue.dequeue()
+        assert alice not in queue
+        assert bob in queue
+
+    def test_contains_tracks_list_mutators(self):
+        """Test membership after the inherited list mutators."""
+        alice = Item("Alice", 1)
+        bob = Item("Bob", 2)
+        charlie = Item("Charlie", 3)
+        queue = IsraeliQueue([alice, bob])
+
+        queue.insert(0, charlie)
+        queue.remove(alice)
+        queue[0] = alice
+        assert alice in queue and bob in queue
+        assert charlie not in queue
+
+        del queue[0]
+        queue += [charlie]
+        queue[0:1] = [alice, alice]
+        assert queue.count(alice) == 2
+        assert bob not in queue
+
+        queue.pop()
+        queue.clear()
+        assert alice not in queue
+        assert queue.count(alice) == 0
+
+    def test_duplicates_are_counted(self):
+        """Test that equal items are tracked as a multiset."""
+        queue = IsraeliQueue()
+        queue.enqueue(Item("Alice", 1))
+        queue.enqueue(Item("Alice", 1))
+
+        queue.dequeue()
+        assert Item("Alice", 1) in queue
+        queue.dequeue()
+        assert Item("Alice", 1) not in queue
+
+    def test_put_validates_against_index(self):
+        """Test that a served friend can no longer be joined."""
+        queue = IsraeliQueue()
+        alice = Item("Alice", 1)
+        bob = Item("Bob", 1)
+
+        queue.enqueue(alice)
+        queue.dequeue()
+
+        with pytest.raises(ValueError, match="Friend not found in queue"):
+            queue.put(bob, alice)
+
+    def test_unhashable_payloads(self):
+        """Test that items with unhashable payloads are still found."""
+        queue = IsraeliQueue()
+        item = Item([1, 2], 1)
+
+        queue.enqueue(item)
+        assert Item([1, 2], 1) in queue
+        queue.put(Item([3], 1), item)
+        assert queue.count(Item([3], 1)) == 1
+
+    def test_copy_and_pickle_keep_index(self):
+        """Test that copies and unpickled queues have their own index."""
+        alice = Item("Alice", 1)
+        queue = IsraeliQueue([alice])
+
+        clone = copy.copy(queue)
+        clone.dequeue()
+        assert alice in queue
+        assert alice not in clone
+
+        restored = pickle.loads(pickle.dumps(queue))
+        assert restored == [alice]
+        assert alice in restored
+
+
+class TestIsraeliQueuePositions:
+    """Test cases for position_of, group_span and estimated_wait."""
+
+    def test_positions(self):
+        """Test positions as friends join in the middle of the line."""
+        alice, charlie = Item("Alice", 1), Item("Charlie", 2)
+        queue = IsraeliQueue([alice, charlie, Item("Eve", 1)])
+
+        queue.put(Item("Bob", 2), charlie)
+        assert queue.position_of(Item("Eve", 1)) == 3
+        assert queue.group_span(1) == (0, 3)
+        assert queue.group_span(2) == (1, 2)
+        assert queue.estimated_wait(Item("Bob", 2), service_rate=4) == 0.5
+
+        with pytest.raises(ValueError, match="not in queue"):
+            queue.position_of(Item("Zed", 9))
+        with pytest.raises(ValueError, match="Group not found"):
+            queue.group_span(9)
+        with pytest.raises(ValueError, match="service_rate"):
+            queue.estimated_wait(alice, -1)
+
+
+class TestIsraeliQueueRemoval:
+    """Test cases for cancel, remove_group and discard_expired."""
+
+    def test_cancel(self):
+        """Test that a cancelled item leaves and its group closes the gap."""
+        alice, charlie = Item("Alice", 1), Item("Charlie", 2)
+        queue = IsraeliQueue([alice, charlie, Item("Bob", 1)])
+
+        assert queue.cancel(Item("Bob", 1)) == Item("Bob", 1)
+        assert queue == [alice, charlie]
+        assert queue.group_size(1) == 1
+        queue.put(Item("Dana", 1), alice)
+        assert queue == [alice, Item("Dana", 1), charlie]
+        with pytest.raises(ValueError, match="not in queue"):
+            queue.cancel(Item("Bob", 1))
+
+    def test_remove_group(self):
+        """Test removing every member of a group at once."""
+        queue = IsraeliQueue(Item(i, i % 3) for i in range(9))
+
+        assert queue.remove_group(1) == [Item(i, 1) for i in (1, 4, 7)]
+        assert queue.remove_group(1) == []
+        assert 1 not in queue.get_groups()
+        assert queue.items_in_group(2) == [Item(i, 2) for i in (2, 5, 8)]
+        assert len(queue) == 6
+
+    def test_discard_expired(self):
+        """Test that only items past their deadline are discarded."""
+        queue = IsraeliQueue()
+        alice = Item("Alice", 1)
+        queue.enqueue(alice, expires_at=10)
+        queue.enqueue(Item("Charlie", 2))
+        queue.enqueue(Item("Bob", 1), alice, expires_at=5)
+        queue.enqueue(Item("Dana", 3), expires_at=20)
+
+        assert queue.discard_expired(4) == []
+        assert queue.discard_expired(10) == [alice, Item("Bob", 1)]
+        assert queue == [Item("Charlie", 2), Item("Dana", 3)]
+        assert queue.group_size(1) == 0
+        assert queue.discard_expired(100) == [Item("Dana", 3)]
+
+    def test_served_items_do_not_expire(self):
+        """Test that deadlines leave with their items, not with equal ones."""
+        first, second = Item("Alice", 1), Item("Alice", 1)
+        queue = IsraeliQueue()
+        queue.enqueue(first, expires_at=1)
+        queue.enqueue(second, expires_at=2)
+
+        queue.dequeue()
+        assert queue.discard_expired(1) == []
+        assert queue.discard_expired(2) == [second]
+        assert queue.is_empty()
+
+    def test_deadlines_survive_copy_and_pickle(self):
+        """Test that copies keep the deadlines of their items."""
+        queue = IsraeliQueue()
+        queue.enqueue(Item("Alice", 1), expires_at=1)
+        queue.enqueue(Item("Bob", 2))
+
+        for clone in (copy.copy(queue), pickle.loads(pickle.dumps(queue))):
+            assert clone.discard_expired(1) == [Item("Alice", 1)]
+            assert clone == [Item("Bob", 2)]
+        assert len(queue) == 2
+
+    def test_matches_full_scan(self):
+        """Test random removals against a filtered copy of the line."""
+        rng = random.Random(19)
+        queue = IsraeliQueue()
+        deadlines = {}
+        for step in range(1500):
+            roll = rng.random()
+            if queue and roll < 0.1:
+                item = rng.choice(queue)
+                expected = list(queue)
+                expected.remove(item)
+                queue.cancel(item)
+                assert queue == expected
+            elif roll < 0.15:
+                group = rng.randrange(6)
+                expected = [item for item in queue if item.group != group]
+                queue.remove_group(group)
+                assert queue == expected
+            elif roll < 0.25:
+                expected = [
+                    item for item in queue if deadlines.get(id(item), step + 1) > step
+                ]
+                queue.discard_expired(step)
+                assert queue == expected
+            else:
+                item = Item(step, rng.randrange(6))
+                friend = rng.choice(queue) if queue and rng.random() < 0.5 else None
+                deadlines[id(item)] = step + rng.randrange(1, 50)
+                queue.enqueue(item, friend, expires_at=deadlines[id(item)])
+            group = rng.randrange(6)
+            assert queue.items_in_group(group) == [
+                item for item in queue if item.group == group
+            ]
+            assert queue.group_size(group) == len(queue.items_in_group(group))
+
+
+class TestIsraeliQueueCounters:
+    """Test cases for the cached group counters of IsraeliQueue."""
+
+    def test_group_size(self):
+        """Test per-group counts through joins and dequeues."""
+        queue = IsraeliQueue()
+        alice = Item("Alice", 1)
+        queue.enqueue(alice)
+        queue.put(Item("Bob", 1), alice)
+        queue.enqueue(Item("Charlie", 2))
+
+        assert queue.group_size(1) == 2
+        assert queue.group_size(2) == 1
+        assert queue.group_size(3) == 0
+
+        queue.dequeue()
+        assert queue.group_size(1) == 1
+
+    def test_get_groups_drops_empty_groups(self):
+        """Test that a group disappears once its last item leaves."""
+        queue = IsraeliQueue([Item("Alice", 1), Item("Charlie", 2)])
+
+        queue.dequeue()
+        assert queue.get_groups() == [2]
+        queue.dequeue()
+        assert queue.get_groups() == []
+        assert queue.is_empty()
+
+    def test_counters_follow_list_mutators(self):
+        """Test counters after slicing and in-place repetition."""
+        queue = IsraeliQueue([Item("Alice", 1), Item("Charlie", 2)])
+
+        queue *= 2
+        assert queue.group_size(1) == 2
+        del queue[1:]
+        assert set(queue.get_groups()) == {1}
+        queue[0] = Item("Eve", 3)
+        assert queue.get_groups() == [3]
+
+
+class TestIsraeliQueueBatch:
+    """Test cases for enqueue_many and dequeue_many."""
+
+    def test_enqueue_many_matches_sequential(self):
+        """Test that a batch lands exactly where single calls would put it."""
+        rng = random.Random(7)
+        for _ in range(50):
+            initial = [Item(f"q{i}", rng.randrange(5)) for i in range(rng.randrange(8))]
+            expected = IsraeliQueue(initial)
+            queue = IsraeliQueue(initial)
+
+            pairs = []
+            for i in range(rng.randrange(1, 15)):
+                item = Item(f"b{i}", rng.randrange(6))
+                pool = list(expected)
+                friend = rng.choice(pool) if pool and rng.random() < 0.7 else None
+                expected.enqueue(item, friend)
+                pairs.append((item, friend))
+
+            queue.enqueue_many(pairs)
+            assert queue == expected
+            for group in range(6):
+                assert queue.group_size(group) == expected.group_size(group)
+
+    def test_enqueue_many_joins_batch_friends(self):
+        """Test that items can join friends added earlier in the same batch."""
+        queue = IsraeliQueue([Item("Alice", 1), Item("Charlie", 2)])
+        bob = Item("Bob", 3)
+        david = Item("David", 3)
+        eve = Item("Eve", 1)
+
+        queue.enqueue_many([(bob, None), (david, bob), (eve, bob)])
+
+        assert [item.item for item in queue] == [
+            "Alice",
+            "Eve",
+            "Charlie",
+            "Bob",
+            "David",
+        ]
+
+    def test_enqueue_many_missing_friend_keeps_prefix(self):
+        """Test that a missing friend raises after placing earlier items."""
+        alice = Item("Alice", 1)
+        bob = Item("Bob", 1)
+        queue = IsraeliQueue([alice])
+
+        with pytest.raises(ValueError, match="Friend not found in queue"):
+            queue.enqueue_many([(bob, alice), (Item("Eve", 2), Item("Zed", 9))])
+
+        assert queue == [alice, bob]
+
+    def test_dequeue_many(self):
+        """Test removing several items from the front at once."""
+        items = [Item(name, 1) for name in "abcde"]
+        queue = IsraeliQueue(items)
+
+        assert queue.dequeue_many(2) == items[:2]
+        assert queue.dequeue_many(10) == items[2:]
+        assert queue.dequeue_many(1) == []
+        assert queue.group_size(1) == 0
+
+        with pytest.raises(ValueError):
+            queue.dequeue_many(-1)
+
+
+class TestIsraeliQueueDrain:
+    """Test cases for drain and iter_dequeue."""
+
+    def test_drain_everything(self):
+        """Test that drain yields the whole line in order and empties it."""
+        items = [Item(i, i % 7) for i in range(1000)]
+        queue = IsraeliQueue(items)
+
+        assert list(queue.drain()) == items
+        assert queue.is_empty()
+        assert queue.get_groups() == []
+
+    def test_drain_max_items(self):
+        """Test that drain stops after max_items."""
+        items = [Item(i, i % 3) for i in range(200)]
+        queue = IsraeliQueue(items)
+
+        assert list(queue.drain(max_items=70)) == items[:70]
+        assert queue == items[70:]
+        assert queue.group_size(0) == sum(1 for item in items[70:] if item.group == 0)
+
+        with pytest.raises(ValueError):
+            queue.drain(-1)
+
+    def test_drain_takes_only_items_in_line(self):
+        """Test that drain ignores items added while it runs."""
+        queue = IsraeliQueue([Item(i, 1) for i in range(3)])
+        drained = []
+        for item in queue.drain():
+            drained.append(item)
+            queue.enqueue(Item(f"retry-{item.item}", 2))
+
+        assert drained == [Item(i, 1) for i in range(3)]
+        assert [item.item for item in queue] == ["retry-0", "retry-1", "retry-2"]
+
+    def test_iter_dequeue_includes_new_items(self):
+        """Test that iter_dequeue keeps going while items are added."""
+        queue = IsraeliQueue([Item(0, 1)])
+        seen = []
+        for item in queue.iter_dequeue():
+            seen.append(item.item)
+            if item.item < 5:
+                queue.enqueue(Item(item.item + 1, 1))
+
+        assert seen == [0, 1, 2, 3, 4, 5]
+        assert queue.is_empty()
+
+    def test_waiting_items_stay_in_line(self):
+        """Test that items a drain has not reached can still be joined."""
+        items = [Item(i, i % 4) for i in range(300)]
+        queue = IsraeliQueue(items)
+
+        drain = queue.drain()
+        assert next(drain) == items[0]
+        assert items[1] in queue
+        assert items[0] not in queue
+        queue.put(Item("x", 1), items[1])
+        position = queue.position_of(Item("x", 1))
+        assert position == queue.group_span(1)[1]
+        # drain yields as many items as were in line, so one is left
+        expected = items[1:]
+        expected.insert(position, Item("x", 1))
+        assert list(drain) == expected[:-1]
+        assert queue == expected[-1:]
+
+    def test_drain_takes_chunks(self):
+        """Test that drain cuts the list a few times instead of per item."""
+        cuts = []
+
+        class CountingQueue(IsraeliQueue):
+            def _hold(self, count):
+                cuts.append(count)
+                super()._hold(count)
+
+            def pop(self, index=-1):
+                raise AssertionError("drain popped a single item")
+
+        items = [Item(i, i % 7) for i in range(10000)]
+        queue = CountingQueue(items)
+
+        assert list(queue.drain()) == items
+        assert len(cuts) < 40
+        assert queue.is_empty()
+
+    def test_held_items_are_still_in_line(self):
+        """Test that the queue sees the chunk a drain holds in place."""
+        items = [Item(i, i % 4) for i in range(300)]
+        queue = IsraeliQueue(items)
+
+        drain = queue.drain()
+        next(drain)
+        assert len(queue) == queue.size() == 299
+        assert queue.peek() == items[1]
+        assert queue[0] == items[1]
+        assert queue.dequeue() == items[1]
+        assert list(queue) == items[2:]
+        assert queue.group_size(2) == 75
+        assert list(drain) == items[2:]
+
+    def test_closing_early_keeps_the_rest(self):
+        """Test that items not yet yielded stay at the front of the line."""
+        items = [Item(i, i % 4) for i in range(300)]
+        queue = IsraeliQueue(items)
+        queue._set_deadline(items[10], 5)
+
+        drain = queue.drain()
+        assert [next(drain) for _ in range(5)] == items[:5]
+        drain.close()
+
+        assert queue == items[5:]
+        assert list(queue.items_in_group(1)) == [i for i in items[5:] if i.group == 1]
+        queue.enqueue(Item("x", 1), items[5])
+        assert queue.items_in_group(1)[-1] == Item("x", 1)
+        assert queue.position_of(Item("x", 1)) == queue.group_span(1)[1]
+        assert queue.discard_expired(5) == [items[10]]
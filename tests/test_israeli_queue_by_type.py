@@ -193,3 +193,84 @@ class TestIsraeliQueueByType:
         assert dequeued == ["a", "b", "c", 1, 2]
         assert queue.is_empty()
         assert queue.size() == 0
+
+    def test_counters_track_dequeue(self):
+        """Test cached size and type counts as items are served."""
+        queue = IsraeliQueueByType()
+        for item in ["a", 1, "b"]:
+            queue.enqueue(item)
+
+        assert queue.type_size(str) == 2
+        assert queue.type_size(int) == 1
+        queue.dequeue()
+        queue.dequeue()
+        assert queue.get_types() == [int]
+        assert queue.type_size(str) == 0
+        assert queue.size() == 1
+
+    def test_get_types_keeps_lane_order_after_dequeue(self):
+        """Test that serving the head subqueue does not move its type."""
+        queue = IsraeliQueueByType()
+        for item in [1, "s", 2]:
+            queue.enqueue(item)
+
+        queue.dequeue()
+        assert queue.get_types() == [int, str]
+        queue.dequeue_many(1)
+        assert queue.get_types() == [str]
+
+    def test_counters_track_list_mutators(self):
+        """Test cached counters after the inherited list mutators."""
+        queue = IsraeliQueueByType()
+        queue.enqueue("a")
+        queue.append([1, 2])
+        queue.insert(0, [3.5])
+
+        assert queue.size() == 4
+        assert set(queue.get_types()) == {str, int, float}
+
+        queue.pop(0)
+        del queue[0]
+        assert queue.size() == 2
+        assert queue.get_types() == [int]
+
+        queue.clear()
+        assert queue.is_empty()
+
+    def test_counters_follow_new_head_type(self):
+        """Test that counts follow the head type when a subqueue is mixed."""
+        queue = IsraeliQueueByType()
+        queue.enqueue(True)
+        queue.enqueue(1)  # joins the subqueue headed by True
+
+        assert queue.get_types() == [bool]
+        queue.dequeue()
+        assert queue.get_types() == [int]
+        assert queue.type_size(int) == 1
+
+    def test_enqueue_many_matches_sequential(self):
+        """Test that a batch is grouped exactly like single enqueues."""
+        items = ["a", 1, True, 2.5, "b", False, 3, [1], 4.0, None]
+        expected = IsraeliQueueByType()
+        expected.enqueue(7)
+        for item in items:
+            expected.enqueue(item)
+
+        queue = IsraeliQueueByType()
+        queue.enqueue(7)
+        queue.enqueue_many(items)
+
+        assert list(queue) == list(expected)
+        assert queue.size() == expected.size()
+        assert queue.get_types() == expected.get_types()
+
+    def test_dequeue_many(self):
+        """Test removing several items across subqueues at once."""
+        queue = IsraeliQueueByType()
+        queue.enqueue_many(["a", 1, "b", 2, "c"])
+
+        assert queue.dequeue_many(4) == ["a", "b", "c", 1]
+        assert queue.size() == 1
+        assert queue.dequeue_many(5) == [2]
+        assert queue.is_empty()
+        assert len(queue) == 0
@@ -0,0 +1,262 @@
+import copy
+from collections import namedtuple
+import io
+import os
+import pickle
+import pytest
+import sys
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue
+from IsraeliQueue.compact import CompactItem
+from IsraeliQueue.journal import (
+    JournaledIsraeliQueue,
+    iter_snapshot,
+    load_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+
+Ticket = namedtuple("Ticket", ["item", "group"])
+
+
+class TestSnapshot:
+    """Test cases for streaming snapshots."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a snapshot restores the same queue."""
+        queue = IsraeliQueue(Item(i, i // 3) for i in range(10))
+        queue.append(CompactItem("Alice", 1))
+        path = str(tmp_path / "queue.snap")
+
+        write_snapshot(queue, path, chunk_size=4)
+        restored = load_snapshot(path)
+
+        assert isinstance(restored, IsraeliQueue)
+        assert restored == queue
+        assert type(restored[-1]) is CompactItem
+        assert restored.group_size(1) == 4
+
+    def test_streams_in_chunks(self):
+        """Test that the snapshot is yielded frame by frame."""
+        chunks = list(iter_snapshot([Item(i, 0) for i in range(10)], chunk_size=4))
+
+        # Header, three item frames and the end frame
+        assert len(chunks) == 5
+
+    def test_runs_are_compact(self):
+        """Test that a run of one group is far smaller than a pickle."""
+        queue = IsraeliQueue(Item(i, "group") for i in range(1000))
+        size = sum(len(chunk) for chunk in iter_snapshot(queue))
+
+        assert size < len(pickle.dumps(queue)) / 2
+
+    def test_truncated_snapshot(self):
+        """Test that a snapshot without its end frame is rejected."""
+        data = b"".join(iter_snapshot([Item(1, 1)]))
+
+        with pytest.raises(ValueError, match="truncated or corrupt"):
+            read_snapshot(io.BytesIO(data[:-3]))
+        with pytest.raises(ValueError, match="Not an Israeli queue snapshot"):
+            read_snapshot(io.BytesIO(b"nonsense" * 4))
+
+
+class TestJournaledIsraeliQueue:
+    """Test cases for the JournaledIsraeliQueue class."""
+
+    def fill(self, queue):
+        """Run a few journaled operations and return the resulting line."""
+        alice = Item("Alice", 1)
+        queue.enqueue(alice)
+        queue.enqueue(Item("Charlie", 2))
+        queue.enqueue(Item("Bob", 1), alice)
+        queue.enqueue_many(
+            [(Item("Dana", 2), Item("Charlie", 2)), (Item("Eve", 3), None)]
+        )
+        queue.dequeue()
+        return list(queue)
+
+    def test_replay_journal(self, tmp_path):
+        """Test that reopening replays every journaled operation."""
+        directory = str(tmp_path / "queue")
+        with JournaledIsraeliQueue(directory) as queue:
+            expected = self.fill(queue)
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == expected
+            assert restored.group_size(2) == 2
+
+    def test_replay_removals(self, tmp_path):
+        """Test that cancellations and expiries replay to the same line."""
+        directory = str(tmp_path / "queue")
+        with JournaledIsraeliQueue(directory) as queue:
+            self.fill(queue)
+            queue.enqueue(Item("Bob", 1), expires_at=5)
+            queue.cancel(Item("Charlie", 2))
+            queue.remove_group(3)
+            assert queue.discard_expired(5) == [Item("Bob", 1)]
+            expected = list(queue)
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == expected == [Item("Bob", 1), Item("Dana", 2)]
+
+    def test_replay_drain_closed_early(self, tmp_path):
+        """Test that a drain closed early replays to the same line."""
+        directory = str(tmp_path / "queue")
+        items = [Item(i, i % 3) for i in range(100)]
+        with JournaledIsraeliQueue(directory) as queue:
+            for item in items:
+                queue.enqueue(item)
+            drain = queue.drain()
+            assert [next(drain) for _ in range(3)] == items[:3]
+            drain.close()
+            expected = list(queue)
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == expected == items[3:]
+
+    def test_replay_list_mutations(self, tmp_path):
+        """Test that the inherited list methods are journaled too."""
+        directory = str(tmp_path / "queue")
+        a, b, c, x = Item("a", 1), Item("b", 1), Item("c", 2), Item("x", 3)
+        with JournaledIsraeliQueue(directory) as queue:
+            queue.append(x)
+            queue.cancel(x)
+            queue.extend([a])
+            queue.put(b, a)
+            queue.insert(0, c)
+            queue += [Item("d", 4), Item("e", 5)]
+            queue.remove(Item("d", 4))
+            queue[1] = Item("f", 1)
+            queue[3:] = [Item("g", 6), Item("h", 6)]
+            del queue[-1]
+            queue.pop()
+            queue.sort(key=lambda item: item.item, reverse=True)
+            queue.reverse()
+            queue.append(Item("i", 7))
+            expected = list(queue)
+            groups = queue.get_groups()
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == expected
+            assert restored.group_size(1) == 2
+            assert restored.get_groups() == groups
+
+    def test_nested_operations_are_journaled_once(self, tmp_path):
+        """Test that a queue operation does not also journal its parts."""
+        directory = str(tmp_path / "queue")
+        with JournaledIsraeliQueue(directory) as queue:
+            queue.enqueue(Item("a", 1))
+            queue.enqueue(Item("b", 2))
+            queue.dequeue()
+            queue.remove(Item("b", 2))
+            queue.enqueue(Item("c", 3))
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == [Item("c", 3)]
+
+    def test_closed_queue_rejects_list_mutations(self, tmp_path):
+        """Test that list methods on a closed queue raise and change nothing."""
+        queue = JournaledIsraeliQueue(str(tmp_path / "queue"))
+        queue.append(Item("a", 1))
+        queue.close()
+        with pytest.raises(ValueError):
+            queue.append(Item("b", 1))
+        with pytest.raises(ValueError):
+            del queue[0]
+        assert list(queue) == [Item("a", 1)]
+
+    def test_failed_batch_replays_the_same(self, tmp_path):
+        """Test that a batch that failed halfway replays to the same state."""
+        directory = str(tmp_path / "queue")
+        with JournaledIsraeliQueue(directory) as queue:
+            with pytest.raises(ValueError):
+                queue.enqueue_many(
+                    [(Item("Alice", 1), None), (Item("Bob", 2), Item("X", 2))]
+                )
+            with pytest.raises(ValueError):
+                queue.put(Item("Carol", 1), Item("Ghost", 1))
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == [Item("Alice", 1)]
+
+    def test_checkpoint(self, tmp_path):
+        """Test that a checkpoint replaces the journal with a snapshot."""
+        directory = str(tmp_path / "queue")
+        with JournaledIsraeliQueue(directory) as queue:
+            self.fill(queue)
+            queue.checkpoint()
+            queue.dequeue_many(2)
+            expected = list(queue)
+
+        names = sorted(os.listdir(directory))
+        assert names == ["journal-000002.log", "snapshot"]
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == expected
+
+    def test_operations_between_checkpoint_steps(self, tmp_path):
+        """Test that operations during a checkpoint land in the new segment."""
+        directory = str(tmp_path / "queue")
+        with JournaledIsraeliQueue(directory, chunk_size=1) as queue:
+            self.fill(queue)
+            steps = queue.iter_checkpoint()
+            next(steps)
+            queue.enqueue(Item("Frank", 4))
+            for _ in steps:
+                queue.dequeue()
+                break
+            expected = list(queue)
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == expected
+
+    def test_torn_journal_tail(self, tmp_path):
+        """Test that a half-written record is dropped on reopening."""
+        directory = str(tmp_path / "queue")
+        with JournaledIsraeliQueue(directory) as queue:
+            queue.enqueue(Item("Alice", 1))
+            segment = queue._segment_path(queue._segment)
+        with open(segment, "ab") as handle:
+            handle.write(b"\x40\x00\x00\x00garbage")
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == [Item("Alice", 1)]
+            restored.enqueue(Item("Bob", 2))
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == [Item("Alice", 1), Item("Bob", 2)]
+
+    def test_tuple_items_round_trip(self, tmp_path):
+        """Test that items which are tuples replay as themselves."""
+        directory = str(tmp_path / "queue")
+        ticket = Ticket("Alice", 1)
+        with JournaledIsraeliQueue(directory) as queue:
+            queue.enqueue(ticket)
+            queue.enqueue(Item("Alice", 1))
+            queue.append(Ticket(("Bob", 2), 2))
+
+        with JournaledIsraeliQueue(directory) as restored:
+            assert list(restored) == [
+                ticket,
+                Item("Alice", 1),
+                Ticket(("Bob", 2), 2),
+            ]
+            assert [type(item) for item in restored] == [Ticket, Item, Ticket]
+
+    def test_closed_queue(self, tmp_path):
+        """Test that a closed queue refuses journaled operations."""
+        queue = JournaledIsraeliQueue(str(tmp_path / "queue"))
+        queue.close()
+
+        with pytest.raises(ValueError, match="closed"):
+            queue.enqueue(Item("Alice", 1))
+        assert queue.is_empty()
+
+    def test_copy_is_plain(self, tmp_path):
+        """Test that copies and pickles are plain IsraeliQueues."""
+        with JournaledIsraeliQueue(str(tmp_path / "queue")) as queue:
+            queue.enqueue(Item("Alice", 1))
+            for clone in (copy.copy(queue), pickle.loads(pickle.dumps(queue))):
+                assert type(clone) is IsraeliQueue
+                assert clone == [Item("Alice", 1)]
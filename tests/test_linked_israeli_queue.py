@@ -0,0 +1,294 @@
+import pickle
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue
+from IsraeliQueue.linked import LinkedIsraeliQueue
+from tests import test_israeli_queue
+
+
+class TestLinkedIsraeliQueueCompat(test_israeli_queue.TestIsraeliQueue):
+    """Run the IsraeliQueue suite against the linked-block backend."""
+
+    @pytest.fixture(autouse=True)
+    def use_linked_backend(self, monkeypatch):
+        """Make the shared tests build LinkedIsraeliQueues."""
+        monkeypatch.setattr(test_israeli_queue, "IsraeliQueue", LinkedIsraeliQueue)
+
+
+class TestLinkedIsraeliQueue:
+    """Test cases specific to the LinkedIsraeliQueue backend."""
+
+    def test_construct_from_iterable(self):
+        """Test building a queue from existing items."""
+        items = [Item("Alice", 1), Item("Bob", 1), Item("Charlie", 2)]
+        queue = LinkedIsraeliQueue(items)
+
+        assert queue == items
+        assert len(queue) == 3
+
+    def test_enqueue_without_friend_starts_new_block(self):
+        """Test that enqueue without a friend goes to the back, like IsraeliQueue."""
+        queue = LinkedIsraeliQueue()
+        alice = Item("Alice", 1)
+        charlie = Item("Charlie", 2)
+        bob = Item("Bob", 1)
+        david = Item("David", 1)
+
+        queue.enqueue(alice)
+        queue.enqueue(charlie)
+        queue.enqueue(bob)
+        # David joins behind Bob, the furthest member of group 1
+        queue.put(david, alice)
+
+        assert queue == [alice, charlie, bob, david]
+
+    def test_group_index_dropped_after_serving(self):
+        """Test that a fully served group no longer attracts friends."""
+        queue = LinkedIsraeliQueue()
+        alice = Item("Alice", 1)
+        charlie = Item("Charlie", 2)
+        bob = Item("Bob", 1)
+
+        queue.extend([alice, charlie])
+        queue.dequeue()
+        assert queue.get_groups() == [2]
+
+        queue.put(bob, charlie)
+        assert queue == [charlie, bob]
+
+    def test_group_size(self):
+        """Test the cached per-group counts."""
+        queue = LinkedIsraeliQueue([Item("a", 1), Item("b", 2), Item("c", 1)])
+
+        assert queue.group_size(1) == 2
+        queue.dequeue()
+        assert queue.group_size(1) == 1
+        assert queue.group_size(4) == 0
+
+    def test_getitem_and_slices(self):
+        """Test positional access across block boundaries."""
+        items = [Item("a", 1), Item("b", 2), Item("c", 2), Item("d", 3)]
+        queue = LinkedIsraeliQueue(items)
+
+        assert queue[2] == items[2]
+        assert queue[-1] == items[-1]
+        assert queue[1:3] == items[1:3]
+        with pytest.raises(IndexError):
+            queue[4]
+
+    def test_contains_with_unhashable_payload(self):
+        """Test items with unhashable payloads can still be queued and found."""
+        queue = LinkedIsraeliQueue()
+        item = Item([1, 2, 3], 1)
+        friend = Item(["x"], 1)
+
+        queue.enqueue(item)
+        queue.put(friend, Item([1, 2, 3], 1))
+
+        assert friend in queue
+        assert queue.dequeue() == item
+        assert item not in queue
+
+    def test_batch_operations(self):
+        """Test enqueue_many and dequeue_many on the linked backend."""
+        alice = Item("Alice", 1)
+        bob = Item("Bob", 1)
+        charlie = Item("Charlie", 2)
+        queue = LinkedIsraeliQueue()
+
+        queue.enqueue_many([(alice, None), (charlie, None), (bob, alice)])
+        assert queue == [alice, bob, charlie]
+        assert queue.dequeue_many(2) == [alice, bob]
+        assert queue.dequeue_many(5) == [charlie]
+
+    def test_matches_list_backend(self):
+        """Test a random mix of operations against IsraeliQueue."""
+        rng = random.Random(42)
+        reference = IsraeliQueue()
+        queue = LinkedIsraeliQueue()
+
+        for step in range(2000):
+            action = rng.random()
+            if action < 0.35 and reference:
+                friend = rng.choice(reference)
+                item = Item(step, rng.randrange(8))
+                reference.put(item, friend)
+                queue.put(item, friend)
+            elif action < 0.7:
+                item = Item(step, rng.randrange(8))
+                reference.enqueue(item)
+                queue.enqueue(item)
+            elif reference:
+                assert queue.dequeue() == reference.dequeue()
+
+            assert len(queue) == len(reference)
+
+        assert queue == list(reference)
+        assert sorted(queue.get_groups()) == sorted(reference.get_groups())
+        for group in range(8):
+            assert queue.group_size(group) == reference.group_size(group)
+
+    def test_drain(self):
+        """Test drain and iter_dequeue against the list backend."""
+        items = [Item(i, i % 5) for i in range(100)]
+        queue = LinkedIsraeliQueue()
+        queue.extend(items)
+
+        assert list(queue.drain(10)) == items[:10]
+        assert list(queue.drain()) == items[10:]
+        queue.enqueue(Item(0, 1))
+        seen = []
+        for item in queue.iter_dequeue():
+            seen.append(item)
+            if len(seen) < 3:
+                queue.enqueue(Item(len(seen), 1))
+        assert seen == [Item(0, 1), Item(1, 1), Item(2, 1)]
+        with pytest.raises(ValueError):
+            queue.drain(-1)
+
+
+class TestLinkedIsraeliQueuePositions:
+    """Test cases for the order-statistics index of LinkedIsraeliQueue."""
+
+    def test_position_of_and_group_span(self):
+        """Test positions as friends join in the middle of the line."""
+        alice, charlie = Item("Alice", 1), Item("Charlie", 2)
+        queue = LinkedIsraeliQueue([alice, charlie, Item("Eve", 3)])
+
+        queue.put(Item("Bob", 1), alice)
+        assert queue.position_of(charlie) == 2
+        assert queue.index(Item("Eve", 3)) == 3
+        assert queue.group_span(1) == (0, 1)
+        queue.enqueue(Item("Dana", 1))
+        assert queue.group_span(1) == (0, 4)
+        assert queue.estimated_wait(charlie, service_rate=0.5) == 4.0
+
+        queue.dequeue()
+        assert queue.position_of(charlie) == 1
+        assert queue.group_span(1) == (0, 3)
+        with pytest.raises(ValueError, match="not in queue"):
+            queue.position_of(alice)
+        with pytest.raises(ValueError, match="Group not found"):
+            queue.group_span(9)
+        with pytest.raises(ValueError, match="service_rate"):
+            queue.estimated_wait(charlie, 0)
+
+    def test_duplicates_and_unhashable_items(self):
+        """Test that the first equal item is found, hashable or not."""
+        queue = LinkedIsraeliQueue([Item("a", 1), Item(["x"], 2), Item("a", 1)])
+
+        assert queue.position_of(Item("a", 1)) == 0
+        assert queue.position_of(Item(["x"], 2)) == 1
+        queue.dequeue()
+        assert queue.position_of(Item("a", 1)) == 1
+
+    def test_matches_list_backend(self):
+        """Test positions, spans and indexing against IsraeliQueue."""
+        rng = random.Random(7)
+        reference = IsraeliQueue()
+        queue = LinkedIsraeliQueue()
+
+        # Enough blocks open and close to rebuild the tree several times
+        for step in range(3000):
+            action = rng.random()
+            if action < 0.4 and reference:
+                friend = rng.choice(reference)
+                item = Item(step, rng.randrange(20))
+                reference.put(item, friend)
+                queue.put(item, friend)
+            elif action < 0.7:
+                item = Item(step, rng.randrange(20))
+                reference.enqueue(item)
+                queue.enqueue(item)
+            elif reference:
+                assert queue.dequeue() == reference.dequeue()
+
+            if reference:
+                position = rng.randrange(len(reference))
+                item = reference[position]
+                assert queue[position] == item
+                assert queue.position_of(item) == reference.position_of(item)
+                assert queue.group_span(item.group) == reference.group_span(item.group)
+
+
+class TestLinkedIsraeliQueueRemoval(test_israeli_queue.TestIsraeliQueueRemoval):
+    """Run the removal suite against the tombstones of the linked backend."""
+
+    @pytest.fixture(autouse=True)
+    def use_linked_backend(self, monkeypatch):
+        """Make the shared tests build LinkedIsraeliQueues."""
+        monkeypatch.setattr(test_israeli_queue, "IsraeliQueue", LinkedIsraeliQueue)
+
+    def test_deadlines_survive_copy_and_pickle(self):
+        """Test that a pickled copy keeps the deadlines of its items."""
+        queue = LinkedIsraeliQueue()
+        queue.enqueue(Item("Alice", 1), expires_at=1)
+        queue.enqueue(Item("Bob", 2))
+
+        clone = pickle.loads(pickle.dumps(queue))
+        assert clone.discard_expired(1) == [Item("Alice", 1)]
+        assert clone == [Item("Bob", 2)]
+        assert len(queue) == 2
+
+    def test_tombstones_take_no_position(self):
+        """Test positions, spans and joins around cancelled items."""
+        alice, charlie = Item("Alice", 1), Item("Charlie", 2)
+        queue = LinkedIsraeliQueue([alice, Item("Bob", 1), charlie, Item("Dana", 1)])
+
+        queue.cancel(Item("Bob", 1))
+        assert queue[1] == charlie
+        assert queue.position_of(Item("Dana", 1)) == 2
+        queue.cancel(Item("Dana", 1))
+        # Group 1 now ends in the first block, so Eve joins there
+        queue.put(Item("Eve", 1), alice)
+        assert queue == [alice, Item("Eve", 1), charlie]
+        assert queue.group_span(1) == (0, 1)
+        queue.cancel(alice)
+        assert queue.peek() == Item("Eve", 1)
+        assert queue.items_in_group(1) == [Item("Eve", 1)]
+        assert queue.group_span(2) == (1, 1)
+
+    def test_matches_list_backend(self):
+        """Test removals, positions and indexing against IsraeliQueue."""
+        rng = random.Random(23)
+        reference = IsraeliQueue()
+        queue = LinkedIsraeliQueue()
+
+        # Enough blocks open and close to rebuild the tree several times
+        for step in range(4000):
+            roll = rng.random()
+            if reference and roll < 0.1:
+                item = rng.choice(reference)
+                assert queue.cancel(item) == reference.cancel(item)
+            elif roll < 0.13:
+                group = rng.randrange(8)
+                assert queue.remove_group(group) == reference.remove_group(group)
+            elif roll < 0.2:
+                assert queue.discard_expired(step) == reference.discard_expired(step)
+            elif reference and roll < 0.35:
+                assert queue.dequeue() == reference.dequeue()
+            else:
+                item = Item(step, rng.randrange(8))
+                friend = rng.choice(reference) if reference and roll < 0.7 else None
+                expires_at = step + rng.randrange(1, 100) if roll < 0.8 else None
+                reference.enqueue(item, friend, expires_at=expires_at)
+                queue.enqueue(item, friend, expires_at=expires_at)
+
+            assert len(queue) == len(reference)
+            if reference:
+                position = rng.randrange(len(reference))
+                item = reference[position]
+                assert queue[position] == item
+                assert queue.position_of(item) == reference.position_of(item)
+                assert queue.group_span(item.group) == reference.group_span(item.group)
+                assert queue.items_in_group(item.group) == reference.items_in_group(
+                    item.group
+                )
+                assert queue.peek() == reference.peek()
+        assert queue == reference
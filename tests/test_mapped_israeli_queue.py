@@ -0,0 +1,201 @@
+import pytest
+import random
+import shutil
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue
+from IsraeliQueue.mapped import MappedIsraeliQueue
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Return the path of a queue file in a fresh directory."""
+    return str(tmp_path / "queue.iq")
+
+
+class TestMappedIsraeliQueue:
+    """Test cases for the MappedIsraeliQueue class."""
+
+    def test_queue_operations(self, path):
+        """Test joining friends, serving and errors."""
+        with MappedIsraeliQueue(path, sync=False) as queue:
+            assert queue.is_empty()
+            queue.enqueue_many([(Item(1, 10), None), (Item(2, 20), None)])
+            queue.put(Item(3, 10), Item(1, 10))
+
+            assert list(queue) == [Item(1, 10), Item(3, 10), Item(2, 20)]
+            assert queue.group_size(10) == 2
+            assert sorted(queue.get_groups()) == [10, 20]
+            members = queue.items_in_group(10)
+            assert members == [Item(1, 10), Item(3, 10)]
+            assert len(members) == 2
+            with pytest.raises(ValueError, match="Friend not found in queue"):
+                queue.put(Item(4, 10), Item(1, 20))
+            assert queue.peek() == Item(1, 10)
+            assert queue.dequeue_many(5) == [Item(1, 10), Item(3, 10), Item(2, 20)]
+            assert members == [] and len(members) == 0
+            with pytest.raises(IndexError, match="Cannot dequeue from empty queue"):
+                queue.dequeue()
+
+    def test_rejects_non_integer_items(self, path):
+        """Test that only 64-bit integer items and groups can be stored."""
+        with MappedIsraeliQueue(path, sync=False) as queue:
+            with pytest.raises(TypeError):
+                queue.enqueue(Item("Alice", 1))
+            with pytest.raises(TypeError):
+                queue.enqueue(Item(1, 1 << 64))
+            assert "Alice" not in queue
+            assert queue.size() == 0
+
+    def test_reopen(self, path):
+        """Test that the queue survives closing and reopening."""
+        with MappedIsraeliQueue(path) as queue:
+            queue.enqueue(Item(1, 10))
+            queue.enqueue(Item(2, 20))
+            queue.dequeue()
+            queue.enqueue(Item(3, 20), Item(2, 20))
+
+        with MappedIsraeliQueue(path) as queue:
+            assert list(queue) == [Item(2, 20), Item(3, 20)]
+            queue.put(Item(4, 20), Item(3, 20))
+            assert queue.group_size(20) == 3
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Needs fcntl")
+    def test_file_is_locked_while_open(self, path):
+        """Test that a file can only be open once at a time."""
+        with MappedIsraeliQueue(path, sync=False) as queue:
+            queue.enqueue(Item(1, 10))
+            with pytest.raises(BlockingIOError, match="already open"):
+                MappedIsraeliQueue(path, sync=False)
+            assert list(queue) == [Item(1, 10)]
+
+        with MappedIsraeliQueue(path, sync=False) as queue:
+            assert list(queue) == [Item(1, 10)]
+
+    def test_grows_past_capacity(self, path):
+        """Test that the file doubles when it runs out of slots."""
+        with MappedIsraeliQueue(path, capacity=2, sync=False) as queue:
+            for i in range(9):
+                queue.enqueue(Item(i, i % 3))
+            assert queue.capacity == 16
+            assert queue.size() == 9
+
+        with MappedIsraeliQueue(path) as queue:
+            assert [item.item for item in queue] == list(range(9))
+
+    def test_grows_group_table(self, path):
+        """Test that the group table doubles when max_groups groups are in line."""
+        with MappedIsraeliQueue(path, capacity=4, max_groups=2, sync=False) as queue:
+            queue.enqueue_many([(Item(1, 1), None), (Item(2, 2), None)])
+            queue.put(Item(3, 1), Item(1, 1))
+            queue.enqueue(Item(4, 3))
+            assert queue.max_groups == 4
+            for i in range(5, 40):
+                queue.enqueue(Item(i, i))
+            assert queue.max_groups == 64
+            assert queue.group_size(1) == 2
+            assert queue.dequeue_many(3) == [Item(1, 1), Item(3, 1), Item(2, 2)]
+
+        with MappedIsraeliQueue(path) as queue:
+            assert queue.max_groups == 64
+            assert [item.item for item in queue] == list(range(4, 40))
+            assert queue.items_in_group(3) == [Item(4, 3)]
+
+    def test_failed_growth_leaves_queue_untouched(self, path):
+        """Test that a table grown by a failed operation is rolled back."""
+        with MappedIsraeliQueue(path, max_groups=2, sync=False) as queue:
+            queue.enqueue_many([(Item(1, 1), None), (Item(2, 2), None)])
+            with pytest.raises(TypeError):
+                queue.enqueue_many([(Item(3, 3), None), (Item("Bob", 4), None)])
+            assert queue.max_groups == 2
+            assert list(queue) == [Item(1, 1), Item(2, 2)]
+            queue.enqueue(Item(3, 3))
+            assert sorted(queue.get_groups()) == [1, 2, 3]
+
+    def test_matches_list_queue(self, path):
+        """Test random operations against IsraeliQueue."""
+        rng = random.Random(7)
+        expected = IsraeliQueue()
+        with MappedIsraeliQueue(path, capacity=4, max_groups=2, sync=False) as queue:
+            for i in range(2000):
+                if expected and rng.random() < 0.45:
+                    assert queue.dequeue() == expected.dequeue()
+                    continue
+                item = Item(i, rng.randrange(8))
+                if expected and rng.random() < 0.5:
+                    friend = rng.choice(expected)
+                    queue.put(item, friend)
+                    expected.put(item, friend)
+                else:
+                    queue.enqueue(item)
+                    expected.enqueue(item)
+                assert queue.group_size(item.group) == expected.group_size(item.group)
+            assert list(queue) == list(expected)
+            assert sorted(queue.get_groups()) == sorted(expected.get_groups())
+
+
+class TestMappedIsraeliQueueRecovery:
+    """Test cases for crash recovery from the write-ahead log."""
+
+    def test_redo_logged_operation(self, path, tmp_path):
+        """Test that a logged operation missing from the file is redone."""
+        queue = MappedIsraeliQueue(path, checkpoint_bytes=1 << 30)
+        queue.enqueue(Item(1, 10))
+        queue.checkpoint()
+        before = str(tmp_path / "before.iq")
+        shutil.copy(path, before)
+
+        queue.enqueue(Item(2, 10), Item(1, 10))
+        queue.dequeue()
+        # Crash after logging, before the mapping reached the file
+        shutil.copy(path + "-wal", before + "-wal")
+        queue.close()
+
+        with MappedIsraeliQueue(before) as recovered:
+            assert list(recovered) == [Item(2, 10)]
+            assert recovered.group_size(10) == 1
+        assert os.path.getsize(before + "-wal") == 0
+
+    def test_redo_table_growth(self, path, tmp_path):
+        """Test that slots moved by a logged table growth are redone."""
+        queue = MappedIsraeliQueue(
+            path, capacity=4, max_groups=2, checkpoint_bytes=1 << 30
+        )
+        queue.enqueue_many([(Item(1, 1), None), (Item(2, 2), None)])
+        queue.checkpoint()
+        before = str(tmp_path / "before.iq")
+        shutil.copy(path, before)
+
+        for i in range(3, 12):
+            queue.enqueue(Item(i, i))
+        shutil.copy(path + "-wal", before + "-wal")
+        queue.close()
+
+        with MappedIsraeliQueue(before) as recovered:
+            assert recovered.max_groups == 16
+            assert [item.item for item in recovered] == list(range(1, 12))
+            assert recovered.group_size(5) == 1
+
+    def test_torn_log_tail_is_dropped(self, path):
+        """Test that an incomplete log record is ignored."""
+        queue = MappedIsraeliQueue(path, checkpoint_bytes=1 << 30)
+        queue.enqueue(Item(1, 10))
+        with open(path + "-wal", "ab") as log:
+            log.write(b"\x4c\x57\x51\x49\x05\x00")
+        queue._unmap()
+        os.close(queue._fd)
+        os.close(queue._wal)
+
+        with MappedIsraeliQueue(path) as recovered:
+            assert list(recovered) == [Item(1, 10)]
+
+    def test_not_a_queue_file(self, path):
+        """Test that opening a foreign file fails."""
+        with open(path, "wb") as handle:
+            handle.write(b"not a queue file, just some text")
+        with pytest.raises(ValueError, match="Not an Israeli queue buffer"):
+            MappedIsraeliQueue(path)
@@ -0,0 +1,300 @@
+import copy
+import pickle
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue, IsraeliQueueByType
+from IsraeliQueue.metrics import (
+    Histogram,
+    QueueMetrics,
+    instrument,
+    prometheus_text,
+    snapshot,
+    uninstrument,
+)
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+class TestHistogram:
+    """Test cases for the Histogram class."""
+
+    def test_cumulative_buckets(self):
+        """Test that bucket counts are cumulative and end with +Inf."""
+        histogram = Histogram([1.0, 2.0])
+        for value in (0.5, 1.0, 1.5, 7.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [(1.0, 2), (2.0, 3), (float("inf"), 4)]
+        assert histogram.count == 4
+        assert histogram.sum == 10.0
+        assert histogram.max == 7.0
+
+
+class TestInstrumentedIsraeliQueue:
+    """Test cases for instrumenting an IsraeliQueue."""
+
+    def setup_method(self):
+        """Set up an instrumented queue with a manual clock."""
+        self.clock = FakeClock()
+        self.queue = IsraeliQueue()
+        self.metrics = instrument(self.queue, QueueMetrics(clock=self.clock))
+
+    def test_behaves_like_the_queue(self):
+        """Test that instrumenting does not change queue behavior."""
+        alice, bob, charlie = Item("Alice", 1), Item("Bob", 1), Item("Charlie", 2)
+        self.queue.enqueue(alice)
+        self.queue.enqueue(charlie)
+        self.queue.enqueue(bob, alice)
+
+        assert isinstance(self.queue, IsraeliQueue)
+        assert self.queue == [alice, bob, charlie]
+        assert self.queue.dequeue_many(3) == [alice, bob, charlie]
+
+    def test_counts_outermost_calls_only(self):
+        """Test that enqueue with a friend is not also counted as put."""
+        alice = Item("Alice", 1)
+        self.queue.enqueue(alice)
+        self.queue.enqueue(Item("Bob", 1), alice)
+        self.queue.put(Item("Carol", 1), alice)
+        self.queue.peek()
+
+        assert self.metrics.calls == {"enqueue": 2, "put": 1, "peek": 1}
+        assert self.metrics.waiting == 3
+
+    def test_counts_errors(self):
+        """Test that a missing friend is counted as a put error."""
+        with pytest.raises(ValueError):
+            self.queue.put(Item("Bob", 1), Item("Ghost", 1))
+        with pytest.raises(IndexError):
+            self.queue.dequeue()
+
+        assert self.metrics.errors == {
+            ("put", "ValueError"): 1,
+            ("dequeue", "IndexError"): 1,
+        }
+        assert self.metrics.waiting == 0
+
+    def test_wait_per_group(self):
+        """Test that waits are observed per group from enqueue to dequeue."""
+        alice, bob = Item("Alice", 1), Item("Bob", 2)
+        self.queue.enqueue(alice)
+        self.clock.now = 2.0
+        self.queue.enqueue(bob)
+        self.clock.now = 5.0
+        self.queue.dequeue()
+        self.clock.now = 6.0
+        self.queue.dequeue_many(1)
+
+        assert self.metrics.wait[1].sum == 5.0
+        assert self.metrics.wait[2].sum == 4.0
+        assert self.metrics.waiting == 0
+
+    def test_list_methods_record_arrivals(self):
+        """Test that items added with append, extend and += are waited on."""
+        self.queue.append(Item("Alice", 1))
+        self.queue.extend([Item("Bob", 2), Item("Carol", 3)])
+        self.queue += [Item("Dan", 4)]
+        self.queue.enqueue(Item("Eve", 5))
+        self.clock.now = 3.0
+        self.queue.dequeue_many(5)
+
+        assert self.metrics.calls == {
+            "append": 1,
+            "extend": 2,
+            "enqueue": 1,
+            "dequeue_many": 1,
+        }
+        assert [self.metrics.wait[group].sum for group in range(1, 6)] == [3.0] * 5
+        assert self.metrics.waiting == 0
+
+    def test_drain_observes_each_item_as_yielded(self):
+        """Test that a wait ends when drain yields the item, not before."""
+        self.queue.enqueue(Item("Alice", 1))
+        self.queue.enqueue(Item("Bob", 2))
+        drain = self.queue.drain()
+        self.clock.now = 1.0
+        next(drain)
+        self.clock.now = 4.0
+        next(drain)
+
+        assert self.metrics.wait[1].sum == 1.0
+        assert self.metrics.wait[2].sum == 4.0
+        assert self.metrics.calls["dequeue"] == 2
+
+    def test_removed_items_are_not_waiting(self):
+        """Test that cancelled and expired items are not observed as served."""
+        alice = Item("Alice", 1)
+        self.queue.enqueue(alice, expires_at=1)
+        self.queue.enqueue(Item("Bob", 2))
+        self.queue.enqueue(Item("Carol", 3))
+        self.queue.cancel(Item("Bob", 2))
+        self.queue.remove_group(3)
+        self.queue.discard_expired(1)
+
+        assert self.metrics.waiting == 0
+        assert self.metrics.wait == {}
+        assert self.metrics.calls["discard_expired"] == 1
+
+    def test_enqueue_many_partial_failure(self):
+        """Test that items placed before a bad friend are still tracked."""
+        alice = Item("Alice", 1)
+        with pytest.raises(ValueError):
+            self.queue.enqueue_many([(alice, None), (Item("Bob", 2), Item("Ghost", 2))])
+
+        assert self.metrics.errors == {("enqueue_many", "ValueError"): 1}
+        assert self.metrics.waiting == 1
+
+    def test_enqueue_many_partial_failure_counts_placed_pairs(self):
+        """Test that only the pairs placed before the failure are tracked."""
+        bob = Item("Bob", 2)
+        self.queue.enqueue(bob)
+        with pytest.raises(ValueError):
+            self.queue.enqueue_many(
+                [(Item("Alice", 1), None), (Item("Bob", 2), Item("Ghost", 2))]
+            )
+
+        assert self.metrics.waiting == 2
+
+    def test_list_removals_forget_arrivals(self):
+        """Test that items the list methods take out of line are forgotten."""
+        items = [Item(name, 1) for name in "abcdefg"]
+        self.queue.extend(items)
+        self.queue.pop()
+        self.queue.remove(Item("a", 1))
+        del self.queue[0]
+        self.queue[0] = Item("x", 2)
+        self.queue[1:2] = [self.queue[1]]
+        assert self.metrics.waiting == 3
+
+        self.queue.clear()
+        assert self.metrics.waiting == 0
+
+        self.queue.extend(items)
+        self.queue *= 0
+        assert self.metrics.waiting == 0
+
+    def test_items_enqueued_before_instrumenting(self):
+        """Test that items without an enqueue time are not observed."""
+        queue = IsraeliQueue([Item("Alice", 1)])
+        metrics = instrument(queue)
+        queue.dequeue()
+
+        assert metrics.calls == {"dequeue": 1}
+        assert metrics.wait == {}
+
+    def test_uninstrument(self):
+        """Test that uninstrumenting restores the plain class."""
+        self.queue.enqueue(Item("Alice", 1))
+        uninstrument(self.queue)
+        self.queue.dequeue()
+
+        assert type(self.queue) is IsraeliQueue
+        assert "_metrics" not in self.queue.__dict__
+        assert self.metrics.calls == {"enqueue": 1}
+
+    def test_instrument_twice_returns_same_metrics(self):
+        """Test that instrumenting an instrumented queue is a no-op."""
+        assert instrument(self.queue) is self.metrics
+
+    def test_copy_and_pickle(self):
+        """Test that copies and pickles stay instrumented and intact."""
+        self.queue.enqueue(Item("Alice", 1))
+        for clone in (copy.copy(self.queue), pickle.loads(pickle.dumps(self.queue))):
+            assert clone == [Item("Alice", 1)]
+            assert clone.group_size(1) == 1
+            clone.peek()
+            assert type(clone) is type(self.queue)
+            clone.append(Item("Bob", 2))
+            assert clone.dequeue_many(2) == [Item("Alice", 1), Item("Bob", 2)]
+
+    def test_rejects_other_classes(self):
+        """Test that only the supported queue classes can be instrumented."""
+        with pytest.raises(TypeError):
+            instrument([])
+
+
+class TestInstrumentedIsraeliQueueByType:
+    """Test cases for instrumenting an IsraeliQueueByType."""
+
+    def test_wait_per_type(self):
+        """Test that waits are observed per type."""
+        clock = FakeClock()
+        queue = IsraeliQueueByType()
+        metrics = instrument(queue, QueueMetrics(clock=clock))
+        queue.enqueue("a")
+        queue.enqueue_many([1, "b"])
+        clock.now = 3.0
+        assert queue.dequeue_many(3) == ["a", "b", 1]
+
+        assert metrics.calls == {"enqueue": 1, "enqueue_many": 1, "dequeue_many": 1}
+        assert metrics.wait[str].count == 2
+        assert metrics.wait[int].sum == 3.0
+
+    def test_list_removals_forget_arrivals(self):
+        """Test that the items of subqueues taken out of line are forgotten."""
+        queue = IsraeliQueueByType()
+        metrics = instrument(queue, QueueMetrics(clock=FakeClock()))
+        queue.enqueue_many(["a", 1, 2.0, b"b", None, 3j])
+        queue.pop()
+        queue.remove([1])
+        del queue[0]
+        queue[0] = ["x"]
+        assert metrics.waiting == 2
+
+        queue.clear()
+        assert metrics.waiting == 0
+
+
+class TestExporters:
+    """Test cases for the metric exporters."""
+
+    def setup_method(self):
+        """Set up metrics with one call, error and wait each."""
+        clock = FakeClock()
+        self.metrics = QueueMetrics(
+            clock=clock, latency_buckets=[1.0], wait_buckets=[1.0]
+        )
+        queue = IsraeliQueue()
+        instrument(queue, self.metrics)
+        queue.enqueue(Item("Alice", 'say "hi"'))
+        clock.now = 2.0
+        queue.dequeue()
+        with pytest.raises(IndexError):
+            queue.peek()
+
+    def test_snapshot(self):
+        """Test that the snapshot is made of plain values."""
+        exported = self.metrics.export()
+
+        assert exported == snapshot(self.metrics)
+        assert exported["calls"] == {"enqueue": 1, "dequeue": 1, "peek": 1}
+        assert exported["errors"] == {"peek:IndexError": 1}
+        assert exported["wait"]['say "hi"']["buckets"] == [(1.0, 0), (float("inf"), 1)]
+        assert exported["waiting"] == 0
+
+    def test_prometheus_text(self):
+        """Test the Prometheus exposition output."""
+        text = self.metrics.export(prometheus_text)
+
+        assert "# TYPE israeli_queue_operations_total counter" in text
+        assert 'israeli_queue_operations_total{op="dequeue"} 1' in text
+        assert 'israeli_queue_errors_total{op="peek",error="IndexError"} 1' in text
+        bucket = 'israeli_queue_wait_seconds_bucket{group="say \\"hi\\"",le="+Inf"} 1'
+        assert bucket in text
+        assert 'israeli_queue_wait_seconds_sum{group="say \\"hi\\""} 2.0' in text
+        assert "israeli_queue_waiting 0" in text
+        assert text.endswith("\n")
@@ -0,0 +1,140 @@
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item
+from IsraeliQueue.priority import PriorityIsraeliQueue
+
+
+class TestPriorityIsraeliQueue:
+    """Test cases for the PriorityIsraeliQueue class."""
+
+    def test_serves_highest_priority_first(self):
+        """Test that blocks are served by priority, higher first."""
+        queue = PriorityIsraeliQueue(priorities={"vip": 10, "low": -1})
+        queue.enqueue(Item("Alice", "low"))
+        queue.enqueue(Item("Bob", "regular"))
+        queue.enqueue(Item("Carol", "vip"))
+
+        assert [item.item for item in queue.dequeue_many(3)] == [
+            "Carol",
+            "Bob",
+            "Alice",
+        ]
+
+    def test_equal_priorities_keep_line_order(self):
+        """Test that blocks with the same priority are served as they joined."""
+        queue = PriorityIsraeliQueue()
+        for group in (3, 1, 2):
+            queue.enqueue(Item(group, group))
+
+        assert queue.get_groups() == [3, 1, 2]
+        assert [item.group for item in queue.dequeue_many(3)] == [3, 1, 2]
+
+    def test_members_keep_join_order(self):
+        """Test that a block serves its members in the order they joined."""
+        queue = PriorityIsraeliQueue(priorities={1: 5})
+        head = Item("a", 1)
+        queue.enqueue(head)
+        queue.enqueue(Item("x", 2))
+        queue.enqueue(Item("b", 1), head)
+        queue.enqueue(Item("c", 1))
+
+        assert list(queue.items_in_group(1)) == [head, Item("b", 1), Item("c", 1)]
+        assert [item.item for item in queue] == ["a", "b", "c", "x"]
+
+    def test_strangers_open_new_blocks(self):
+        """Test that a member without a friend joins the end of the line."""
+        queue = PriorityIsraeliQueue()
+        head = Item("a", 1)
+        queue.enqueue(head)
+        queue.enqueue(Item("x", 2))
+        queue.enqueue(Item("b", 1))
+        queue.enqueue(Item("c", 1), head)
+        queue.enqueue(Item("d", 1))
+
+        assert [item.item for item in queue] == ["a", "x", "b", "c", "d"]
+        assert queue.get_groups() == [1, 2]
+        assert list(queue.items_in_group(1)) == [head] + [
+            Item(name, 1) for name in "bcd"
+        ]
+        assert queue.group_size(1) == 4
+
+        queue.set_priority(2, 1)
+        assert [item.item for item in queue.dequeue_many(5)] == [
+            "x",
+            "a",
+            "b",
+            "c",
+            "d",
+        ]
+        assert queue.group_size(1) == 0
+
+    def test_set_priority_moves_block(self):
+        """Test that changing a group's priority reorders the blocks in line."""
+        queue = PriorityIsraeliQueue()
+        for group in range(4):
+            queue.enqueue(Item(group, group))
+
+        queue.set_priority(3, 1)
+        assert queue.peek() == Item(3, 3)
+        queue.set_priority(3, -1)
+        queue.set_priority(0, -2)
+        assert queue.get_groups() == [1, 2, 3, 0]
+
+    def test_set_priority_applies_to_later_blocks(self):
+        """Test that a priority set for an absent group is used when it joins."""
+        queue = PriorityIsraeliQueue([Item("a", 1)])
+        queue.set_priority(2, 3)
+        queue.enqueue(Item("b", 2))
+
+        assert queue.priority_of(2) == 3
+        assert queue.peek() == Item("b", 2)
+
+    def test_emptied_block_rejoins_at_back(self):
+        """Test that a group returning after its block empties queues anew."""
+        queue = PriorityIsraeliQueue([Item("a", 1), Item("b", 2)])
+        assert queue.dequeue() == Item("a", 1)
+        queue.enqueue(Item("c", 1))
+
+        assert queue.get_groups() == [2, 1]
+        assert queue.group_size(1) == 1
+
+    def test_matches_sorted_order(self):
+        """Test dequeue order against a stable sort of the line by priority."""
+        rng = random.Random(7)
+        priorities = {group: rng.randrange(3) for group in range(8)}
+        queue = PriorityIsraeliQueue(priorities=priorities)
+        items = [Item(i, rng.randrange(8)) for i in range(200)]
+        queue.extend(items)
+        for group in range(0, 8, 2):
+            priorities[group] = rng.randrange(3)
+            queue.set_priority(group, priorities[group])
+
+        expected = sorted(items, key=lambda item: -priorities[item.group])
+        assert list(queue) == expected
+        assert queue.dequeue_many(len(queue)) == expected
+        assert queue.is_empty()
+
+    def test_friend_must_be_in_queue(self):
+        """Test that joining a missing friend raises an error."""
+        queue = PriorityIsraeliQueue([Item("a", 1)])
+        with pytest.raises(ValueError, match="Friend not found"):
+            queue.enqueue(Item("b", 1), Item("nobody", 1))
+        assert Item("a", 1) in queue
+        assert Item("b", 1) not in queue
+
+    def test_empty_queue_errors(self):
+        """Test dequeue and peek on an empty queue."""
+        queue = PriorityIsraeliQueue()
+        with pytest.raises(IndexError, match="Cannot dequeue from empty queue"):
+            queue.dequeue()
+        with pytest.raises(IndexError, match="Cannot peek empty queue"):
+            queue.peek()
+        with pytest.raises(ValueError):
+            queue.dequeue_many(-1)
+        assert queue.dequeue_many(3) == []
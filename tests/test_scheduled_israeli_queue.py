@@ -0,0 +1,168 @@
+import math
+import pickle
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item
+from IsraeliQueue.scheduled import ScheduledIsraeliQueue
+from IsraeliQueue.timers import TimerWheel
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+class TestTimerWheel:
+    """Test cases for the TimerWheel class."""
+
+    def test_due_in_time_order(self):
+        """Test that due payloads come back ordered by time, then schedule order."""
+        wheel = TimerWheel(resolution=1)
+        wheel.schedule(5, "c")
+        wheel.schedule(2, "a")
+        wheel.schedule(5, "d")
+        wheel.schedule(3, "b")
+
+        assert wheel.advance(1) == []
+        assert wheel.advance(5) == ["a", "b", "c", "d"]
+        assert len(wheel) == 0
+
+    def test_never_early(self):
+        """Test that an entry falls due at the first tick at or after its time."""
+        wheel = TimerWheel(resolution=1)
+        wheel.schedule(2.5, "x")
+
+        assert wheel.advance(2.9) == []
+        assert wheel.advance(3) == ["x"]
+
+    def test_past_entries_are_due_at_once(self):
+        """Test that an entry scheduled in the past is due on the next advance."""
+        wheel = TimerWheel(resolution=1, start=100)
+        wheel.schedule(10, "late")
+        assert wheel.advance(100) == ["late"]
+
+    def test_far_entries_cascade_down(self):
+        """Test entries beyond the top level and across every level."""
+        wheel = TimerWheel(resolution=1, levels=2)
+        times = [1, 63, 64, 65, 4095, 4096, 4097, 10**6]
+        for when in times:
+            wheel.schedule(when, when)
+
+        assert wheel.advance(4096) == times[:6]
+        assert wheel.advance(10**6 - 1) == [4097]
+        assert wheel.advance(10**6) == [10**6]
+
+    def test_matches_sorted_schedule(self):
+        """Test random schedules and advances against a sorted list."""
+        rng = random.Random(3)
+        wheel = TimerWheel(resolution=0.5, start=7, levels=2)
+        now = 7.0
+        pending = []
+        for sequence in range(2000):
+            if rng.random() < 0.6:
+                when = now + rng.choice([-1, 10, 1000, 10**5]) * rng.random()
+                wheel.schedule(when, (when, sequence))
+                pending.append((when, sequence))
+            else:
+                now += rng.choice([1, 100, 10**4]) * rng.random()
+                due = [p for p in pending if math.ceil(p[0] / 0.5) <= now // 0.5]
+                assert wheel.advance(now) == sorted(due)
+                pending = [p for p in pending if p not in due]
+            assert len(wheel) == len(pending)
+
+    def test_invalid_arguments(self):
+        """Test that the wheel rejects a non-positive resolution or no levels."""
+        with pytest.raises(ValueError):
+            TimerWheel(resolution=0)
+        with pytest.raises(ValueError):
+            TimerWheel(levels=0)
+
+
+class TestScheduledIsraeliQueue:
+    """Test cases for the ScheduledIsraeliQueue class."""
+
+    def test_enqueue_after(self):
+        """Test that a scheduled item joins the line once its delay passes."""
+        clock = FakeClock()
+        queue = ScheduledIsraeliQueue(clock=clock)
+        queue.enqueue_after(Item("Bob", 1), 5)
+
+        assert queue.pending() == 1
+        assert queue.is_empty()
+        with pytest.raises(IndexError):
+            queue.peek()
+
+        clock.now = 5
+        assert queue.peek() == Item("Bob", 1)
+        assert queue.pending() == 0
+        assert queue.dequeue() == Item("Bob", 1)
+
+    def test_scheduled_friend_joins_in_line(self):
+        """Test that an arrival joins its friend when the friend is in line."""
+        clock = FakeClock()
+        queue = ScheduledIsraeliQueue([Item("Alice", 1), Item("Carol", 2)], clock)
+        queue.enqueue_at(Item("Bob", 1), 10, friend=Item("Alice", 1))
+        queue.enqueue_at(Item("Dan", 3), 10, friend=Item("Eve", 3))
+
+        clock.now = 10
+        assert queue.dequeue_many(4) == [
+            Item("Alice", 1),
+            Item("Bob", 1),
+            Item("Carol", 2),
+            Item("Dan", 3),
+        ]
+
+    def test_arrivals_join_in_due_order(self):
+        """Test that several due arrivals join in the order they fell due."""
+        clock = FakeClock()
+        queue = ScheduledIsraeliQueue(clock=clock)
+        queue.enqueue_at(Item("b", 2), 2)
+        queue.enqueue_at(Item("a", 1), 1)
+        queue.enqueue_at(Item("c", 3), 30)
+
+        assert queue.promote_due(now=2) == [Item("a", 1), Item("b", 2)]
+        assert list(queue) == [Item("a", 1), Item("b", 2)]
+        assert queue.pending() == 1
+
+    def test_drain_takes_due_arrivals(self):
+        """Test that drain and iter_dequeue serve arrivals as they fall due."""
+        clock = FakeClock()
+        queue = ScheduledIsraeliQueue(clock=clock)
+        queue.enqueue_at(Item("a", 1), 1)
+        queue.enqueue_at(Item("b", 2), 2)
+        queue.enqueue_at(Item("c", 3), 3)
+
+        clock.now = 1
+        assert list(queue.drain()) == [Item("a", 1)]
+        served = []
+        for item in queue.iter_dequeue():
+            served.append(item)
+            clock.now += 1
+        assert served == []
+        clock.now = 2
+        for item in queue.iter_dequeue():
+            served.append(item)
+            clock.now += 1
+        assert served == [Item("b", 2), Item("c", 3)]
+        assert queue.pending() == 0
+
+    def test_pickle_keeps_schedule(self):
+        """Test that a pickled queue keeps its line and its pending arrivals."""
+        queue = ScheduledIsraeliQueue([Item("a", 1)])
+        queue.enqueue_at(Item("b", 1), 0, friend=Item("a", 1))
+
+        restored = pickle.loads(pickle.dumps(queue))
+        assert restored.pending() == 1
+        assert restored.dequeue_many(2) == [Item("a", 1), Item("b", 1)]
@@ -0,0 +1,157 @@
+import pytest
+import random
+import sys
+import os
+import threading
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue
+from IsraeliQueue.sharded import ShardedIsraeliQueue
+from tests import test_israeli_queue
+
+
+class TestShardedIsraeliQueueCompat(test_israeli_queue.TestIsraeliQueue):
+    """Run the IsraeliQueue suite against the sharded backend."""
+
+    @pytest.fixture(autouse=True)
+    def use_sharded_backend(self, monkeypatch):
+        """Make the shared tests build ShardedIsraeliQueues."""
+        monkeypatch.setattr(test_israeli_queue, "IsraeliQueue", ShardedIsraeliQueue)
+
+
+class TestShardedIsraeliQueue:
+    """Test cases specific to the ShardedIsraeliQueue backend."""
+
+    def test_global_front_across_shards(self):
+        """Test that the line interleaves shards in arrival order."""
+        queue = ShardedIsraeliQueue(shards=2)
+        alice, bob = Item("Alice", 0), Item("Bob", 1)
+        queue.enqueue(alice)
+        queue.enqueue(bob)
+        queue.enqueue(Item("Carol", 0))
+        queue.enqueue(Item("Dana", 1), bob)
+        queue.enqueue(Item("Eve", 0), alice)
+
+        assert [item.item for item in queue] == ["Alice", "Bob", "Dana", "Carol", "Eve"]
+        assert [item.item for item in queue.dequeue_many(4)] == [
+            "Alice",
+            "Bob",
+            "Dana",
+            "Carol",
+        ]
+        assert queue.dequeue().item == "Eve"
+
+    def test_matches_list_queue(self):
+        """Test random operations against IsraeliQueue."""
+        rng = random.Random(3)
+        queue = ShardedIsraeliQueue(shards=4)
+        expected = IsraeliQueue()
+        for i in range(1500):
+            if expected and rng.random() < 0.4:
+                assert queue.dequeue() == expected.dequeue()
+                continue
+            item = Item(i, rng.randrange(12))
+            friend = rng.choice(expected) if expected and rng.random() < 0.6 else None
+            queue.enqueue(item, friend)
+            expected.enqueue(item, friend)
+        assert queue == list(expected)
+        assert queue.group_size(3) == expected.group_size(3)
+
+    def test_concurrent_producers(self):
+        """Test that parallel producers keep every group contiguous."""
+        queue = ShardedIsraeliQueue(shards=4)
+
+        def produce(group):
+            first = Item((group, 0), group)
+            queue.enqueue(first)
+            for i in range(1, 200):
+                queue.put(Item((group, i), group), first)
+
+        threads = [threading.Thread(target=produce, args=(g,)) for g in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        groups = [item.group for item in queue.dequeue_many(10_000)]
+        assert len(groups) == 1600
+        runs = [g for i, g in enumerate(groups) if i == 0 or groups[i - 1] != g]
+        assert sorted(runs) == list(range(8))
+        assert queue.is_empty()
+
+    def test_dequeue_sees_a_consistent_front(self):
+        """Test that arrivals during a dequeue cannot overtake earlier ones."""
+        queue = ShardedIsraeliQueue(shards=2)
+        first, second = Item("first", 0), Item("second", 1)
+        lock = queue._shards[0].lock
+        producer = threading.Thread(
+            target=lambda: (queue.enqueue(first), queue.enqueue(second))
+        )
+
+        class InterleavingLock:
+            """Let a producer run as soon as the consumer releases shard 0."""
+
+            def acquire(self):
+                lock.acquire()
+
+            def release(self):
+                lock.release()
+                if threading.current_thread() is not producer and not producer.ident:
+                    producer.start()
+                    # Give the producer time to append to both shards
+                    producer.join(timeout=0.5)
+
+            __enter__ = acquire
+
+            def __exit__(self, *exc_info):
+                self.release()
+
+        queue._shards[0].lock = InterleavingLock()
+        try:
+            served = queue.dequeue()
+        except IndexError:
+            served = None
+        producer.join()
+
+        assert served in (None, first)
+        assert queue.dequeue_many(2) == [first, second][1 if served else 0 :]
+
+    def test_put_checks_and_places_in_one_step(self):
+        """Test that a concurrent put cannot open a second block for a group."""
+        friend, other = Item("friend", 1), Item("other", 1)
+        queue = ShardedIsraeliQueue([friend], shards=2)
+        first, second = Item("first", 0), Item("second", 0)
+        lock = queue._shards[0].lock
+        producer = threading.Thread(
+            target=lambda: (queue.put(second, friend), queue.append(other))
+        )
+
+        class InterleavingLock:
+            """Let a producer run as soon as the first put releases shard 0."""
+
+            def acquire(self):
+                lock.acquire()
+
+            def release(self):
+                lock.release()
+                if threading.current_thread() is not producer and not producer.ident:
+                    producer.start()
+                    producer.join(timeout=0.5)
+
+            __enter__ = acquire
+
+            def __exit__(self, *exc_info):
+                self.release()
+
+        queue._shards[0].lock = InterleavingLock()
+        queue.put(first, friend)
+        producer.join()
+
+        assert list(queue) == [friend, first, second, other]
+
+    def test_invalid_shard_count(self):
+        """Test that a queue needs at least one shard."""
+        with pytest.raises(ValueError):
+            ShardedIsraeliQueue(shards=0)
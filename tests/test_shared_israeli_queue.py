@@ -0,0 +1,112 @@
+import multiprocessing
+import pickle
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item
+from IsraeliQueue.shared import SharedIsraeliQueue
+
+
+def produce(queue, group, count):
+    """Enqueue count items of a group, each joining the group's first item."""
+    first = Item(group * 1000, group)
+    queue.enqueue(first)
+    for i in range(1, count):
+        queue.put(Item(group * 1000 + i, group), first)
+    queue.close()
+
+
+@pytest.fixture
+def queue():
+    """Yield a new shared queue, closed and unlinked afterwards."""
+    queue = SharedIsraeliQueue(capacity=64, max_groups=8)
+    yield queue
+    queue.close()
+    queue.unlink()
+
+
+class TestSharedIsraeliQueue:
+    """Test cases for the SharedIsraeliQueue class."""
+
+    def test_queue_operations(self, queue):
+        """Test joining friends and serving from the front."""
+        queue.enqueue(Item(1, 10))
+        queue.enqueue(Item(2, 20))
+        queue.put(Item(3, 10), Item(1, 10))
+
+        assert list(queue) == [Item(1, 10), Item(3, 10), Item(2, 20)]
+        members = queue.items_in_group(10)
+        assert members == [Item(1, 10), Item(3, 10)]
+        assert Item(2, 20) in queue
+        assert queue.dequeue() == Item(1, 10)
+        assert len(queue) == 2
+        assert members == [Item(3, 10)] and len(members) == 1
+
+    def test_fixed_capacity(self):
+        """Test that a full queue raises instead of growing."""
+        with SharedIsraeliQueue(capacity=2) as queue:
+            queue.enqueue(Item(1, 1))
+            queue.enqueue(Item(2, 1))
+            with pytest.raises(OverflowError, match="capacity"):
+                queue.enqueue(Item(3, 1))
+            assert queue.size() == 2
+            queue.dequeue()
+            queue.enqueue(Item(3, 1))
+            queue.unlink()
+
+    def test_fixed_group_table(self):
+        """Test that a queue holding max_groups groups rejects another."""
+        with SharedIsraeliQueue(capacity=8, max_groups=2) as queue:
+            queue.enqueue_many([(Item(1, 1), None), (Item(2, 2), None)])
+            with pytest.raises(OverflowError, match="Too many groups"):
+                queue.enqueue(Item(3, 3))
+            assert queue.max_groups == 2
+            queue.dequeue()
+            queue.enqueue(Item(3, 3))
+            assert sorted(queue.get_groups()) == [2, 3]
+            queue.unlink()
+
+    def test_attach_by_name(self, queue):
+        """Test that a second handle sees the same queue."""
+        queue.enqueue(Item(1, 10))
+        other = SharedIsraeliQueue(name=queue.name, create=False, lock=queue.lock)
+
+        other.put(Item(2, 10), Item(1, 10))
+        assert queue.group_size(10) == 2
+        other.close()
+
+        with pytest.raises(ValueError, match="lock is required"):
+            SharedIsraeliQueue(name=queue.name, create=False)
+
+    @pytest.mark.parametrize(
+        "method",
+        [m for m in ("fork", "spawn") if m in multiprocessing.get_all_start_methods()],
+    )
+    def test_processes_share_the_queue(self, method):
+        """Test that several processes join their groups in one queue."""
+        ctx = multiprocessing.get_context(method)
+        queue = SharedIsraeliQueue(capacity=64, lock=ctx.RLock())
+        workers = [ctx.Process(target=produce, args=(queue, g, 5)) for g in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+
+        items = queue.dequeue_many(100)
+        assert len(items) == 15
+        # Every group forms one contiguous run
+        groups = [item.group for item in items]
+        runs = [g for i, g in enumerate(groups) if i == 0 or groups[i - 1] != g]
+        assert sorted(runs) == [0, 1, 2]
+        queue.close()
+        queue.unlink()
+
+    def test_pickling_needs_a_new_process(self, queue):
+        """Test that the lock only travels to processes being started."""
+        with pytest.raises(RuntimeError):
+            pickle.dumps(queue)
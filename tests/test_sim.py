@@ -0,0 +1,131 @@
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import IsraeliQueue
+from IsraeliQueue.sim import (
+    Bursty,
+    Constant,
+    Empirical,
+    Exponential,
+    Geometric,
+    Poisson,
+    Simulation,
+    replicate,
+)
+
+
+class TestDistributions:
+    """Test cases for the arrival processes and distributions."""
+
+    def test_poisson_rate(self):
+        """Test that Poisson arrivals come at about the given rate."""
+        times = Poisson(4).times(random.Random(1))
+        count = 0
+        while next(times) <= 1000:
+            count += 1
+        assert 3800 < count < 4200
+
+    def test_bursty_is_faster_than_calm_rate(self):
+        """Test that bursts raise the long-run arrival rate."""
+        times = Bursty(1, 10, mean_calm=10, mean_burst=10).times(random.Random(2))
+        count = 0
+        while next(times) <= 2000:
+            count += 1
+        # Half the time at each rate: about 5.5 arrivals per unit
+        assert 9000 < count < 13000
+
+    def test_group_sizes(self):
+        """Test the mean of geometric sizes and the support of empirical ones."""
+        rng = random.Random(3)
+        sizes = [Geometric(3).sample(rng) for _ in range(20000)]
+        assert min(sizes) == 1
+        assert 2.9 < sum(sizes) / len(sizes) < 3.1
+        assert {Empirical([1, 4]).sample(rng) for _ in range(100)} == {1, 4}
+
+
+class TestSimulation:
+    """Test cases for the Simulation class."""
+
+    def test_mm1_mean_wait(self):
+        """Test an M/M/1 queue against its textbook mean wait."""
+        result = Simulation(Poisson(0.5), Exponential(1), seed=7).run(100000)
+
+        # Wq = rho / (mu - lambda) = 1 and utilization = rho
+        assert 0.9 < result.mean_wait < 1.1
+        assert 0.48 < result.utilization < 0.52
+        assert 0.48 < result.throughput < 0.52
+        assert result.p50_wait <= result.p90_wait <= result.p99_wait
+        assert result.p99_wait <= result.max_wait
+
+    def test_deterministic_with_seed(self):
+        """Test that runs with the same seed give the same result."""
+        simulation = Simulation(Poisson(1), Exponential(0.8), groups=5, seed=11)
+        assert simulation.run(500) == simulation.run(500)
+        assert simulation.run(500) != Simulation(Poisson(1), Exponential(0.8)).run(500)
+
+    def test_counts_add_up(self):
+        """Test that every arrival is served, in service or waiting."""
+        result = Simulation(
+            Poisson(1), Exponential(1.5), servers=1, group_size=Constant(2), seed=5
+        ).run(1000)
+
+        in_service = result.arrivals - result.served - result.waiting
+        assert 0 <= in_service <= 1
+        assert result.events == result.arrivals // 2 + result.served
+
+    def test_friends_are_served_together(self):
+        """Test that a party joining a waiting group is served with it."""
+        served = []
+
+        class RecordingQueue(IsraeliQueue):
+            def dequeue(self):
+                item = super().dequeue()
+                served.append(item.group)
+                return item
+
+        Simulation(
+            Poisson(2),
+            Constant(1),
+            groups=3,
+            queue_factory=RecordingQueue,
+            seed=13,
+        ).run(200)
+
+        # A group is back in line only after its block has been served
+        blocks = [g for i, g in enumerate(served) if served[i - 1 : i] != [g]]
+        assert len(blocks) < len(served) / 2
+        assert len(served) > 150
+
+    def test_more_servers_wait_less(self):
+        """Test that adding servers shortens waits under the same load."""
+        one = Simulation(Poisson(0.9), Exponential(1), seed=3).run(5000)
+        two = Simulation(Poisson(0.9), Exponential(1), servers=2, seed=3).run(5000)
+        assert two.mean_wait < one.mean_wait
+
+    def test_invalid_arguments(self):
+        """Test that a run needs a positive horizon and at least one server."""
+        with pytest.raises(ValueError):
+            Simulation(Poisson(1), Constant(1)).run(0)
+        with pytest.raises(ValueError):
+            Simulation(Poisson(1), Constant(1), servers=0).run(10)
+
+
+class TestReplicate:
+    """Test cases for replicate."""
+
+    def test_process_pool_matches_serial_runs(self):
+        """Test that replications in a pool match the same seeds run here."""
+        simulation = Simulation(Poisson(0.8), Exponential(1), groups=10)
+        pooled = replicate(simulation, 200, seeds=[1, 2, 3], processes=2)
+        serial = replicate(simulation, 200, seeds=[1, 2, 3], processes=0)
+
+        assert pooled == serial
+        assert pooled[0] == Simulation(
+            Poisson(0.8), Exponential(1), groups=10, seed=1
+        ).run(200)
+        assert len({result.served for result in pooled}) > 1
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+import sys
+import os
+import threading
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue
+from IsraeliQueue.aio import AsyncIsraeliQueue
+from IsraeliQueue.streams import afeed, astream, feed, stream
+from IsraeliQueue.threaded import ConcurrentIsraeliQueue
+
+
+def counting(pairs, pulled):
+    """Yield pairs, recording how many have been pulled."""
+    for pair in pairs:
+        pulled.append(pair)
+        yield pair
+
+
+class TestStream:
+    """Test cases for stream and astream."""
+
+    def test_friends_join_within_window(self):
+        """Test that an item joins a friend still waiting in the queue."""
+        alice = Item("Alice", 1)
+        pairs = [(alice, None), (Item("Charlie", 2), None), (Item("Bob", 1), alice)]
+
+        assert [item.item for item in stream(pairs, maxsize=3)] == [
+            "Alice",
+            "Bob",
+            "Charlie",
+        ]
+
+    def test_served_friend_goes_to_back(self):
+        """Test that a friend served before its pair arrives is not joined."""
+        alice = Item("Alice", 1)
+        pairs = [(alice, None), (Item("Charlie", 2), None), (Item("Bob", 1), alice)]
+
+        assert [item.item for item in stream(pairs, maxsize=1)] == [
+            "Alice",
+            "Charlie",
+            "Bob",
+        ]
+
+    def test_back_pressure(self):
+        """Test that the source is read at most maxsize items ahead."""
+        pulled = []
+        source = counting(((Item(i, i), None) for i in range(100)), pulled)
+        served = stream(source, queue=IsraeliQueue(), maxsize=5)
+
+        for count in range(1, 20):
+            next(served)
+            assert len(pulled) == count + 4
+        assert len(list(served)) == 81
+
+    def test_invalid_maxsize(self):
+        """Test that maxsize must be positive."""
+        with pytest.raises(ValueError):
+            stream([], maxsize=0)
+        with pytest.raises(ValueError):
+            astream([], maxsize=0)
+
+    def test_astream_async_source(self):
+        """Test astream over an async iterable."""
+
+        async def source():
+            alice = Item("Alice", 1)
+            yield alice, None
+            yield Item("Charlie", 2), None
+            yield Item("Bob", 1), alice
+
+        async def scenario():
+            return [item.item async for item in astream(source(), maxsize=3)]
+
+        assert asyncio.run(scenario()) == ["Alice", "Bob", "Charlie"]
+
+
+class TestFeed:
+    """Test cases for feed and afeed."""
+
+    def test_feed_blocks_while_full(self):
+        """Test that feed waits for a consumer when the queue is full."""
+        queue = ConcurrentIsraeliQueue(maxsize=2)
+        pairs = [(Item(i, i % 3), None) for i in range(50)]
+        received = []
+
+        def consume():
+            for _ in range(50):
+                received.append(queue.get(timeout=5))
+                assert queue.qsize() <= 2
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        assert feed(pairs, queue, timeout=5) == 50
+        consumer.join(timeout=5)
+        assert sorted(received, key=lambda item: item.item) == [p[0] for p in pairs]
+
+    def test_feed_late_friend(self):
+        """Test that feed puts an item at the back when its friend is gone."""
+        queue = ConcurrentIsraeliQueue()
+        feed([(Item("Bob", 1), Item("Alice", 1))], queue)
+        assert queue.get_nowait() == Item("Bob", 1)
+
+    def test_afeed(self):
+        """Test that afeed waits on a full asyncio queue and joins friends."""
+
+        async def source():
+            alice = Item("Alice", 1)
+            yield alice, None
+            yield Item("Charlie", 2), None
+            yield Item("Bob", 1), alice
+
+        async def scenario():
+            queue = AsyncIsraeliQueue(maxsize=2)
+            producer = asyncio.ensure_future(afeed(source(), queue))
+            await asyncio.sleep(0)
+            assert queue.full()
+            first = await queue.get()
+            assert await producer == 3
+            return [first] + [queue.get_nowait() for _ in range(2)]
+
+        assert [item.item for item in asyncio.run(scenario())] == [
+            "Alice",
+            "Charlie",
+            "Bob",
+        ]
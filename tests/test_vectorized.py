@@ -0,0 +1,91 @@
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue
+from IsraeliQueue import vectorized
+from IsraeliQueue.vectorized import israeli_order, replay
+
+
+def sequential_replay(items, groups, arrival_order=None):
+    """Replay an arrival log one put/enqueue at a time."""
+    positions = range(len(items))
+    if arrival_order is not None:
+        positions = sorted(positions, key=arrival_order.__getitem__)
+    queue = IsraeliQueue()
+    for index in positions:
+        item = Item(items[index], groups[index])
+        members = queue.items_in_group(item.group)
+        queue.enqueue(item, members[0] if members else None)
+    return queue
+
+
+def random_log(seed, size=300, group_count=20):
+    """Draw items, their groups and arrival keys with many ties."""
+    rng = random.Random(seed)
+    items = list(range(size))
+    groups = [rng.randrange(group_count) for _ in items]
+    arrival_order = [rng.randrange(size // 3) for _ in items]
+    return items, groups, arrival_order
+
+
+PATHS = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(
+            vectorized.np is None, reason="NumPy is not installed"
+        ),
+    ),
+]
+
+
+class TestVectorized:
+    """Test cases for one-pass placement of arrival logs."""
+
+    @pytest.mark.parametrize("use_numpy", PATHS)
+    def test_order_by_first_arrival_of_group(self, use_numpy):
+        """Test the basic group-then-arrival ordering."""
+        order = israeli_order([1, 2, 1, 3, 2], use_numpy=use_numpy)
+        assert list(order) == [0, 2, 1, 4, 3]
+
+    @pytest.mark.parametrize("use_numpy", PATHS)
+    def test_matches_sequential_semantics(self, use_numpy):
+        """Test that replay matches put/enqueue one arrival at a time."""
+        for seed in range(5):
+            items, groups, arrival_order = random_log(seed)
+            expected = sequential_replay(items, groups, arrival_order)
+
+            result = replay(items, groups, arrival_order, use_numpy=use_numpy)
+            assert result == expected
+            assert isinstance(result, IsraeliQueue)
+            assert sorted(result.get_groups()) == sorted(expected.get_groups())
+
+    @pytest.mark.parametrize("use_numpy", PATHS)
+    def test_ties_keep_position_order(self, use_numpy):
+        """Test that equal arrival keys are resolved by position."""
+        order = israeli_order([5, 6, 5], [1, 0, 1], use_numpy=use_numpy)
+        assert list(order) == [1, 0, 2]
+
+    def test_empty_log(self):
+        """Test replaying an empty log."""
+        assert replay([], [], use_numpy=False) == []
+
+    def test_length_mismatch(self):
+        """Test that inconsistent inputs are rejected."""
+        with pytest.raises(ValueError):
+            replay([1, 2], [1])
+        with pytest.raises(ValueError):
+            israeli_order([1, 2], [0])
+
+    def test_force_numpy_without_numpy(self, monkeypatch):
+        """Test that forcing NumPy fails clearly when it is missing."""
+        monkeypatch.setattr(vectorized, "np", None)
+
+        with pytest.raises(ImportError):
+            israeli_order([1], use_numpy=True)
+        assert list(israeli_order([2, 1, 2])) == [0, 2, 1]
@@ -0,0 +1,165 @@
+import copy
+import pickle
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from IsraeliQueue.IsraeliQueue import Item, IsraeliQueue, IsraeliQueueByType
+from IsraeliQueue.linked import LinkedIsraeliQueue
+from IsraeliQueue.typed import DequeIsraeliQueueByType
+from IsraeliQueue.views import QueueView
+
+
+class TestQueueView:
+    """Test cases for the QueueView class."""
+
+    def test_sequence_protocol(self):
+        """Test len, iteration, indexing and slicing."""
+        view = QueueView(lambda: iter(range(10)), lambda: 10)
+
+        assert len(view) == 10
+        assert list(view) == list(range(10))
+        assert view[3] == 3
+        assert view[-1] == 9
+        assert view[2:8:2] == [2, 4, 6]
+        assert view[::-1] == list(range(9, -1, -1))
+        assert 4 in view
+        assert view.index(5) == 5
+        with pytest.raises(IndexError):
+            view[10]
+
+    def test_page(self):
+        """Test paging with offset and limit."""
+        view = QueueView(lambda: list(range(10)))
+
+        assert view.page(0, 3) == [0, 1, 2]
+        assert view.page(8, 5) == [8, 9]
+        assert view.page(4) == list(range(4, 10))
+        assert view.page(20, 1) == []
+        with pytest.raises(ValueError):
+            view.page(-1)
+        with pytest.raises(ValueError):
+            view.page(0, -1)
+
+    def test_page_reads_only_what_it_needs(self):
+        """Test that a page stops reading once it is full."""
+        read = []
+
+        def source():
+            for i in range(1000):
+                read.append(i)
+                yield i
+
+        assert QueueView(source).page(5, 2) == [5, 6]
+        assert len(read) == 7
+
+    def test_equality(self):
+        """Test that views compare like lists and are unhashable."""
+        view = QueueView(lambda: [1, 2])
+
+        assert view == [1, 2]
+        assert view == QueueView(lambda: (1, 2))
+        assert view != [2, 1]
+        assert view != (1, 2)
+        with pytest.raises(TypeError):
+            hash(view)
+        assert repr(view) == "QueueView([1, 2])"
+
+
+class TestGroupViews:
+    """Test cases for the views returned by items_in_group."""
+
+    def test_view_is_live_and_read_only(self):
+        """Test that a view follows the queue and cannot change it."""
+        alice = Item("Alice", 1)
+        queue = IsraeliQueue([alice, Item("Charlie", 2)])
+        members = queue.items_in_group(1)
+
+        queue.put(Item("Bob", 1), alice)
+        assert members == [alice, Item("Bob", 1)]
+        assert len(members) == 2
+        queue.dequeue()
+        assert members.page(0, 1) == [Item("Bob", 1)]
+        assert not hasattr(members, "append")
+        with pytest.raises(TypeError):
+            members[0] = alice
+
+    def test_index_survives_other_list_mutations(self):
+        """Test that views stay correct after edits in the middle of the line."""
+        queue = IsraeliQueue(Item(i, i % 3) for i in range(9))
+
+        queue.insert(1, Item("x", 0))
+        assert queue.items_in_group(0) == [Item(0, 0), Item("x", 0)] + [
+            Item(i, 0) for i in (3, 6)
+        ]
+        queue.remove(Item(3, 0))
+        queue.reverse()
+        assert queue.items_in_group(0) == [Item(6, 0), Item("x", 0), Item(0, 0)]
+        del queue[2]
+        queue.sort(key=lambda item: str(item.item))
+        assert queue.items_in_group(0) == [Item(0, 0), Item("x", 0)]
+        assert queue.items_in_group(5) == []
+
+    def test_matches_full_scan(self):
+        """Test random operations against a scan of the line."""
+        rng = random.Random(17)
+        queue = IsraeliQueue()
+        for i in range(2000):
+            roll = rng.random()
+            if queue and roll < 0.3:
+                queue.dequeue_many(rng.randrange(1, 4))
+            elif queue and roll < 0.35:
+                queue.pop(rng.randrange(len(queue)))
+            else:
+                item = Item(i, rng.randrange(8))
+                friend = rng.choice(queue) if queue and rng.random() < 0.6 else None
+                queue.enqueue(item, friend)
+            group = rng.randrange(8)
+            members = queue.items_in_group(group)
+            assert members == [item for item in queue if item.group == group]
+            assert len(members) == queue.group_size(group)
+
+    def test_copies_have_their_own_index(self):
+        """Test views of copied and unpickled queues."""
+        alice = Item("Alice", 1)
+        queue = IsraeliQueue([alice, Item("Bob", 1)])
+
+        clone = copy.copy(queue)
+        clone.dequeue()
+        assert queue.items_in_group(1) == [alice, Item("Bob", 1)]
+        assert clone.items_in_group(1) == [Item("Bob", 1)]
+        restored = pickle.loads(pickle.dumps(queue))
+        assert restored.items_in_group(1) == [alice, Item("Bob", 1)]
+
+    def test_linked_backend(self):
+        """Test that LinkedIsraeliQueue views walk its blocks."""
+        alice = Item("Alice", 1)
+        queue = LinkedIsraeliQueue([alice, Item("Charlie", 2), Item("Eve", 1)])
+        members = queue.items_in_group(1)
+
+        queue.put(Item("Bob", 1), alice)
+        assert members == [alice, Item("Eve", 1), Item("Bob", 1)]
+        assert len(members) == 3
+        assert members[1:] == [Item("Eve", 1), Item("Bob", 1)]
+
+
+class TestTypeViews:
+    """Test cases for the views returned by items_of_type."""
+
+    @pytest.mark.parametrize("queue_cls", [IsraeliQueueByType, DequeIsraeliQueueByType])
+    def test_view_follows_queue(self, queue_cls):
+        """Test that a type view sees items added and served later."""
+        queue = queue_cls()
+        strings = queue.items_of_type(str)
+        assert strings == [] and len(strings) == 0
+
+        queue.enqueue_many(["a", 1, "b", "c"])
+        assert strings == ["a", "b", "c"]
+        assert strings.page(1, 1) == ["b"]
+        queue.dequeue()
+        assert len(strings) == 2
+        assert strings[0] == "b"